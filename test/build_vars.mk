@@ -0,0 +1,15 @@
+# Makefile
+
+# prints the inputs of the verilog compilation of a bench, this file is read after the makefile of the bench
+# usage: make -s -f makefile.<bench> -f ../build_vars.mk print_build_vars (see sim_cache.py)
+
+print_build_vars:
+	$(info SIM=$(SIM))
+	$(info TOPLEVEL=$(TOPLEVEL))
+	$(info TOPLEVEL_LANG=$(TOPLEVEL_LANG))
+	$(info VERILOG_SOURCES=$(VERILOG_SOURCES))
+	$(info COMPILE_ARGS=$(COMPILE_ARGS))
+	$(info EXTRA_ARGS=$(EXTRA_ARGS))
+	$(info COCOTB_HDL_TIMEUNIT=$(COCOTB_HDL_TIMEUNIT))
+	$(info COCOTB_HDL_TIMEPRECISION=$(COCOTB_HDL_TIMEPRECISION))
+	@:
@@ -0,0 +1,108 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module is the fixed-point core of the virtual prototypes. A value in the Q0.{sfixed_fract} notation
+# is held as its two's complement integer code, exactly like the signed registers of the verilog modules.
+# All functions work on python ints, numpy scalars and numpy arrays.
+
+# imports
+import numpy as np
+
+def to_fixed(x, sfixed_fract):
+    """Converts a float value into the two's complement integer code of the Q0.{sfixed_fract} notation.
+       Truncation is used for the quantization and the wrap mode for values outside of [-1, 1-LSB]
+
+    Args:
+        x (float or np.array): value to convert
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        np.int64 or np.array: integer code of the value
+    """
+    # scaling with a power of two is exact, therefore the floor is the same truncation as in the float domain
+    x_int = np.floor(np.multiply(x, 2**sfixed_fract)).astype(np.int64)
+    return wrap(x_int, sfixed_fract)
+
+def to_float(x_int, sfixed_fract):
+    """Converts a integer code of the Q0.{sfixed_fract} notation back into a float value
+
+    Args:
+        x_int (int or np.array): integer code to convert
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        float or np.array: value of the integer code
+    """
+    return x_int / 2**sfixed_fract
+
+def wrap(x_int, sfixed_fract):
+    """Wraps a integer value into the range of a signed register with sfixed_fract+1 bits.
+       This is the overflow behaviour of the verilog modules
+
+    Args:
+        x_int (int or np.array): integer value to wrap
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        int or np.array: wrapped integer code
+    """
+    offset = 1 << sfixed_fract
+    return ((x_int + offset) & ((offset << 1) - 1)) - offset
+
+def sra(x_int, s):
+    """Performs a shift right arithmetic on a integer code (the >>> operator of verilog)
+
+    Args:
+        x_int (int or np.array): integer code to shift
+        s (int or np.array): sets the number of shifts
+
+    Returns:
+        int or np.array: shifted integer code
+    """
+    return x_int >> s
+
+def mul(a_int, b_int, sfixed_fract):
+    """Multiplies two integer codes and truncates the result back to the Q0.{sfixed_fract} notation
+
+    Args:
+        a_int (int or np.array): first factor
+        b_int (int or np.array): second factor
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        int or np.array: integer code of the product
+    """
+    return wrap((a_int * b_int) >> sfixed_fract, sfixed_fract)
+
+def quantize_value(x, lsb):
+    """This function quantize the given number so that it lies between -1 and 1-LSB. 
+    Where LSB is the least significant bit of the bit vector. 
+    The function works on single values and on numpy arrays with the same call.
+
+    Args:
+        x (float or np.array): number to quantize 
+        lsb (float): value of the lsb
+
+    Returns:
+        float or np.array: quantize value
+    """
+    # no negative lsb values are allowed
+    lsb = np.abs(lsb)
+
+    # we use truncation to quantize the value
+    x_q = np.floor(np.divide(x, lsb)) * lsb
+
+    # If the number does not lie within the limits [-1, 1-LSB], it is reshaped so that it lies within the limits. 
+    # The wrap mode is done with a modulo operation over the range of 2
+    return np.mod(x_q + 1, 2) - 1
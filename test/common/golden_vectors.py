@@ -0,0 +1,364 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module is the store of the golden vectors. The vectors are generated by the virtual prototypes for a
+# declared set of configurations and saved as binary files: a header with the configuration and a hash,
+# followed by the two's complement integer codes. At test time the codes are memory mapped, the virtual
+# prototypes are not imported. The hash covers the configuration and the stored codes, it detects a vector
+# file of another configuration or a damaged file. A change of the virtual prototypes is found by --check
+# (and the pytest of the store), which generates the codes again and compares them with the stored codes.
+# Regenerate with: python common/golden_vectors.py [--check]
+
+# imports
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+from dataclasses import dataclass, asdict
+import numpy as np
+
+# folders of the testbenches and of the vector files
+TEST_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+GOLDEN_DIR = os.path.join(TEST_DIR, 'golden')
+
+# file layout: magic, version, length of the json header, json header, padding to DATA_ALIGNMENT, codes
+MAGIC = b'GVEC'
+VERSION = 2
+PREAMBLE = struct.Struct('<4sHI')
+DATA_ALIGNMENT = 16
+
+# modes of the wave generator
+SINUS_MODE = 0
+SQUARE_PULS_MODE = 1
+SAWTOOTH_MODE = 2
+TRIANGLE_MODE = 3
+
+@dataclass(frozen=True)
+class GoldenConfig:
+    """Configuration of the wave generator a vector is generated for
+
+    Attributes:
+        name (str): name of the vector, it is also the name of the vector file
+        mode (int): waveform mode of the wave generator
+        sfixed_fract (int): number of fractional bits
+        phase_code (int): two's complement code of the phase register
+        amplitude_code (int): two's complement code of the amplitude register
+        n_samples (int): number of samples
+        iterations (int): number of cordic iterations (only used by the sinus)
+    """
+    name: str
+    mode: int
+    sfixed_fract: int
+    phase_code: int
+    amplitude_code: int
+    n_samples: int
+    iterations: int = 0
+
+    @property
+    def phase(self):
+        """float: value of the phase register"""
+        return code2frac(self.phase_code, self.sfixed_fract)
+
+    @property
+    def amplitude(self):
+        """float: value of the amplitude register"""
+        return code2frac(self.amplitude_code, self.sfixed_fract)
+
+    @property
+    def dtype(self):
+        """np.dtype: smallest signed integer type that holds the codes"""
+        return np.dtype(np.int8) if self.sfixed_fract < 8 else np.dtype('<i2')
+
+    def vector_hash(self, data):
+        """Calculates the hash of the configuration and of the stored codes
+
+        Args:
+            data (bytes): codes in the format of the vector file
+
+        Returns:
+            str: hex digest of the hash
+        """
+        digest = hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+@dataclass(frozen=True)
+class GoldenVectors:
+    """Golden vectors of a configuration
+
+    Attributes:
+        config (GoldenConfig): configuration of the vectors
+        codes (np.array): signed two's complement codes (memory mapped if loaded from a file)
+    """
+    config: GoldenConfig
+    codes: np.ndarray
+
+    def expected_codes(self):
+        """Returns the codes as unsigned register values, this is the format of the scoreboard
+
+        Returns:
+            list: unsigned codes as python ints
+        """
+        mask = (2 << self.config.sfixed_fract) - 1
+        return (self.codes.astype(np.int64) & mask).tolist()
+
+# declared configurations of the tiny tapeout test (test.py)
+TT_CONFIGS = {
+    'sinus' : GoldenConfig('tt_sinus', SINUS_MODE, 7, 0b00100111, 0b01001011, 300, iterations=6),
+    'sawtooth' : GoldenConfig('tt_sawtooth', SAWTOOTH_MODE, 7, 0b00000001, 0b01011000, 300),
+    'triangle' : GoldenConfig('tt_triangle', TRIANGLE_MODE, 7, 0b00000001, 0b01011000, 300),
+    'square_pulse' : GoldenConfig('tt_square_pulse', SQUARE_PULS_MODE, 7, 0b00000001, 0b00011001, 300),
+}
+
+def code2frac(code, sfixed_fract):
+    """Converts a two's complement register code into its value
+
+    Args:
+        code (int): register code with sfixed_fract+1 bits
+        sfixed_fract (int): number of fractional bits
+
+    Returns:
+        float: value of the code
+    """
+    sign = 1 << sfixed_fract
+    return (((code + sign) % (2 * sign)) - sign) / 2**sfixed_fract
+
+def add_prototype_paths():
+    """Adds the folders of the virtual prototypes to the search path, the virtual prototypes are only imported to generate the vectors"""
+    for folder in ('cordic', 'triangle'):
+        path = os.path.join(TEST_DIR, folder)
+        if path not in sys.path:
+            sys.path.append(path)
+
+def generate_codes(config):
+    """Generates the codes of a configuration with the virtual prototypes
+
+    Args:
+        config (GoldenConfig): configuration to generate
+
+    Returns:
+        np.array: signed two's complement codes
+    """
+    add_prototype_paths()
+    import fixed_point
+    import vp_sin_generator
+    import vp_square_puls
+    import vp_triangle
+
+    Q = config.sfixed_fract
+    if config.mode == SINUS_MODE:
+        values = vp_sin_generator.sin_gen(Q, config.phase, config.iterations, config.n_samples)
+    elif config.mode == SQUARE_PULS_MODE:
+        values = vp_square_puls.square_puls(Q, config.phase, config.amplitude, config.n_samples)
+    elif config.mode == SAWTOOTH_MODE:
+        values = vp_triangle.sawtooth(Q, config.phase, config.amplitude, config.n_samples)
+    elif config.mode == TRIANGLE_MODE:
+        values = vp_triangle.triangle(Q, config.phase, config.amplitude, config.n_samples)
+    else:
+        raise ValueError(f'unknown mode {config.mode}')
+    return fixed_point.to_fixed(values, Q)
+
+def generate_batch(configs):
+    """Generates the codes of many configurations. The sinus is calculated as one batch over all phases
+       and the square puls as one batch over all thresholds of a phase.
+
+    Args:
+        configs (list): configurations to generate (GoldenConfig)
+
+    Returns:
+        list: signed two's complement codes of every configuration
+    """
+    add_prototype_paths()
+    import fixed_point
+    import vp_sin_generator
+    import vp_square_puls
+
+    # group the configurations that can be calculated together
+    groups = {}
+    for i, config in enumerate(configs):
+        if config.mode == SINUS_MODE:
+            key = (config.mode, config.sfixed_fract, config.iterations, config.n_samples)
+        elif config.mode == SQUARE_PULS_MODE:
+            key = (config.mode, config.sfixed_fract, config.phase_code, config.n_samples)
+        else:
+            key = (i,)
+        groups.setdefault(key, []).append(i)
+
+    codes = [None] * len(configs)
+    for indices in groups.values():
+        first = configs[indices[0]]
+        Q = first.sfixed_fract
+        if first.mode == SINUS_MODE:
+            phases = np.array([configs[i].phase for i in indices])
+            values = vp_sin_generator.sin_gen(Q, phases, first.iterations, first.n_samples)
+        elif first.mode == SQUARE_PULS_MODE:
+            thresholds = np.array([configs[i].amplitude for i in indices])
+            values = vp_square_puls.square_puls(Q, first.phase, thresholds, first.n_samples)
+        else:
+            codes[indices[0]] = generate_codes(first)
+            continue
+        for i, row in zip(indices, fixed_point.to_fixed(values, Q)):
+            codes[i] = row
+
+    return codes
+
+def sweep_configs(modes, phase_codes, amplitude_codes, n_samples, sfixed_fract=7, iterations=6):
+    """Creates the configurations of a sweep over the grid of modes, phase codes and amplitude codes.
+       The sinus does not use the amplitude register as amplitude, it is the x input of the cordic and is
+       set to the maximum amplitude without overflow (like in sin_gen). Therefore the sinus is only swept over the phase.
+
+    Args:
+        modes (list): waveform modes
+        phase_codes (list): two's complement codes of the phase register
+        amplitude_codes (list): two's complement codes of the amplitude register (threshold for the square puls)
+        n_samples (int): number of samples per configuration
+        sfixed_fract (int, optional): number of fractional bits. Defaults to 7.
+        iterations (int, optional): number of cordic iterations of the sinus. Defaults to 6.
+
+    Returns:
+        list: configurations of the sweep (GoldenConfig)
+    """
+    configs = []
+    mask = (2 << sfixed_fract) - 1
+    for mode in modes:
+        if mode == SINUS_MODE:
+            # the x input of the cordic, the same value as xi in sin_gen
+            add_prototype_paths()
+            import vp_cordic_iterative
+            x_code = (vp_cordic_iterative.get_cordic_config(sfixed_fract, iterations).amplitude_int - 1) & mask
+            grid = [(phase_code, x_code) for phase_code in phase_codes]
+        else:
+            grid = [(phase_code, amplitude_code) for phase_code in phase_codes for amplitude_code in amplitude_codes]
+
+        for phase_code, amplitude_code in grid:
+            name = f'sweep_mode{mode}_phase{phase_code & mask}_amplitude{amplitude_code & mask}'
+            configs.append(GoldenConfig(name, mode, sfixed_fract, phase_code & mask, amplitude_code & mask, n_samples,
+                                        iterations if mode == SINUS_MODE else 0))
+    return configs
+
+def vector_path(config, directory=GOLDEN_DIR):
+    """Returns the path of the vector file of a configuration
+
+    Args:
+        config (GoldenConfig): configuration of the vectors
+        directory (str, optional): folder of the vector files. Defaults to GOLDEN_DIR.
+
+    Returns:
+        str: path of the vector file
+    """
+    return os.path.join(directory, f'{config.name}.gv')
+
+def save(config, codes, path):
+    """Saves the codes of a configuration as vector file
+
+    Args:
+        config (GoldenConfig): configuration of the codes
+        codes (np.array): signed two's complement codes
+        path (str): path of the vector file
+    """
+    data = np.asarray(codes).astype(config.dtype).tobytes()
+    header = {
+        'config' : asdict(config),
+        'dtype' : config.dtype.str,
+        'hash' : config.vector_hash(data),
+    }
+    header = json.dumps(header, sort_keys=True).encode()
+    padding = -(PREAMBLE.size + len(header)) % DATA_ALIGNMENT
+    header += b' ' * padding
+
+    # write a temporary file first, a half written vector file is never loaded
+    with open(path + '.tmp', 'wb') as file:
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        file.write(data)
+    os.replace(path + '.tmp', path)
+
+def read_header(path):
+    """Reads the header of a vector file
+
+    Args:
+        path (str): path of the vector file
+
+    Returns:
+        (dict, int): header and offset of the codes in the file
+    """
+    with open(path, 'rb') as file:
+        magic, version, header_size = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a golden vector file of version {VERSION}')
+        header = json.loads(file.read(header_size))
+    return header, PREAMBLE.size + header_size
+
+def load(config, directory=GOLDEN_DIR):
+    """Loads the vectors of a configuration, the codes are memory mapped
+
+    Args:
+        config (GoldenConfig): configuration of the vectors
+        directory (str, optional): folder of the vector files. Defaults to GOLDEN_DIR.
+
+    Raises:
+        RuntimeError: the vector file does not belong to the configuration or its codes do not match the hash
+
+    Returns:
+        GoldenVectors: vectors of the configuration
+    """
+    path = vector_path(config, directory)
+    header, offset = read_header(path)
+    if header['config'] != asdict(config):
+        raise RuntimeError(f'golden vectors {path} are stale, regenerate them with: python common/golden_vectors.py')
+
+    codes = np.memmap(path, dtype=np.dtype(header['dtype']), mode='r', offset=offset, shape=(config.n_samples,))
+    if header['hash'] != config.vector_hash(codes.tobytes()):
+        raise RuntimeError(f'golden vectors {path} are damaged, regenerate them with: python common/golden_vectors.py')
+    return GoldenVectors(config, codes)
+
+def verify(config, directory=GOLDEN_DIR):
+    """Checks a vector file against a new generation with the virtual prototypes
+
+    Args:
+        config (GoldenConfig): configuration of the vectors
+        directory (str, optional): folder of the vector files. Defaults to GOLDEN_DIR.
+
+    Returns:
+        bool: true if the file can be loaded and the codes are the codes of the virtual prototypes
+    """
+    try:
+        vectors = load(config, directory)
+    except (OSError, ValueError, RuntimeError):
+        return False
+    return np.array_equal(vectors.codes, generate_codes(config))
+
+def main():
+    parser = argparse.ArgumentParser(description='generates the golden vectors with the virtual prototypes')
+    parser.add_argument('--check', action='store_true', help='only check that the vector files are up to date')
+    args = parser.parse_args()
+
+    stale = []
+    for config in TT_CONFIGS.values():
+        if args.check:
+            if not verify(config):
+                stale.append(config.name)
+        else:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            save(config, generate_codes(config), vector_path(config))
+            print(f'{vector_path(config)}: {config.n_samples} samples')
+
+    for name in stale:
+        print(f'{name} is stale')
+    return 1 if stale else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,27 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Shared cocotb harness of all testbenches: value encoding, driver of the register interface,
+# monitors of the parallel and the spi output, timing model with the monitors that follow it,
+# cycle indexed traces, scoreboards and the testbench of the wave generator.
+
+from .encoding import binstr_table, frac2code, frac2bin, frac2bin_array, bin2frac, unsigned2bin
+from .driver import WaveGeneratorPins, TB_PINS, WAVE_GENERATOR_PINS, WaveGeneratorDriver, reset_dut
+from .monitor import OutputMonitor
+from .spi_monitor import SpiFrame, SpiMonitor
+from .timing import WaveGeneratorTiming, output_latency, strobe_edges, enable_control_toggles
+from .timed_monitor import TimedOutputMonitor, TimedSpiMonitor
+from .trace import UNRESOLVED, record_trace, drive_loads, compare_traces
+from .scoreboard import Scoreboard
+from .bench import SweepCase, WaveGeneratorBench
@@ -0,0 +1,229 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the testbench of the wave generator. The bench configures the dut with the driver, samples the
+# parallel output (and the spi output of the tb) with the monitors and checks them with scoreboards that are fed
+# with the register codes of the virtual prototype. A sweep runs many configurations back to back in one simulation,
+# the dut is reset and the registers are written again between the cases. In the timed mode the monitors jump to
+# the clock edges of the timing model instead of waiting for the edges of the sample signals.
+
+# imports
+from dataclasses import dataclass
+import cocotb
+from cocotb.triggers import FallingEdge, Timer
+from .driver import WaveGeneratorDriver, TB_PINS
+from .monitor import OutputMonitor
+from .spi_monitor import SpiMonitor
+from .timed_monitor import TimedOutputMonitor, TimedSpiMonitor
+from .timing import WaveGeneratorTiming, enable_control_toggles
+from .scoreboard import Scoreboard
+
+@dataclass(frozen=True)
+class SweepCase:
+    """Case of a sweep
+
+    Attributes:
+        name (str): name of the case in the log
+        mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+        phase (float): phase that is accumulated per sample
+        amplitude (float): amplitude value (threshold for the square puls)
+        expected_codes (list[int] or np.array): unsigned register codes of the expected samples
+    """
+    name: str
+    mode: int
+    phase: float
+    amplitude: float
+    expected_codes: object
+
+class WaveGeneratorBench:
+    """Testbench of a wave generator dut
+
+    Attributes:
+        driver (WaveGeneratorDriver): driver of the register interface
+    """
+
+    def __init__(self, dut, pins=TB_PINS, sfixed_fract=7):
+        """Creates the testbench
+
+        Args:
+            dut : wave generator dut
+            pins (WaveGeneratorPins, optional): pin names of the dut. Defaults to TB_PINS.
+            sfixed_fract (int, optional): fixed-point notation of the data ports. Defaults to 7.
+        """
+        self.dut = dut
+        self.pins = pins
+        self.sfixed_fract = sfixed_fract
+        self.driver = WaveGeneratorDriver(dut, pins, sfixed_fract)
+
+    def start_checkers(self, expected_codes, debug=False, case_name=None):
+        """Starts the monitors of the outputs and the scoreboards that consume them
+
+        Args:
+            expected_codes (list[int] or np.array): unsigned register codes of the expected samples
+            debug (bool, optional): if true every checked sample is written to the log. Defaults to False.
+            case_name (str, optional): name of the sweep case in the reports of the scoreboards. Defaults to None.
+
+        Returns:
+            (list, list): started monitors, tasks of the scoreboards
+        """
+        log = self.dut._log if debug else None
+        driver = self.driver
+        prefix = f'{case_name}: ' if case_name else ''
+
+        # parallel output
+        data_monitor = OutputMonitor(driver.pin('data_o'), driver.pin('sample'), self.pins.sample_edge).start()
+        monitors = [data_monitor]
+        checkers = [cocotb.start_soon(Scoreboard(f'{prefix}data_o', expected_codes, self.sfixed_fract).consume(data_monitor.values, log))]
+
+        # serial output
+        if self.pins.spi_cs is not None:
+            spi_monitor = SpiMonitor(driver.pin('spi_clk'), driver.pin('spi_mosi'), driver.pin('spi_cs'), n_bits=self.sfixed_fract + 1).start()
+            monitors.append(spi_monitor)
+            checkers.append(cocotb.start_soon(Scoreboard(f'{prefix}spi_mosi', expected_codes, self.sfixed_fract).consume(spi_monitor.frames, log)))
+
+        return monitors, checkers
+
+    def start_timed_checkers(self, mode, expected_codes, enable_toggles=(), debug=False, case_name=None):
+        """Starts the monitors that follow the timing model and the scoreboards that consume them.
+           This must be done in the time step of the edge where the output is enabled
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            expected_codes (list[int] or np.array): unsigned register codes of the expected samples
+            enable_toggles (tuple, optional): (edge, value) pairs of the enable after the start. Defaults to ().
+            debug (bool, optional): if true every checked sample is written to the log. Defaults to False.
+            case_name (str, optional): name of the sweep case in the reports of the scoreboards. Defaults to None.
+
+        Returns:
+            (list, list): started monitors, tasks of the scoreboards
+        """
+        log = self.dut._log if debug else None
+        driver = self.driver
+        prefix = f'{case_name}: ' if case_name else ''
+        timing = WaveGeneratorTiming(mode, n_bits=self.sfixed_fract + 1)
+        n_samples = len(expected_codes)
+
+        # parallel output, the tb samples at the falling cs and the wave_generator at the valid strobe
+        if self.pins.sample_edge is FallingEdge:
+            data_monitor = TimedOutputMonitor(driver.clk, driver.pin('data_o'), driver.pin('sample'),
+                                              timing.cs_fall_edges(n_samples, enable_toggles), active_level=0).start()
+        else:
+            data_monitor = TimedOutputMonitor(driver.clk, driver.pin('data_o'), driver.pin('sample'),
+                                              timing.data_valid_edges(n_samples, enable_toggles)).start()
+        monitors = [data_monitor]
+        checkers = [cocotb.start_soon(Scoreboard(f'{prefix}data_o', expected_codes, self.sfixed_fract).consume(data_monitor.values, log))]
+
+        # serial output
+        if self.pins.spi_cs is not None:
+            spi_monitor = TimedSpiMonitor(driver.clk, driver.pin('spi_mosi'), driver.pin('spi_cs'), timing.cs_fall_edges(n_samples, enable_toggles),
+                                          timing.spi_bit_edges(n_samples, enable_toggles), timing.cs_rise_edges(n_samples, enable_toggles)).start()
+            monitors.append(spi_monitor)
+            checkers.append(cocotb.start_soon(Scoreboard(f'{prefix}spi_mosi', expected_codes, self.sfixed_fract).consume(spi_monitor.frames, log)))
+
+        return monitors, checkers
+
+    async def run(self, mode, phase, amplitude, expected_codes, enable_delay_ns, period_ns=10, debug=False, timed=False):
+        """Runs a test of the dut: configures the dut, tests the enable input and checks all outputs against the expected samples
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            phase (float): phase that is accumulated per sample
+            amplitude (float): amplitude value (threshold for the square puls)
+            expected_codes (list[int] or np.array): unsigned register codes of the expected samples (see frac2bin_array)
+            enable_delay_ns (int): time after the start until the enable input is tested
+            period_ns (int, optional): clock period. Defaults to 10.
+            debug (bool, optional): if true every checked sample is written to the log. Defaults to False.
+            timed (bool, optional): if true the outputs are sampled at the clock edges of the timing model and every
+                                    difference to the timing model fails the test. Defaults to False.
+        """
+        await self.driver.setup(mode, phase, amplitude, period_ns)
+
+        # start the checkers and a enable control that tests the enable input
+        if timed:
+            # the enable is toggled at clock edges, so the timing model knows the stimulus
+            delay_clks = enable_delay_ns // period_ns
+            monitors, checkers = self.start_timed_checkers(mode, expected_codes, enable_control_toggles(delay_clks), debug)
+            await self.driver.enable_control_clks(delay_clks)
+        else:
+            monitors, checkers = self.start_checkers(expected_codes, debug)
+            await self.driver.enable_control(enable_delay_ns)
+
+        # wait for the moment where all samples are checked
+        for checker in checkers:
+            await checker
+
+        for monitor in monitors:
+            monitor.stop()
+
+        self.dut._log.info('Test finished')
+
+    async def run_unchecked(self, mode, phase, amplitude, n_samples, enable_delay_ns, period_ns=10):
+        """Runs the same stimulus as run in the timed mode, but without monitors and checkers. The test only waits
+           until the timing model expects the last sample, the outputs are checked offline in the vcd dump
+           (see vcd_checker.py). Therefore long runs need no python callback per clock edge
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            phase (float): phase that is accumulated per sample
+            amplitude (float): amplitude value (threshold for the square puls)
+            n_samples (int): number of samples the dut generates
+            enable_delay_ns (int): time after the start until the enable input is tested
+            period_ns (int, optional): clock period. Defaults to 10.
+        """
+        await self.driver.setup(mode, phase, amplitude, period_ns)
+
+        # last event of the outputs after the reference edge
+        delay_clks = enable_delay_ns // period_ns
+        timing = WaveGeneratorTiming(mode, n_bits=self.sfixed_fract + 1)
+        toggles = enable_control_toggles(delay_clks)
+        if self.pins.spi_cs is not None:
+            last_edge = timing.cs_rise_edges(n_samples, toggles)[-1]
+        else:
+            last_edge = timing.data_valid_edges(n_samples, toggles)[-1]
+
+        cocotb.start_soon(self.driver.enable_control_clks(delay_clks))
+        await Timer(int(last_edge + 1) * period_ns, units='ns')
+
+        self.dut._log.info(f'Test finished, {n_samples} samples are in the dump')
+
+    async def run_sweep(self, cases, period_ns=10, debug=False, timed=False):
+        """Runs all cases of a sweep in one simulation. The clock is started once, every case resets the dut,
+           writes its configuration and checks all outputs against its expected samples
+
+        Args:
+            cases (list): cases of the sweep (SweepCase)
+            period_ns (int, optional): clock period. Defaults to 10.
+            debug (bool, optional): if true every checked sample is written to the log. Defaults to False.
+            timed (bool, optional): if true the outputs are sampled at the clock edges of the timing model. Defaults to False.
+        """
+        self.driver.start_clock(period_ns)
+
+        for i, case in enumerate(cases):
+            if debug:
+                self.dut._log.info(f'case {i + 1}/{len(cases)}: {case.name}')
+            await self.driver.configure(case.mode, case.phase, case.amplitude)
+
+            if timed:
+                monitors, checkers = self.start_timed_checkers(case.mode, case.expected_codes, (), debug, case.name)
+            else:
+                monitors, checkers = self.start_checkers(case.expected_codes, debug, case.name)
+            for checker in checkers:
+                await checker
+
+            # no sample of this case may reach the monitors of the next case
+            for monitor in monitors:
+                monitor.stop()
+            self.driver.disable()
+
+        self.dut._log.info(f'Sweep of {len(cases)} cases finished')
@@ -0,0 +1,243 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the driver of the wave generator. The driver writes the phase and amplitude register over the
+# data input and the set strobes, selects the waveform and controls the enable input. The same driver is used for
+# the wave_generator module and the tb of the tt_um_mayrmichael_wave_generator, only the pin names differ.
+
+# imports
+from dataclasses import dataclass
+import cocotb
+from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge
+from cocotb.clock import Clock
+from .encoding import frac2bin, unsigned2bin
+
+@dataclass(frozen=True)
+class WaveGeneratorPins:
+    """Names of the pins of a wave generator dut
+
+    Attributes:
+        clk (str): clock
+        rst_n (str): low active reset
+        enable (str): enable of the output sample generation
+        waveform (str): selection of the output wave
+        set_phase (str): strobe to set data_i as the new phase
+        set_amplitude (str): strobe to set data_i as the new amplitude
+        data_i (str): data input
+        data_o (str): parallel data output
+        sample (str): signal that indicates a new output sample
+        sample_edge (type): edge of the sample signal (RisingEdge or FallingEdge)
+        ena (str): design enable of the tiny tapeout template, None if the dut has no such pin
+        spi_clk (str): spi clock, None if the dut has no spi output
+        spi_mosi (str): spi mosi, None if the dut has no spi output
+        spi_cs (str): spi cs, None if the dut has no spi output
+    """
+    clk: str
+    rst_n: str
+    enable: str
+    waveform: str
+    set_phase: str
+    set_amplitude: str
+    data_i: str
+    data_o: str
+    sample: str
+    sample_edge: type
+    ena: str = None
+    spi_clk: str = None
+    spi_mosi: str = None
+    spi_cs: str = None
+
+# pins of the tb of the tt_um_mayrmichael_wave_generator, a new sample is indicated by the falling spi cs
+TB_PINS = WaveGeneratorPins(
+    clk='clk', rst_n='rst_n', enable='enable', waveform='waveform', set_phase='set_phase', set_amplitude='set_amplitude',
+    data_i='data_i', data_o='data_o', sample='spi_cs', sample_edge=FallingEdge,
+    ena='ena', spi_clk='spi_clk', spi_mosi='spi_mosi', spi_cs='spi_cs'
+)
+
+# pins of the wave_generator module
+WAVE_GENERATOR_PINS = WaveGeneratorPins(
+    clk='clk_i', rst_n='rst_i', enable='enable_i', waveform='waveform_i', set_phase='set_phase_strobe_i',
+    set_amplitude='set_amplitude_strobe_i', data_i='data_i', data_o='data_o', sample='data_valid_strobe_o', sample_edge=RisingEdge
+)
+
+async def reset_dut(reset_n, duration_ns):
+    """Method to reset a dut that is low active
+
+    Args:
+        reset_n : low active reset pin of dut
+        duration_ns (int): reset duration
+    """
+    reset_n.value = 0
+    await Timer(duration_ns, units="ns")
+    reset_n.value = 1
+    reset_n._log.info("Reset complete")
+
+class WaveGeneratorDriver:
+    """Driver of the register interface of a wave generator dut"""
+
+    def __init__(self, dut, pins=TB_PINS, sfixed_fract=7):
+        """Creates the driver
+
+        Args:
+            dut : wave generator dut
+            pins (WaveGeneratorPins, optional): pin names of the dut. Defaults to TB_PINS.
+            sfixed_fract (int, optional): fixed-point notation of the data input. Defaults to 7.
+        """
+        self.dut = dut
+        self.pins = pins
+        self.sfixed_fract = sfixed_fract
+        self.clk = getattr(dut, pins.clk)
+
+    def pin(self, name):
+        """Returns the handle of a pin
+
+        Args:
+            name (str): name of the pin in WaveGeneratorPins (e.g. data_o)
+
+        Returns:
+            handle of the pin
+        """
+        return getattr(self.dut, getattr(self.pins, name))
+
+    def init(self, mode):
+        """Sets all inputs of the dut into the idle state
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+        """
+        if self.pins.ena is not None:
+            self.pin('ena').value = 1
+        self.pin('enable').value = 0
+        self.pin('set_phase').value = 0
+        self.pin('set_amplitude').value = 0
+        self.set_waveform(mode)
+        self.pin('data_i').value = frac2bin(0, self.sfixed_fract)
+
+    def start_clock(self, period_ns=10):
+        """Starts the clock of the dut
+
+        Args:
+            period_ns (int, optional): clock period. Defaults to 10.
+        """
+        cocotb.start_soon(Clock(self.clk, period_ns, units="ns").start())
+
+    async def reset(self, duration_ns=20):
+        """Resets the dut
+
+        Args:
+            duration_ns (int, optional): reset duration. Defaults to 20.
+        """
+        await reset_dut(self.pin('rst_n'), duration_ns)
+
+    def set_waveform(self, mode):
+        """Selects the waveform of the output
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+        """
+        self.pin('waveform').value = unsigned2bin(mode, 2)
+
+    async def write_register(self, strobe, value):
+        """Writes a value over the data input into a register of the dut
+
+        Args:
+            strobe (str): name of the set strobe of the register (set_phase or set_amplitude)
+            value (float): value to write
+        """
+        await RisingEdge(self.clk)
+        self.pin('data_i').value = frac2bin(value, self.sfixed_fract)
+        self.pin(strobe).value = 1
+        # wait for one clock cycle to take over the new value
+        await RisingEdge(self.clk)
+        self.pin(strobe).value = 0
+
+    async def write_phase(self, phase):
+        """Writes the phase register of the dut
+
+        Args:
+            phase (float): phase that is accumulated per sample
+        """
+        await self.write_register('set_phase', phase)
+
+    async def write_amplitude(self, amplitude):
+        """Writes the amplitude register of the dut (the threshold for the square puls)
+
+        Args:
+            amplitude (float): amplitude value
+        """
+        await self.write_register('set_amplitude', amplitude)
+
+    def enable(self):
+        """Enables the output sample generation"""
+        self.pin('enable').value = 1
+
+    def disable(self):
+        """Disables the output sample generation"""
+        self.pin('enable').value = 0
+
+    async def setup(self, mode, phase, amplitude, period_ns=10, reset_ns=20):
+        """Starts the dut and writes the configuration of the output wave, afterwards the output is enabled
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            phase (float): phase that is accumulated per sample
+            amplitude (float): amplitude value
+            period_ns (int, optional): clock period. Defaults to 10.
+            reset_ns (int, optional): reset duration. Defaults to 20.
+        """
+        self.start_clock(period_ns)
+        await self.configure(mode, phase, amplitude, reset_ns)
+
+    async def configure(self, mode, phase, amplitude, reset_ns=20):
+        """Resets the running dut and writes a new configuration of the output wave, afterwards the output is enabled.
+           With a running clock this starts the next case of a sweep
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            phase (float): phase that is accumulated per sample
+            amplitude (float): amplitude value
+            reset_ns (int, optional): reset duration. Defaults to 20.
+        """
+        self.init(mode)
+        await self.reset(reset_ns)
+        await self.write_phase(phase)
+        await self.write_amplitude(amplitude)
+        self.enable()
+
+    async def enable_control(self, delay_ns, disabled_clks=70):
+        """This method should test the enable port of the wave generator. This is done by deactivating
+           the enable port after some time. Therefore no new value should be printed out. After some time the enable port
+           is set high again to test the other output samples
+
+        Args:
+            delay_ns (int): time until the enable port is deactivated
+            disabled_clks (int, optional): number of clock cycles where the enable port is low. Defaults to 70.
+        """
+        await Timer(delay_ns, units='ns')
+        self.disable()
+        await ClockCycles(self.clk, disabled_clks)
+        self.enable()
+
+    async def enable_control_clks(self, delay_clks, disabled_clks=70):
+        """Same test of the enable port as enable_control, but the delay is counted in clock cycles after the
+           configuration. This is the stimulus of timing.enable_control_toggles
+
+        Args:
+            delay_clks (int): clock cycles until the enable port is deactivated
+            disabled_clks (int, optional): number of clock cycles where the enable port is low. Defaults to 70.
+        """
+        await ClockCycles(self.clk, delay_clks)
+        self.disable()
+        await ClockCycles(self.clk, disabled_clks)
+        self.enable()
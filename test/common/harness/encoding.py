@@ -0,0 +1,125 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module encodes the values of the virtual prototypes into the binary values of the dut ports. 
+# The binary strings of all register codes are precomputed per register width, so every conversion is a table lookup.
+
+# imports
+import functools
+import numpy as np
+from cocotb.binary import BinaryValue, BinaryRepresentation
+
+@functools.lru_cache(maxsize=None)
+def binstr_table(n_bits):
+    """Creates the encode table of a register with n_bits. The table holds the binary string of all 2**n_bits codes 
+       and is indexed with the unsigned code of the register, so a two's complement value is encoded with code & mask
+
+    Args:
+        n_bits (int): number of bits
+
+    Returns:
+        tuple: binary strings of all codes (MSB first)
+    """
+    return tuple(format(code, f'0{n_bits}b') for code in range(1 << n_bits))
+
+def frac2code(x, sfixed_fract):
+    """The method converts a float number into the unsigned code of the two's complement fixed-point register
+
+    Args:
+        x (float): value to convert
+        sfixed_fract (int): fixed-point notation
+
+    Raises:
+        ValueError: the value does not fit into the register
+
+    Returns:
+        int: register code between 0 and 2**(sfixed_fract+1)-1
+    """
+    code = int(x * 2**sfixed_fract)
+    if not -(1 << sfixed_fract) <= code < (1 << sfixed_fract):
+        raise ValueError(f'{x} overflows the register of the Q0.{sfixed_fract} notation')
+    return code & ((2 << sfixed_fract) - 1)
+
+def frac2bin(x, sfixed_fract):
+    """The method converts a float number into a BinaryValue object
+
+    Args:
+        x (float): value to convert
+        sfixed_fract (int): fixed-point notation
+
+    Raises:
+        ValueError: the value does not fit into the register
+
+    Returns:
+        BinaryValue: binary twos compliment fixed-point object
+    """
+    frac_bits = sfixed_fract + 1
+    return BinaryValue(value=binstr_table(frac_bits)[frac2code(x, sfixed_fract)], n_bits=frac_bits, binaryRepresentation=BinaryRepresentation.TWOS_COMPLEMENT )
+
+def frac2bin_array(values, sfixed_fract, binstr=True):
+    """The method encodes a whole vector of float numbers (e.g. the output of a virtual prototype) in one call
+
+    Args:
+        values (np.array): values to convert
+        sfixed_fract (int): fixed-point notation
+        binstr (bool, optional): return binary strings instead of register codes. Defaults to True.
+
+    Raises:
+        ValueError: a value does not fit into the register
+
+    Returns:
+        list or np.array: binary strings of the values or the unsigned register codes of the values
+    """
+    # same truncation and range check as in frac2code, but for all values at once
+    codes = np.trunc(np.multiply(values, 2**sfixed_fract)).astype(np.int64)
+    overflows = (codes < -(1 << sfixed_fract)) | (codes >= (1 << sfixed_fract))
+    if np.any(overflows):
+        raise ValueError(f'{np.asarray(values)[overflows][0]} overflows the register of the Q0.{sfixed_fract} notation')
+    codes &= (2 << sfixed_fract) - 1
+    if not binstr:
+        return codes
+    table = binstr_table(sfixed_fract + 1)
+    return [table[code] for code in codes.tolist()]
+
+def bin2frac(binstr):
+    """The method converts the binary string of a two's complement fixed-point register back into a float number
+
+    Args:
+        binstr (str): binary string (MSB first), the fixed-point notation is given by the length of the string
+
+    Returns:
+        float: value of the register
+    """
+    sfixed_fract = len(binstr) - 1
+    code = int(binstr, 2)
+    if code >> sfixed_fract:
+        code -= 2 << sfixed_fract
+    return code / 2**sfixed_fract
+
+def unsigned2bin(x, n_bits):
+    """The method converts a unsigned int number into a BinaryValue object
+
+    Args:
+        x (int): value to convert
+        n_bits (int): number of bits
+
+    Raises:
+        ValueError: the value does not fit into the register
+
+    Returns:
+        BinaryValue: binary unsigned value
+    """
+    if not 0 <= x < (1 << n_bits):
+        raise ValueError(f'{x} does not fit into an unsigned register with {n_bits} bits')
+    return BinaryValue(value=binstr_table(n_bits)[x], n_bits=n_bits)
@@ -0,0 +1,63 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the monitor of a parallel dut output. The monitor samples the output on every edge of a
+# sample signal (e.g. a valid strobe) and pushes the values into a queue, where a scoreboard consumes them.
+
+# imports
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import RisingEdge
+
+class OutputMonitor:
+    """Monitor that samples a parallel output of the dut
+
+    Attributes:
+        values (Queue): queue with the sampled values (BinaryValue)
+    """
+
+    def __init__(self, output, sample, sample_edge=RisingEdge):
+        """Creates the monitor, the monitor is started with start()
+
+        Args:
+            output : output signal of the dut
+            sample : signal that indicates a new output sample
+            sample_edge (type, optional): edge of the sample signal (RisingEdge or FallingEdge). Defaults to RisingEdge.
+        """
+        self.output = output
+        self.sample = sample
+        self.sample_edge = sample_edge
+        self.values = Queue()
+        self._task = None
+
+    def start(self):
+        """Starts the coroutine of the monitor
+
+        Returns:
+            OutputMonitor: the started monitor
+        """
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stops the coroutine of the monitor"""
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _run(self):
+        """samples the output on every edge of the sample signal"""
+        while True:
+            await self.sample_edge(self.sample)
+            self.values.put_nowait(self.output.value)
@@ -0,0 +1,165 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the scoreboard of the cosims. The expected values of the virtual prototype are converted once
+# into the unsigned register codes of the checked dut output, therefore every sample is checked with a single
+# integer compare. The samples of the dut are either checked directly or consumed from the queue of a monitor.
+
+# imports
+from .spi_monitor import SpiFrame
+
+class Scoreboard:
+    """Checks the samples of a dut output one after another against the expected register codes
+
+    Attributes:
+        name (str): name of the checked output, used in the failure report
+        sfixed_fract (int): fixed-point notation of the output
+        expected_codes (list[int]): unsigned register codes of the expected samples
+        index (int): index of the next sample to check
+    """
+
+    def __init__(self, name, expected_codes, sfixed_fract):
+        """Creates a scoreboard for a dut output
+
+        Args:
+            name (str): name of the checked output
+            expected_codes (list[int] or np.array): unsigned register codes (see encoding.frac2bin_array)
+            sfixed_fract (int): fixed-point notation of the output
+        """
+        self.name = name
+        self.sfixed_fract = sfixed_fract
+        self.mask = (2 << sfixed_fract) - 1
+        # python ints are compared faster than numpy scalars
+        self.expected_codes = [int(code) for code in expected_codes]
+        self.index = 0
+
+    @classmethod
+    def from_binstrs(cls, name, binstrs):
+        """Creates a scoreboard from binary strings of the expected samples
+
+        Args:
+            name (str): name of the checked output
+            binstrs (list[str]): binary strings of the expected samples (MSB first)
+
+        Returns:
+            Scoreboard: scoreboard of the output
+        """
+        return cls(name, [int(binstr, 2) for binstr in binstrs], len(binstrs[0]) - 1)
+
+    def __len__(self):
+        return len(self.expected_codes)
+
+    @property
+    def done(self):
+        """bool: true if all expected samples are checked"""
+        return self.index >= len(self.expected_codes)
+
+    def decode(self, code):
+        """Decodes a unsigned register code into its value of the Q0.{sfixed_fract} notation
+
+        Args:
+            code (int): unsigned register code
+
+        Returns:
+            float: value of the code
+        """
+        if code >> self.sfixed_fract:
+            code -= self.mask + 1
+        return code / 2**self.sfixed_fract
+
+    def expected_binstr(self, index):
+        """Returns the binary string of a expected sample (e.g. for the debug output)
+
+        Args:
+            index (int): index of the sample
+
+        Returns:
+            str: binary string of the sample
+        """
+        return format(self.expected_codes[index], f'0{self.sfixed_fract + 1}b')
+
+    def report(self, index, expected, actual):
+        """Creates the failure report of a mismatch
+
+        Args:
+            index (int): index of the sample
+            expected (int): expected register code
+            actual (int or str): register code of the dut or the binary string if it is not resolvable
+
+        Returns:
+            str: failure report
+        """
+        expected_str = f'{self.expected_binstr(index)} ({self.decode(expected)})'
+        if isinstance(actual, str):
+            actual_str = f'{actual} (not resolvable)'
+        else:
+            actual_str = f'{format(actual, f"0{self.sfixed_fract + 1}b")} ({self.decode(actual)})'
+        return f'{self.name} mismatch at sample #{index}: expected {expected_str}, got {actual_str}'
+
+    def check(self, value):
+        """Checks the next sample of the dut output, the first mismatch raises a AssertionError with the report
+
+        Args:
+            value (BinaryValue or int): value of the dut output
+
+        Returns:
+            int: expected register code of the checked sample (e.g. to check the serial output)
+        """
+        index = self.index
+        expected = self.expected_codes[index]
+
+        if isinstance(value, int):
+            actual = value & self.mask
+        elif value.is_resolvable:
+            actual = value.integer & self.mask
+        else:
+            raise AssertionError(self.report(index, expected, value.binstr))
+
+        if actual != expected:
+            raise AssertionError(self.report(index, expected, actual))
+
+        self.index += 1
+        return expected
+
+    def check_frame(self, frame):
+        """Checks the next sample against a frame of the spi monitor
+
+        Args:
+            frame (SpiFrame): received frame
+
+        Returns:
+            int: expected register code of the checked sample
+        """
+        # the cs line must stay low during the whole frame
+        assert frame.complete, f'{self.name}: cs glitch in sample #{self.index} at {frame.end_time} ns'
+        return self.check(frame.value)
+
+    async def consume(self, queue, log=None):
+        """Checks the samples of a monitor queue until all expected samples are checked
+
+        Args:
+            queue (Queue): queue of a OutputMonitor or a SpiMonitor
+            log (optional): logger to write every checked sample to. Defaults to None.
+        """
+        while not self.done:
+            sample = await queue.get()
+
+            if log is not None:
+                actual = f'{sample.value:0{self.sfixed_fract + 1}b}' if isinstance(sample, SpiFrame) else sample.binstr
+                log.info(f'{self.name} #{self.index:>03} -> {actual} | {self.expected_binstr(self.index)}')
+
+            if isinstance(sample, SpiFrame):
+                self.check_frame(sample)
+            else:
+                self.check(sample)
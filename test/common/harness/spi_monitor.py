@@ -0,0 +1,144 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the monitor of the spi master. The monitor shifts in the mosi line on the sample edge of
+# the spi mode and pushes every received frame with its timestamps into a queue, where a checker consumes it.
+#     Mode | Clock Polarity (CPOL/CKP) | Clock Phase (CPHA) | sample edge
+#      0   |             0             |        0           |   rising
+#      1   |             0             |        1           |   falling
+#      2   |             1             |        0           |   falling
+#      3   |             1             |        1           |   rising
+
+# imports
+from dataclasses import dataclass
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import RisingEdge, FallingEdge
+from cocotb.utils import get_sim_time
+
+@dataclass(frozen=True)
+class SpiFrame:
+    """Frame that was received by the spi monitor
+
+    Attributes:
+        value (int): received bits (MSB first)
+        n_bits (int): number of received bits
+        start_time (int): simulation time in ns of the start of the frame (falling cs or first bit without cs)
+        end_time (int): simulation time in ns of the end of the frame (rising cs or last bit without cs)
+        complete (bool): false if the cs line went high before all bits of the frame were received
+    """
+    value: int
+    n_bits: int
+    start_time: int
+    end_time: int
+    complete: bool = True
+
+class SpiMonitor:
+    """Monitor that receives the frames of a spi master
+
+    Attributes:
+        frames (Queue): queue with the received frames (SpiFrame)
+        glitches (int): number of frames that were interrupted by the cs line
+    """
+
+    def __init__(self, spi_clk, spi_mosi, spi_cs=None, spi_mode=0, n_bits=8):
+        """Creates the monitor, the monitor is started with start()
+
+        Args:
+            spi_clk : spi clock signal of the dut
+            spi_mosi : mosi signal of the dut
+            spi_cs (optional): low active cs signal of the dut. Without cs a frame ends after n_bits. Defaults to None.
+            spi_mode (int, optional): spi mode of the master (0 to 3). Defaults to 0.
+            n_bits (int, optional): number of bits per frame. Defaults to 8.
+        """
+        if spi_mode not in range(4):
+            raise ValueError(f'spi mode {spi_mode} is not supported, use a mode between 0 and 3')
+
+        self.spi_clk = spi_clk
+        self.spi_mosi = spi_mosi
+        self.spi_cs = spi_cs
+        self.spi_mode = spi_mode
+        self.n_bits = n_bits
+        self.frames = Queue()
+        self.glitches = 0
+
+        # state of the current frame
+        self._value = 0
+        self._n_received = 0
+        self._start_time = 0
+        self._tasks = []
+
+    @property
+    def sample_edge(self):
+        """type: trigger of the edge where the mosi line is sampled (leading edge for CPHA=0, trailing edge for CPHA=1)"""
+        return RisingEdge if self.spi_mode in (0, 3) else FallingEdge
+
+    def start(self):
+        """Starts the coroutines of the monitor
+
+        Returns:
+            SpiMonitor: the started monitor
+        """
+        self._tasks.append(cocotb.start_soon(self._sample_mosi()))
+        if self.spi_cs is not None:
+            self._tasks.append(cocotb.start_soon(self._watch_cs()))
+        return self
+
+    def stop(self):
+        """Stops the coroutines of the monitor"""
+        for task in self._tasks:
+            task.kill()
+        self._tasks = []
+
+    def _new_frame(self):
+        self._value = 0
+        self._n_received = 0
+        self._start_time = get_sim_time(units='ns')
+
+    def _push_frame(self, complete):
+        self.frames.put_nowait(SpiFrame(self._value, self._n_received, self._start_time, get_sim_time(units='ns'), complete))
+        self._new_frame()
+
+    async def _sample_mosi(self):
+        """shifts in the mosi line on every sample edge of the spi clock"""
+        edge = self.sample_edge
+        while True:
+            await edge(self.spi_clk)
+
+            # edges without an active cs do not belong to a frame
+            if self.spi_cs is not None and self.spi_cs.value != 0:
+                continue
+
+            if self.spi_cs is None and self._n_received == 0:
+                self._start_time = get_sim_time(units='ns')
+
+            self._value = (self._value << 1) | int(self.spi_mosi.value)
+            self._n_received += 1
+
+            # without cs the frame ends with the last bit
+            if self.spi_cs is None and self._n_received == self.n_bits:
+                self._push_frame(True)
+
+    async def _watch_cs(self):
+        """frames the received bits with the cs line and detects cs glitches"""
+        while True:
+            await FallingEdge(self.spi_cs)
+            self._new_frame()
+            await RisingEdge(self.spi_cs)
+
+            # a frame with a missing or an additional bit is a glitch of the cs line
+            complete = self._n_received == self.n_bits
+            if not complete:
+                self.glitches += 1
+            self._push_frame(complete)
@@ -0,0 +1,166 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the monitors that follow the timing model (see timing.py). Instead of waiting for every
+# edge of a sample signal the monitors jump with ClockCycles to the predicted clock edges and sample the dut once
+# per event. At every event the sample signal is checked, a difference to the timing model fails the test.
+
+# imports
+import abc
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import ClockCycles, ReadOnly
+from cocotb.utils import get_sim_time
+from .spi_monitor import SpiFrame
+
+class TimedMonitor(abc.ABC):
+    """Base of the monitors that jump to the clock edges of the timing model. The edges are counted from the
+       edge where the monitor is started (the reference edge of the timing model)."""
+
+    def __init__(self, clk):
+        """Creates the monitor, the monitor is started with start()
+
+        Args:
+            clk : clock of the dut
+        """
+        self.clk = clk
+        self.edge = 0
+        self._task = None
+
+    def start(self):
+        """Starts the coroutine of the monitor, this must be done in the time step of the reference edge
+
+        Returns:
+            TimedMonitor: the started monitor
+        """
+        self.edge = 0
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stops the coroutine of the monitor"""
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def advance(self, edge):
+        """Jumps to a clock edge, afterwards the values of the dut after this edge can be read
+
+        Args:
+            edge (int): clock edge after the reference edge
+        """
+        if edge < self.edge:
+            raise ValueError(f'clock edge {edge} is in the past (current edge {self.edge})')
+        if edge > self.edge:
+            await ClockCycles(self.clk, edge - self.edge)
+            self.edge = edge
+            await ReadOnly()
+
+    async def expect(self, signal, level, edge, event):
+        """Jumps to a clock edge and checks the level of a signal
+
+        Args:
+            signal : signal of the dut
+            level (int): expected level after the edge
+            edge (int): clock edge after the reference edge
+            event (str): description of the event for the report
+
+        Raises:
+            AssertionError: the signal has not the level of the timing model
+        """
+        await self.advance(edge)
+        if signal.value.binstr != str(level):
+            raise AssertionError(f'timing drift at {event}: {signal._name} is {signal.value.binstr} at clock edge {edge}, '
+                                 f'the timing model expects {level}')
+
+    @abc.abstractmethod
+    async def _run(self):
+        """follows the events of the timing model, this coroutine is started by start()"""
+
+class TimedOutputMonitor(TimedMonitor):
+    """Monitor that samples a parallel output of the dut at the events of the timing model
+
+    Attributes:
+        values (Queue): queue with the sampled values (BinaryValue)
+    """
+
+    def __init__(self, clk, output, sample, event_edges, active_level=1):
+        """Creates the monitor, the monitor is started with start()
+
+        Args:
+            clk : clock of the dut
+            output : output signal of the dut
+            sample : signal that indicates a new output sample
+            event_edges (np.array): clock edges where the sample signal changes to the active level
+            active_level (int, optional): level of the sample signal after the event (0 for a falling cs). Defaults to 1.
+        """
+        super().__init__(clk)
+        self.output = output
+        self.sample = sample
+        self.event_edges = [int(edge) for edge in event_edges]
+        self.active_level = active_level
+        self.values = Queue()
+
+    async def _run(self):
+        """checks the change of the sample signal at every event and samples the output"""
+        for i, edge in enumerate(self.event_edges):
+            event = f'sample #{i}'
+            await self.expect(self.sample, 1 - self.active_level, edge - 1, event)
+            await self.expect(self.sample, self.active_level, edge, event)
+            self.values.put_nowait(self.output.value)
+
+class TimedSpiMonitor(TimedMonitor):
+    """Monitor that receives the frames of the spi output at the events of the timing model
+
+    Attributes:
+        frames (Queue): queue with the received frames (SpiFrame)
+    """
+
+    def __init__(self, clk, spi_mosi, spi_cs, cs_fall_edges, bit_edges, cs_rise_edges):
+        """Creates the monitor, the monitor is started with start()
+
+        Args:
+            clk : clock of the dut
+            spi_mosi : mosi signal of the dut
+            spi_cs : cs signal of the dut
+            cs_fall_edges (np.array): clock edges of the falling cs
+            bit_edges (np.array): clock edges where the bits are stable on mosi, shape (frames, bits)
+            cs_rise_edges (np.array): clock edges of the rising cs
+        """
+        super().__init__(clk)
+        self.spi_mosi = spi_mosi
+        self.spi_cs = spi_cs
+        self.cs_fall_edges = [int(edge) for edge in cs_fall_edges]
+        self.bit_edges = [[int(edge) for edge in edges] for edges in bit_edges]
+        self.cs_rise_edges = [int(edge) for edge in cs_rise_edges]
+        self.frames = Queue()
+
+    async def _run(self):
+        """receives the bits of every frame and checks the cs around the frame"""
+        for i, (cs_fall, bit_edges, cs_rise) in enumerate(zip(self.cs_fall_edges, self.bit_edges, self.cs_rise_edges)):
+            event = f'spi frame #{i}'
+            await self.expect(self.spi_cs, 0, cs_fall, event)
+            start_time = get_sim_time('ns')
+
+            value = 0
+            for edge in bit_edges:
+                await self.advance(edge)
+                bit = self.spi_mosi.value.binstr
+                if bit not in ('0', '1'):
+                    raise AssertionError(f'{event}: {self.spi_mosi._name} is not resolvable ({bit}) at clock edge {edge}')
+                value = (value << 1) | int(bit)
+
+            await self.expect(self.spi_cs, 0, cs_rise - 1, event)
+            await self.expect(self.spi_cs, 1, cs_rise, event)
+            self.frames.put_nowait(SpiFrame(value, len(bit_edges), start_time, get_sim_time('ns')))
@@ -0,0 +1,207 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module is the cycle accurate timing model of the wave_generator and of the spi output of the
+# tt_um_mayrmichael_wave_generator. All times are numbers of rising clock edges after a reference edge, the
+# reference edge is the edge where the driver enables the output (the end of WaveGeneratorDriver.configure).
+# A value written by the testbench after an edge is sampled by the dut at the next edge, therefore the enable
+# of the reference edge is sampled from edge 1 on.
+#
+# strobe_generator: the counter only runs at edges where the enable is sampled high, the strobe register is set
+#                   at every CLKS_PER_STROBE-th of these edges
+# wave_generator:   the output register and data_valid_strobe_o follow the strobe after the latency of the waveform
+#                   sawtooth: counter (1) + output register (1)
+#                   square puls: counter (1) + square_puls_generator (1) + output register (1)
+#                   triangle: counter (1) + triangle_generator state machine (2) + output register (1)
+#                   sinus: phase accumulator (1) + cordic_convergence (1) + cordic_iterative start (1)
+#                          + one edge per iteration + output register (1)
+# spi (single cs):  cs falls one edge after data_valid_strobe_o, the spi clock toggles every CLKS_PER_HALF_BIT
+#                   edges and is delayed by one register, cs rises two edges after the 16th toggle
+
+# imports
+import numpy as np
+
+# number of clock cycles between two strobes of the strobe_generator
+CLKS_PER_STROBE = 40
+
+# number of iterations of the cordic_iterative module
+CORDIC_ITERATIONS = 6
+
+# modes of the wave generator
+SINUS_MODE = 0
+SQUARE_PULS_MODE = 1
+SAWTOOTH_MODE = 2
+TRIANGLE_MODE = 3
+
+# latency from the strobe to data_valid_strobe_o of the wave_generator (without the cordic iterations)
+OUTPUT_LATENCY = {
+    SINUS_MODE : 4,
+    SQUARE_PULS_MODE : 3,
+    SAWTOOTH_MODE : 2,
+    TRIANGLE_MODE : 4,
+}
+
+# edges of the cs state machine: from data_valid_strobe_o to the falling cs, and from the last spi clock toggle to
+# the rising cs (tx_ready of the spi master is set one edge after the last toggle and the cs register one edge later)
+CS_FALL_LATENCY = 1
+CS_RISE_LATENCY = 2
+
+# edges after the rising cs until the cs state machine accepts a new byte (CS_INACTIVE_CLKS=1)
+CS_INACTIVE_EDGES = 3
+
+def output_latency(mode, iterations=CORDIC_ITERATIONS):
+    """Returns the number of clock cycles from the strobe of the strobe_generator to data_valid_strobe_o
+
+    Args:
+        mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+        iterations (int, optional): number of cordic iterations. Defaults to CORDIC_ITERATIONS.
+
+    Returns:
+        int: latency in clock cycles
+    """
+    if mode not in OUTPUT_LATENCY:
+        raise ValueError(f'unknown mode {mode}')
+    return OUTPUT_LATENCY[mode] + (iterations if mode == SINUS_MODE else 0)
+
+def enable_control_toggles(delay_clks, disabled_clks=70):
+    """Returns the enable toggles of WaveGeneratorDriver.enable_control_clks
+
+    Args:
+        delay_clks (int): clock cycles after the reference edge until the enable is cleared
+        disabled_clks (int, optional): clock cycles where the enable is low. Defaults to 70.
+
+    Returns:
+        tuple: (edge, value) pairs, the enable is sampled with value from edge on
+    """
+    return ((delay_clks + 1, 0), (delay_clks + disabled_clks + 1, 1))
+
+def strobe_edges(n_strobes, enable_toggles=(), clks_per_strobe=CLKS_PER_STROBE):
+    """Calculates the edges where the strobe_generator sets its strobe
+
+    Args:
+        n_strobes (int): number of strobes
+        enable_toggles (tuple, optional): (edge, value) pairs of the enable after the reference edge. Defaults to ().
+        clks_per_strobe (int, optional): clock cycles between two strobes. Defaults to CLKS_PER_STROBE.
+
+    Returns:
+        np.array: edges of the strobes
+    """
+    toggles = sorted(enable_toggles)
+    # the strobes are delayed by at most the edges before the last toggle
+    horizon = n_strobes * clks_per_strobe + max((edge for edge, _ in toggles), default=0) + 1
+
+    # enable value that is sampled at every edge, the enable of the reference edge is sampled from edge 1 on
+    enabled = np.zeros(horizon + 1, dtype=bool)
+    enabled[1:] = True
+    for edge, value in toggles:
+        enabled[edge:] = bool(value)
+
+    # the counter runs at every enabled edge and the strobe is set at every clks_per_strobe-th of them
+    n_enabled = np.cumsum(enabled)
+    edges = np.flatnonzero(enabled & (n_enabled % clks_per_strobe == 0))
+    if len(edges) < n_strobes:
+        raise ValueError(f'the enable is low for too long to create {n_strobes} strobes')
+    return edges[:n_strobes]
+
+class WaveGeneratorTiming:
+    """Timing model of the outputs of the wave_generator and the spi output of the tt_um_mayrmichael_wave_generator
+
+    Attributes:
+        mode (int): waveform of the output
+        latency (int): clock cycles from the strobe to data_valid_strobe_o
+        clks_per_strobe (int): clock cycles between two strobes
+        spi_mode (int): mode of the spi master
+        clks_per_half_bit (int): clock cycles per half spi bit
+        n_bits (int): number of bits per spi frame
+    """
+
+    def __init__(self, mode, iterations=CORDIC_ITERATIONS, clks_per_strobe=CLKS_PER_STROBE, spi_mode=0, clks_per_half_bit=2, n_bits=8):
+        """Creates the timing model
+
+        Args:
+            mode (int): waveform of the output (0 sinus, 1 square puls, 2 sawtooth, 3 triangle)
+            iterations (int, optional): number of cordic iterations. Defaults to CORDIC_ITERATIONS.
+            clks_per_strobe (int, optional): clock cycles between two strobes. Defaults to CLKS_PER_STROBE.
+            spi_mode (int, optional): mode of the spi master. Defaults to 0.
+            clks_per_half_bit (int, optional): clock cycles per half spi bit. Defaults to 2.
+            n_bits (int, optional): number of bits per spi frame. Defaults to 8.
+        """
+        self.mode = mode
+        self.latency = output_latency(mode, iterations)
+        self.clks_per_strobe = clks_per_strobe
+        self.spi_mode = spi_mode
+        self.clks_per_half_bit = clks_per_half_bit
+        self.n_bits = n_bits
+
+        # a frame that is not finished at the next sample would drop this sample
+        if self.spi_frame_clks + CS_INACTIVE_EDGES > clks_per_strobe:
+            raise ValueError(f'a spi frame of {self.spi_frame_clks} clock cycles does not fit between two samples')
+
+    @property
+    def spi_frame_clks(self):
+        """int: clock cycles from the falling to the rising cs"""
+        return 2 * self.n_bits * self.clks_per_half_bit + CS_RISE_LATENCY
+
+    def data_valid_edges(self, n_samples, enable_toggles=()):
+        """Calculates the edges where data_o is updated and data_valid_strobe_o is set
+
+        Args:
+            n_samples (int): number of samples
+            enable_toggles (tuple, optional): (edge, value) pairs of the enable after the reference edge. Defaults to ().
+
+        Returns:
+            np.array: edges of the samples
+        """
+        return strobe_edges(n_samples, enable_toggles, self.clks_per_strobe) + self.latency
+
+    def cs_fall_edges(self, n_samples, enable_toggles=()):
+        """Calculates the edges where the cs of the spi output falls
+
+        Args:
+            n_samples (int): number of samples
+            enable_toggles (tuple, optional): (edge, value) pairs of the enable after the reference edge. Defaults to ().
+
+        Returns:
+            np.array: edges of the falling cs
+        """
+        return self.data_valid_edges(n_samples, enable_toggles) + CS_FALL_LATENCY
+
+    def spi_bit_edges(self, n_samples, enable_toggles=()):
+        """Calculates the edges where the bits of the spi frames are stable on mosi. This is the leading edge of the
+           spi clock for the modes 0 and 2 and the trailing edge for the modes 1 and 3.
+
+        Args:
+            n_samples (int): number of samples
+            enable_toggles (tuple, optional): (edge, value) pairs of the enable after the reference edge. Defaults to ().
+
+        Returns:
+            np.array: edges of the bits (MSB first), shape (n_samples, n_bits)
+        """
+        # the spi clock register toggles every clks_per_half_bit edges after the falling cs and the output is delayed by one edge
+        clk_phase = self.spi_mode in (1, 3)
+        bits = np.arange(self.n_bits)
+        offsets = 1 + (2 * bits + 1 + clk_phase) * self.clks_per_half_bit
+        return self.cs_fall_edges(n_samples, enable_toggles)[:, np.newaxis] + offsets
+
+    def cs_rise_edges(self, n_samples, enable_toggles=()):
+        """Calculates the edges where the cs of the spi output rises
+
+        Args:
+            n_samples (int): number of samples
+            enable_toggles (tuple, optional): (edge, value) pairs of the enable after the reference edge. Defaults to ().
+
+        Returns:
+            np.array: edges of the rising cs
+        """
+        return self.cs_fall_edges(n_samples, enable_toggles) + self.spi_frame_clks
@@ -0,0 +1,91 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module records cycle indexed traces of dut signals and compares them in bulk against the traces of a
+# virtual prototype. Index t of a trace is the value of a signal after the rising clock edge t, the edge where
+# the recording starts is edge 0.
+
+# imports
+import numpy as np
+from cocotb.triggers import ClockCycles, RisingEdge, ReadOnly
+from .encoding import unsigned2bin
+
+# value of a sample that is not resolvable (x or z)
+UNRESOLVED = -1
+
+async def record_trace(clk, signals, n_cycles):
+    """Records the values of signals after every rising clock edge, must be started in the time step of edge 0
+
+    Args:
+        clk : clock of the dut
+        signals (dict): name and signal of the dut
+        n_cycles (int): number of clock cycles to record
+
+    Returns:
+        dict: name and trace (np.array) of every signal, not resolvable values are UNRESOLVED
+    """
+    trace = {name: np.zeros(n_cycles, dtype=np.int64) for name in signals}
+    for t in range(n_cycles):
+        if t > 0:
+            await RisingEdge(clk)
+        await ReadOnly()
+        for name, signal in signals.items():
+            value = signal.value
+            trace[name][t] = value.integer if value.is_resolvable else UNRESOLVED
+    return trace
+
+async def drive_loads(clk, strobe, data, load_cycles, values, width=8):
+    """Loads values with a strobe at given clock edges, must be started in the time step of edge 0.
+       The strobe is high for one edge, the data input holds the value until the next load
+
+    Args:
+        clk : clock of the dut
+        strobe : strobe input of the dut
+        data : data input of the dut
+        load_cycles (list[int] or np.array): edges where the dut samples the strobe high (at least edge 1)
+        values (list[int] or np.array): unsigned values to load
+        width (int, optional): width of the data input. Defaults to 8.
+    """
+    edge = 0
+    for load_cycle, value in zip(load_cycles, values):
+        # a value written after an edge is sampled by the dut at the next edge
+        if load_cycle - 1 > edge:
+            await ClockCycles(clk, int(load_cycle) - 1 - edge)
+        strobe.value = 1
+        data.value = unsigned2bin(int(value), width)
+        await ClockCycles(clk, 1)
+        edge = int(load_cycle)
+        strobe.value = 0
+
+def compare_traces(trace, expected):
+    """Compares recorded traces with the traces of a virtual prototype
+
+    Args:
+        trace (dict): name and recorded trace of every signal
+        expected (dict): name and expected trace, only these signals are compared
+
+    Returns:
+        list[str]: description of the first mismatch of every signal that differs, empty if all traces are equal
+    """
+    mismatches = []
+    for name, expected_trace in expected.items():
+        actual = np.asarray(trace[name])
+        expected_trace = np.asarray(expected_trace)
+        n_cycles = min(len(actual), len(expected_trace))
+        differs = np.flatnonzero(actual[:n_cycles] != expected_trace[:n_cycles])
+        if differs.size:
+            t = differs[0]
+            mismatches.append(f'{name}: {differs.size} of {n_cycles} cycles differ, first at cycle {t} '
+                              f'(is {actual[t]}, expected {expected_trace[t]})')
+    return mismatches
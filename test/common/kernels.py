@@ -0,0 +1,223 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module holds the sequential loop kernels of the virtual prototypes. If numba is installed the kernels are
+# compiled and the virtual prototypes use them, otherwise the virtual prototypes run on their numpy implementation.
+# The backend can be selected with the environment variable VP_BACKEND (numpy or numba) or with set_backend.
+
+# imports
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# available backends of the virtual prototypes
+BACKENDS = ('numpy', 'numba')
+
+# the compiled kernels are used as soon as numba is installed
+backend = 'numba' if numba is not None else 'numpy'
+
+def set_backend(name):
+    """Selects the backend of the virtual prototypes
+
+    Args:
+        name (str): name of the backend (numpy or numba)
+
+    Raises:
+        ValueError: the backend is unknown
+        ImportError: the numba backend is selected but numba is not installed
+    """
+    global backend
+    if name not in BACKENDS:
+        raise ValueError(f'unknown backend {name}, use one of {BACKENDS}')
+    if name == 'numba' and numba is None:
+        raise ImportError('the numba backend needs the numba package')
+    backend = name
+
+# the environment variable is checked like set_backend, a typo or a missing numba fails at the import
+if 'VP_BACKEND' in os.environ:
+    set_backend(os.environ['VP_BACKEND'])
+
+def use_jit():
+    """Checks if the virtual prototypes should use the compiled kernels
+
+    Returns:
+        bool: true if the numba backend is selected and numba is installed
+    """
+    return backend == 'numba' and numba is not None
+
+def jit(func):
+    """Compiles a kernel with numba if it is installed, otherwise the kernel stays a python function
+
+    Args:
+        func (callable): kernel to compile
+
+    Returns:
+        callable: compiled or unchanged kernel
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+@jit
+def wrap_kernel(x, sfixed_fract):
+    """Wraps a integer value into the range of a signed register with sfixed_fract+1 bits (see fixed_point.wrap)
+
+    Args:
+        x (int): integer value to wrap
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        int: wrapped integer code
+    """
+    offset = 1 << sfixed_fract
+    return ((x + offset) & ((offset << 1) - 1)) - offset
+
+@jit
+def cordic_kernel(xi, yi, zi, angles_int, shift_vector, iterations, sfixed_fract):
+    """Loop kernel of the cordic algorithm for a batch of input vectors (see vp_cordic_iterative.cordic_fixed)
+
+    Args:
+        xi (np.array): 1-D array with the x input codes
+        yi (np.array): 1-D array with the y input codes
+        zi (np.array): 1-D array with the z input codes
+        angles_int (np.array): integer codes of the micro angeles
+        shift_vector (np.array): shift values per iteration
+        iterations (int): amount of iterations
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        (np.array, np.array, np.array): integer codes of all intermediate results with the shape (iterations+1, batch)
+    """
+    n = xi.shape[0]
+    xo = np.zeros((iterations + 1, n), dtype=np.int64)
+    yo = np.zeros((iterations + 1, n), dtype=np.int64)
+    zo = np.zeros((iterations + 1, n), dtype=np.int64)
+
+    for j in range(n):
+        x = xi[j]
+        y = yi[j]
+        z = zi[j]
+        xo[0, j] = x
+        yo[0, j] = y
+        zo[0, j] = z
+        for i in range(iterations):
+            s = shift_vector[i]
+            if z >= 0:
+                x, y, z = x - (y >> s), y + (x >> s), z - angles_int[i]
+            else:
+                x, y, z = x + (y >> s), y - (x >> s), z + angles_int[i]
+            x = wrap_kernel(x, sfixed_fract)
+            y = wrap_kernel(y, sfixed_fract)
+            z = wrap_kernel(z, sfixed_fract)
+            xo[i + 1, j] = x
+            yo[i + 1, j] = y
+            zo[i + 1, j] = z
+
+    return xo, yo, zo
+
+@jit
+def sawtooth_kernel(phase_int, amplitude_scaled, n_samples, sfixed_fract):
+    """Loop kernel of the sawtooth signal (see vp_triangle.sawtooth_fixed)
+
+    Args:
+        phase_int (int): integer code of the value that is accumulated per iteration
+        amplitude_scaled (float): amplitude value scaled with 2**sfixed_fract
+        n_samples (int): number of samples to generate
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        np.array: array with the integer codes of all sawtooth values
+    """
+    calc_values = np.zeros(n_samples, dtype=np.int64)
+    counter = wrap_kernel(phase_int, sfixed_fract)
+
+    for i in range(n_samples):
+        calc_values[i] = counter
+        if counter <= amplitude_scaled:
+            counter = wrap_kernel(counter + phase_int, sfixed_fract)
+        else:
+            counter = wrap_kernel(-counter, sfixed_fract)
+
+    return calc_values
+
+@jit
+def triangle_kernel(phase_int, amplitude_scaled, n_samples, sfixed_fract):
+    """Loop kernel of the triangle signal (see vp_triangle.triangle)
+
+    Args:
+        phase_int (int): integer code of the value that is accumulated per iteration
+        amplitude_scaled (float): amplitude value scaled with 2**sfixed_fract
+        n_samples (int): number of samples to generate
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        np.array: array with the integer codes of all triangle values
+    """
+    calc_values = np.zeros(n_samples, dtype=np.int64)
+    counter = wrap_kernel(phase_int, sfixed_fract)
+    old_counter = counter
+    reverse = False
+    rev_counter = 0
+
+    for i in range(n_samples):
+        if i > 0:
+            if counter <= amplitude_scaled:
+                counter = wrap_kernel(counter + phase_int, sfixed_fract)
+            else:
+                counter = wrap_kernel(-counter, sfixed_fract)
+
+            # always one overflow is ignored
+            if (counter < 0) != (old_counter < 0):
+                if rev_counter == 0:
+                    reverse = not reverse
+                    rev_counter = 1
+                else:
+                    rev_counter = 0
+
+        if reverse:
+            calc_values[i] = wrap_kernel(-counter, sfixed_fract)
+        else:
+            calc_values[i] = counter
+        old_counter = counter
+
+    return calc_values
+
+@jit
+def square_puls_kernel(phase_int, threshold_scaled, sfixed_fract, out):
+    """Loop kernel of the square puls (see vp_square_puls.square_puls), the values are written into out
+
+    Args:
+        phase_int (int): integer code of the value that is accumulated per iteration
+        threshold_scaled (float): threshold scaled with 2**sfixed_fract
+        sfixed_fract (int): sets the number of fractional bits
+        out (np.array): 1-D float array for the square puls values, its length is the number of samples
+
+    Returns:
+        np.array: out with the values of 1-LSB and -1+LSB
+    """
+    one = ((1 << sfixed_fract) - 1) / 2**sfixed_fract
+    counter = 0
+
+    for i in range(out.shape[0]):
+        counter = wrap_kernel(counter + phase_int, sfixed_fract)
+        if counter >= threshold_scaled:
+            out[i] = one
+        else:
+            out[i] = -one
+
+    return out
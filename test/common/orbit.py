@@ -0,0 +1,93 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module detects the period of the generators. With the Q0.{sfixed_fract} registers every generator is a
+# finite state machine, therefore its output is eventually periodic. The output is stored as a transient part
+# and a cycle, any number of samples is then created by tiling the cycle.
+
+# imports
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass(frozen=True)
+class Orbit:
+    """Output sequence of a generator split into the transient part and the cycle that repeats forever
+
+    Attributes:
+        transient (np.array): samples before the cycle starts
+        cycle (np.array): samples of one period
+    """
+    transient: np.ndarray
+    cycle: np.ndarray
+
+    def samples(self, n_samples):
+        """creates the first n_samples of the output sequence by tiling the cycle
+
+        Args:
+            n_samples (int): number of samples to generate
+
+        Returns:
+            np.array: array with all samples
+        """
+        n_transient = min(n_samples, len(self.transient))
+        calc_values = np.empty(n_samples, dtype=self.cycle.dtype)
+        calc_values[:n_transient] = self.transient[:n_transient]
+        calc_values[n_transient:] = np.resize(self.cycle, n_samples - n_transient)
+        return calc_values
+
+    def sample(self, index):
+        """returns a single sample of the output sequence without creating the samples before
+
+        Args:
+            index (int): index of the sample
+
+        Returns:
+            float: sample at the index
+        """
+        if index < len(self.transient):
+            return self.transient[index]
+        return self.cycle[(index - len(self.transient)) % len(self.cycle)]
+
+def find_orbit(next_state, state0):
+    """Simulates a finite state machine until a state repeats.
+
+    Args:
+        next_state (callable): function that calculates the next state from the current state (states must be hashable)
+        state0: state of the first sample
+
+    Returns:
+        (int, int): number of different states until the first repetition, index of the state where the cycle starts
+    """
+    seen = {}
+    state = state0
+    while state not in seen:
+        seen[state] = len(seen)
+        state = next_state(state)
+    return len(seen), seen[state]
+
+def generate_orbit(generate, next_state, state0):
+    """Creates the orbit of a generator. The period is detected with the state machine and
+       the samples of the transient and one cycle are created by the generator itself.
+
+    Args:
+        generate (callable): function that creates the first n samples of the generator
+        next_state (callable): function that calculates the next state from the current state
+        state0: state of the first sample
+
+    Returns:
+        Orbit: transient and cycle of the generator
+    """
+    n_states, cycle_start = find_orbit(next_state, state0)
+    calc_values = generate(n_states)
+    return Orbit(calc_values[:cycle_start], calc_values[cycle_start:])
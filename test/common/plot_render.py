@@ -0,0 +1,141 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module is the rendering path of the plot scripts. Long signals are decimated to a min/max envelope with
+# one column per pixel of the axes, therefore the plot costs the same for 10**3 and 10**7 samples and every peak
+# stays visible. Without a display (or with --output) the figures are written as png or svg files with the Agg
+# backend of matplotlib instead of being shown.
+
+# imports
+import argparse
+import os
+import sys
+import numpy as np
+
+# file formats of the headless rendering
+FORMATS = ('png', 'svg')
+
+def envelope(x, y, n_columns):
+    """Decimates a signal to the min/max envelope of n_columns columns. Every column is drawn as a vertical
+       line from its min to its max, the columns are connected to one line
+
+    Args:
+        x (np.array): x values (increasing, e.g. the sample index)
+        y (np.array): y values
+        n_columns (int): number of columns (pixels of the axes)
+
+    Returns:
+        (np.array, np.array): x and y values of the envelope, the signal itself if it has at most 2 * n_columns samples
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= 2 * n_columns:
+        return x, y
+
+    # the samples are split into columns of (almost) the same number of samples
+    starts = np.linspace(0, len(y), n_columns, endpoint=False).astype(np.int64)
+    y_min = np.minimum.reduceat(y, starts)
+    y_max = np.maximum.reduceat(y, starts)
+
+    # min and max of every column at the x value of its first sample
+    x_env = np.repeat(x[starts], 2)
+    y_env = np.empty(2 * n_columns, dtype=y.dtype)
+    y_env[0::2] = y_min
+    y_env[1::2] = y_max
+    return x_env, y_env
+
+def has_display():
+    """Checks if figures can be shown on a display
+
+    Returns:
+        bool: false on linux machines without a X11 or wayland display (e.g. ci runners)
+    """
+    if sys.platform.startswith('linux'):
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+def parse_args(description, n_samples):
+    """Parses the common arguments of the plot scripts
+
+    Args:
+        description (str): description of the script
+        n_samples (int): default number of samples
+
+    Returns:
+        argparse.Namespace: samples, output (folder or None) and format
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-n', '--samples', type=int, default=n_samples, help=f'number of samples (default: {n_samples})')
+    parser.add_argument('-o', '--output', default=None, help='write the figures to this folder instead of showing them')
+    parser.add_argument('--format', choices=FORMATS, default='png', help='file format of the written figures')
+    return parser.parse_args()
+
+def pyplot(output=None):
+    """Imports pyplot, without a display or with an output folder the Agg backend is selected before
+
+    Args:
+        output (str, optional): folder of the written figures. Defaults to None.
+
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib
+    if output is not None or not has_display():
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def plot(ax, x, y, **kwargs):
+    """Plots a signal decimated to one min/max column per pixel of the axes
+
+    Args:
+        ax (matplotlib.axes.Axes): axes of the plot
+        x (np.array): x values (increasing)
+        y (np.array): y values
+        **kwargs: arguments of ax.plot (e.g. label)
+
+    Returns:
+        list: lines of the plot
+    """
+    figure = ax.figure
+    n_columns = max(1, int(ax.get_position().width * figure.get_figwidth() * figure.dpi))
+    x_env, y_env = envelope(x, y, n_columns)
+    return ax.plot(x_env, y_env, **kwargs)
+
+def finish(plt, names, output=None, file_format='png'):
+    """Shows the figures or writes them as files if there is no display or an output folder is given
+
+    Args:
+        plt (module): matplotlib.pyplot
+        names (list[str]): file names of the figures in the order they were created
+        output (str, optional): folder of the written figures, the working directory without a display. Defaults to None.
+        file_format (str, optional): png or svg. Defaults to 'png'.
+
+    Returns:
+        list[str]: paths of the written files, empty if the figures were shown
+    """
+    if output is None and has_display():
+        plt.show()
+        return []
+
+    output = output or os.getcwd()
+    os.makedirs(output, exist_ok=True)
+    paths = []
+    for number, name in zip(plt.get_fignums(), names):
+        path = os.path.join(output, f'{name}.{file_format}')
+        plt.figure(number).savefig(path)
+        paths.append(path)
+        print(path)
+    plt.close('all')
+    return paths
@@ -0,0 +1,73 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the design space exploration of the cordic: errors, cache and pareto frontier.
+# Run with: pytest test/common
+
+# imports
+import os
+import numpy as np
+
+import design_space
+from design_space import DesignPoint
+
+def test_errors_decrease_with_iterations():
+    points = [design_space.evaluate(11, n) for n in (2, 4, 6, 8)]
+    errors = [point.sinus_max_error for point in points]
+    assert errors == sorted(errors, reverse=True)
+    assert points[-1].cycles == 10
+
+def test_sinus_error_covers_all_phase_codes():
+    # every sample of every phase code is one of the states of the phase accumulator
+    point = design_space.evaluate(7, 6)
+    gain = design_space.exact_gain(6)
+    worst = 0
+    for phase_code in (1, 3, 39, 100):
+        calc_values, xc, yc, zc, xi_values, yi, zi_values = design_space.vp_sin_generator.sin_gen_debug(7, phase_code / 128, 6, 256)
+        worst = max(worst, np.max(np.abs(calc_values - xi_values * gain * np.sin(np.pi * zi_values))))
+    assert worst <= point.sinus_max_error
+
+def test_cache(tmp_path):
+    point, cached = design_space.cached_evaluate(7, 6, str(tmp_path))
+    assert not cached
+    assert design_space.cached_evaluate(7, 6, str(tmp_path)) == (point, True)
+    assert len(os.listdir(tmp_path)) == 1
+
+def test_pareto_frontier():
+    def point(q, n, error):
+        return DesignPoint(q, n, design_space.cordic_cycles(n), error, error, error, error)
+
+    points = [point(7, 4, 0.2), point(11, 4, 0.1), point(7, 6, 0.15), point(11, 6, 0.03), point(11, 8, 0.05), point(15, 8, 0.01)]
+    frontier = design_space.pareto_frontier(points)
+    assert [(p.sfixed_fract, p.iterations) for p in frontier] == [(11, 4), (11, 6), (15, 8)]
+
+def test_overflows_are_counted_separately():
+    # Q12 with 12 iterations exceeds full scale, the wrapped values are not part of the accuracy
+    point = design_space.evaluate(12, 12)
+    assert point.overflow
+    assert point.rotation_overflows > 0 and point.sinus_overflows > 0
+    assert point.sinus_max_error < design_space.WRAP_ERROR
+    assert point.sinus_bits > 0
+
+    assert not design_space.evaluate(12, 8).overflow
+
+def test_pareto_frontier_without_overflows():
+    points = [DesignPoint(7, 4, 6, 0.2, 0.2, 0.2, 0.2), DesignPoint(12, 4, 6, 0.01, 0.01, 0.01, 0.01, 3, 5)]
+    assert design_space.pareto_frontier(points) == [points[0]]
+
+    # the frontier of a grid with wrap-around is made of points without overflows
+    grid = [design_space.evaluate(q, n) for q in (7, 12) for n in (6, 8, 10, 12)]
+    assert any(point.overflow for point in grid)
+    frontier = design_space.pareto_frontier(grid)
+    assert frontier and not any(point.overflow for point in frontier)
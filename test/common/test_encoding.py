@@ -0,0 +1,57 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the encode tables of the harness.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+from harness import frac2bin, frac2bin_array, bin2frac, unsigned2bin
+
+@pytest.mark.parametrize('sfixed_fract', [4, 7, 15])
+def test_all_codes(sfixed_fract):
+    values = np.arange(-(1 << sfixed_fract), 1 << sfixed_fract) / 2**sfixed_fract
+    binstrs = frac2bin_array(values, sfixed_fract)
+    codes = frac2bin_array(values, sfixed_fract, binstr=False)
+
+    for value, binstr, code in zip(values, binstrs, codes):
+        assert frac2bin(value, sfixed_fract).binstr == binstr
+        assert int(binstr, 2) == code
+        assert bin2frac(binstr) == value
+
+def test_truncation():
+    # values between two codes are truncated towards zero like int()
+    assert frac2bin(0.3, 7).binstr == '00100110'
+    assert frac2bin(-0.3, 7).binstr == '11011010'
+
+def test_unsigned():
+    assert [unsigned2bin(n, 2).binstr for n in range(4)] == ['00', '01', '10', '11']
+
+@pytest.mark.parametrize('value', [1.0, 1.5, -1 - 2**-7, -2.0, 100.0])
+def test_overflow(value):
+    # the baseline BitArray encoding raised on overflow, a wrapped code would hide an overflow of the prototype
+    with pytest.raises(ValueError, match='overflows'):
+        frac2bin(value, 7)
+    with pytest.raises(ValueError, match='overflows'):
+        frac2bin_array(np.array([0.0, value]), 7, binstr=False)
+
+def test_range_limits():
+    assert frac2bin(-1.0, 7).binstr == '10000000'
+    assert frac2bin(1 - 2**-7, 7).binstr == '01111111'
+    with pytest.raises(ValueError):
+        unsigned2bin(4, 2)
+    with pytest.raises(ValueError):
+        unsigned2bin(-1, 2)
@@ -0,0 +1,198 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Parity test of the virtual prototypes on the integer fixed-point core against the float implementation they
+# replaced. The float reference below is the sample by sample loop of the first virtual prototypes, the virtual
+# prototypes have to be bit identical to it for random inputs on both backends.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+import kernels
+import vp_cordic_iterative
+import vp_sin_generator
+import vp_triangle
+import vp_square_puls
+
+N_RANDOM = 20
+NUMBER_OF_SAMPLES = 200
+
+def float_quantize(x, lsb):
+    """quantize_value of the float implementation (truncation and one wrap)"""
+    x_q = np.floor(x / lsb) * lsb
+    if x_q < -1:
+        x_q = x_q + 2
+    elif x_q > 1 - lsb:
+        x_q = x_q - 2
+    return x_q
+
+def float_sra(x, s, sfixed_fract):
+    """sra of the float implementation"""
+    if s == 0:
+        return x
+    return (int(x * 2**sfixed_fract) >> s) / 2**sfixed_fract
+
+def float_cordic(xi, yi, zi, angles_vector, shift_vector, iterations, sfixed_fract):
+    """cordic of the float implementation for one input vector"""
+    lsb = 2**(-sfixed_fract)
+    xo = np.zeros(iterations+1)
+    yo = np.zeros(iterations+1)
+    zo = np.zeros(iterations+1)
+    xo[0], yo[0], zo[0] = xi, yi, zi
+
+    for i in range(iterations):
+        sigma = 1 if zo[i] >= 0 else -1
+        y_shift = float_quantize(float_sra(yo[i], shift_vector[i], sfixed_fract), lsb)
+        x_shift = float_quantize(float_sra(xo[i], shift_vector[i], sfixed_fract), lsb)
+        xo[i+1] = float_quantize(xo[i] - sigma * y_shift, lsb)
+        yo[i+1] = float_quantize(yo[i] + sigma * x_shift, lsb)
+        zo[i+1] = float_quantize(zo[i] - sigma * angles_vector[i], lsb)
+
+    return xo, yo, zo
+
+def float_tables(sfixed_fract, iterations):
+    """shift values, micro angles and k of the float implementation"""
+    lsb = 2**(-sfixed_fract)
+    shift_vector = np.arange(iterations)
+    angles_vector = np.array([float_quantize(angle, lsb) for angle in np.arctan(2.0 ** -shift_vector) / np.pi])
+    k = float_quantize(np.prod(1 / np.sqrt(1 + 2.0 ** (-2 * shift_vector))), lsb)
+    return shift_vector, angles_vector, k
+
+def float_sin_gen(sfixed_fract, phase, iterations, n_samples):
+    """sin_gen of the float implementation"""
+    lsb = 2**(-sfixed_fract)
+    shift_vector, angles_vector, k = float_tables(sfixed_fract, iterations)
+    xi = float_quantize(float_quantize(float_quantize(1.0 - lsb, lsb) * k, lsb) - lsb, lsb)
+    yi = 0.0
+    zi = 0.0
+
+    calc_values = np.zeros(n_samples)
+    for i in range(n_samples):
+        zi = float_quantize(zi + phase, lsb)
+        xc, yc, zc = xi, yi, zi
+        if zi < -0.5:
+            xc, yc, zc = yi, -xi, zi + 0.5
+        elif zi > 0.5:
+            xc, yc, zc = -yi, xi, zi - 0.5
+        xo, yo, zo = float_cordic(float_quantize(xc, lsb), float_quantize(yc, lsb), float_quantize(zc, lsb),
+                                  angles_vector, shift_vector, iterations, sfixed_fract)
+        calc_values[i] = yo[iterations]
+    return calc_values
+
+def float_sawtooth(sfixed_fract, phase, amplitude, n_samples):
+    """sawtooth of the float implementation"""
+    lsb = 2**(-sfixed_fract)
+    calc_values = np.zeros(n_samples)
+    counter = float_quantize(phase, lsb)
+    calc_values[0] = counter
+    for i in range(1, n_samples):
+        if counter <= amplitude:
+            counter = float_quantize(counter + phase, lsb)
+        else:
+            counter = float_quantize(-counter, lsb)
+        calc_values[i] = counter
+    return calc_values
+
+def float_triangle(sfixed_fract, phase, amplitude, n_samples):
+    """triangle of the float implementation"""
+    lsb = 2**(-sfixed_fract)
+    calc_values = np.zeros(n_samples)
+    counter = float_quantize(phase, lsb)
+    calc_values[0] = counter
+    old_counter = counter
+    reverse = False
+    rev_counter = 0
+    for i in range(1, n_samples):
+        if counter <= amplitude:
+            counter = float_quantize(counter + phase, lsb)
+        else:
+            counter = float_quantize(-counter, lsb)
+        if np.signbit(counter) != np.signbit(old_counter):
+            if rev_counter == 0:
+                reverse = not reverse
+                rev_counter = 1
+            else:
+                rev_counter = 0
+        calc_values[i] = float_quantize(-counter, lsb) if reverse else float_quantize(counter, lsb)
+        old_counter = counter
+    return calc_values
+
+def float_square_puls(sfixed_fract, phase, threshold, n_samples):
+    """square_puls of the float implementation"""
+    lsb = 2**(-sfixed_fract)
+    calc_values = np.zeros(n_samples)
+    counter = 0
+    for i in range(n_samples):
+        counter = float_quantize(counter + phase, lsb)
+        calc_values[i] = float_quantize(1 - lsb, lsb) if counter >= threshold else float_quantize(-1 + lsb, lsb)
+    return calc_values
+
+@pytest.fixture(params=kernels.BACKENDS)
+def backend(request, monkeypatch):
+    """runs a test on every installed backend"""
+    if request.param == 'numba' and kernels.numba is None:
+        pytest.skip('numba is not installed')
+    monkeypatch.setattr(kernels, 'backend', request.param)
+    return request.param
+
+def random_values(rng, sfixed_fract, low, high):
+    """random inputs between low and high, half of them on the grid of the lsb and half of them between two codes"""
+    values = rng.uniform(low, high, N_RANDOM)
+    values[::2] = np.floor(values[::2] * 2**sfixed_fract) / 2**sfixed_fract
+    return values
+
+@pytest.mark.parametrize('sfixed_fract, iterations', [(7, 6), (7, 8), (10, 9), (15, 15)])
+def test_cordic(backend, sfixed_fract, iterations):
+    rng = np.random.default_rng(sfixed_fract * 100 + iterations)
+    lsb = 2**(-sfixed_fract)
+    shift_vector, angles_vector, k = float_tables(sfixed_fract, iterations)
+
+    # inputs on the grid inside the convergence range
+    codes = rng.integers(-(1 << sfixed_fract), 1 << sfixed_fract, (2, N_RANDOM))
+    x = codes[0] * lsb * k
+    x = np.floor(x / lsb) * lsb
+    y = codes[1] * lsb * k
+    y = np.floor(y / lsb) * lsb
+    z = rng.integers(-(1 << (sfixed_fract - 1)), (1 << (sfixed_fract - 1)) + 1, N_RANDOM) * lsb
+
+    xo, yo, zo = vp_cordic_iterative.cordic(x, y, z, angles_vector, shift_vector, iterations, sfixed_fract)
+    for j in range(N_RANDOM):
+        expected = float_cordic(x[j], y[j], z[j], angles_vector, shift_vector, iterations, sfixed_fract)
+        for values, reference in zip((xo[:, j], yo[:, j], zo[:, j]), expected):
+            assert np.array_equal(values, reference), (x[j], y[j], z[j])
+
+@pytest.mark.parametrize('sfixed_fract, iterations', [(7, 6), (10, 9)])
+def test_sin_gen(backend, sfixed_fract, iterations):
+    rng = np.random.default_rng(sfixed_fract)
+    for phase in random_values(rng, sfixed_fract, -1, 1):
+        assert np.array_equal(vp_sin_generator.sin_gen(sfixed_fract, phase, iterations, NUMBER_OF_SAMPLES),
+                              float_sin_gen(sfixed_fract, phase, iterations, NUMBER_OF_SAMPLES)), phase
+
+@pytest.mark.parametrize('sfixed_fract', [7, 10])
+def test_sawtooth_and_triangle(backend, sfixed_fract):
+    rng = np.random.default_rng(sfixed_fract + 1)
+    for phase, amplitude in zip(random_values(rng, sfixed_fract, 0, 0.5), random_values(rng, sfixed_fract, 0, 1)):
+        assert np.array_equal(vp_triangle.sawtooth(sfixed_fract, phase, amplitude, NUMBER_OF_SAMPLES),
+                              float_sawtooth(sfixed_fract, phase, amplitude, NUMBER_OF_SAMPLES)), (phase, amplitude)
+        assert np.array_equal(vp_triangle.triangle(sfixed_fract, phase, amplitude, NUMBER_OF_SAMPLES),
+                              float_triangle(sfixed_fract, phase, amplitude, NUMBER_OF_SAMPLES)), (phase, amplitude)
+
+@pytest.mark.parametrize('sfixed_fract', [7, 10])
+def test_square_puls(backend, sfixed_fract):
+    rng = np.random.default_rng(sfixed_fract + 2)
+    for phase, threshold in zip(random_values(rng, sfixed_fract, -1, 1), random_values(rng, sfixed_fract, -1, 1)):
+        assert np.array_equal(vp_square_puls.square_puls(sfixed_fract, phase, threshold, NUMBER_OF_SAMPLES),
+                              float_square_puls(sfixed_fract, phase, threshold, NUMBER_OF_SAMPLES)), (phase, threshold)
@@ -0,0 +1,100 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the golden vector store: file format, stale detection and the committed vector files.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+import golden_vectors
+from golden_vectors import GoldenConfig, TT_CONFIGS
+
+def test_save_and_load(tmp_path):
+    config = GoldenConfig('test', golden_vectors.SAWTOOTH_MODE, 7, 0b00000011, 0b01000000, 50)
+    codes = golden_vectors.generate_codes(config)
+    golden_vectors.save(config, codes, golden_vectors.vector_path(config, str(tmp_path)))
+
+    vectors = golden_vectors.load(config, str(tmp_path))
+    assert isinstance(vectors.codes, np.memmap)
+    assert vectors.codes.dtype == np.int8
+    assert np.array_equal(vectors.codes, codes)
+    assert vectors.expected_codes() == [int(code) & 0xff for code in codes]
+    assert golden_vectors.verify(config, str(tmp_path))
+
+def test_wide_codes(tmp_path):
+    config = GoldenConfig('test', golden_vectors.SINUS_MODE, 15, 0b0010011100000000, 0, 100, iterations=15)
+    codes = golden_vectors.generate_codes(config)
+    golden_vectors.save(config, codes, golden_vectors.vector_path(config, str(tmp_path)))
+
+    vectors = golden_vectors.load(config, str(tmp_path))
+    assert vectors.codes.dtype == np.dtype('<i2')
+    assert np.array_equal(vectors.codes, codes)
+
+def test_stale_config(tmp_path):
+    config = GoldenConfig('test', golden_vectors.TRIANGLE_MODE, 7, 0b00000001, 0b01011000, 50)
+    golden_vectors.save(config, golden_vectors.generate_codes(config), golden_vectors.vector_path(config, str(tmp_path)))
+
+    # same file name with other parameters
+    changed = GoldenConfig('test', golden_vectors.TRIANGLE_MODE, 7, 0b00000010, 0b01011000, 50)
+    with pytest.raises(RuntimeError, match='stale'):
+        golden_vectors.load(changed, str(tmp_path))
+    assert not golden_vectors.verify(changed, str(tmp_path))
+
+def test_damaged_codes(tmp_path):
+    config = GoldenConfig('test', golden_vectors.SAWTOOTH_MODE, 7, 0b00000011, 0b01000000, 50)
+    path = golden_vectors.vector_path(config, str(tmp_path))
+    golden_vectors.save(config, golden_vectors.generate_codes(config), path)
+
+    # flip the last code of the file
+    with open(path, 'r+b') as file:
+        file.seek(-1, 2)
+        last = file.read(1)
+        file.seek(-1, 2)
+        file.write(bytes([last[0] ^ 1]))
+    with pytest.raises(RuntimeError, match='damaged'):
+        golden_vectors.load(config, str(tmp_path))
+
+def test_outdated_codes_are_loaded_but_not_verified(tmp_path):
+    config = GoldenConfig('test', golden_vectors.SAWTOOTH_MODE, 7, 0b00000011, 0b01000000, 50)
+    codes = golden_vectors.generate_codes(config)
+    golden_vectors.save(config, codes + 1, golden_vectors.vector_path(config, str(tmp_path)))
+
+    # the file is consistent, only a new generation with the virtual prototypes finds the other codes
+    assert np.array_equal(golden_vectors.load(config, str(tmp_path)).codes, codes + 1)
+    assert not golden_vectors.verify(config, str(tmp_path))
+
+def test_register_values():
+    config = TT_CONFIGS['sinus']
+    assert config.phase == 39 / 128
+    assert golden_vectors.code2frac(0b10000001, 7) == -127 / 128
+
+@pytest.mark.parametrize('name', TT_CONFIGS)
+def test_committed_vectors_are_up_to_date(name):
+    assert golden_vectors.verify(TT_CONFIGS[name]), f'run python test/common/golden_vectors.py to regenerate {name}'
+
+def test_sweep_batch_equals_single_generation():
+    configs = golden_vectors.sweep_configs([golden_vectors.SINUS_MODE, golden_vectors.SQUARE_PULS_MODE, golden_vectors.TRIANGLE_MODE],
+                                           range(0, 256, 5), [0b00010000, 0b01011000], 40)
+    for config, codes in zip(configs, golden_vectors.generate_batch(configs)):
+        assert np.array_equal(codes, golden_vectors.generate_codes(config)), config.name
+
+def test_sweep_grid():
+    configs = golden_vectors.sweep_configs([golden_vectors.SINUS_MODE, golden_vectors.SAWTOOTH_MODE], range(256), [1, 2, 3], 10)
+
+    # the sinus is only swept over the phase, its amplitude is the x input of the cordic
+    assert len(configs) == 256 + 256 * 3
+    assert {config.amplitude_code for config in configs if config.mode == golden_vectors.SINUS_MODE} == {TT_CONFIGS['sinus'].amplitude_code}
+    assert len({config.name for config in configs}) == len(configs)
@@ -0,0 +1,115 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Parity test of the loop kernels against the numpy implementation of the virtual prototypes.
+# Without numba the kernels run as python functions, with numba the compiled kernels are tested.
+# Run with: pytest test/common
+
+# imports
+import importlib
+import numpy as np
+import pytest
+
+import fixed_point
+import kernels
+import vp_cordic_iterative
+import vp_sin_generator
+import vp_triangle
+import vp_square_puls
+
+Q = 7
+LSB = 2**(-Q)
+PHASES = [0.01, 0.1, 0.308807373046875, 0.5, -0.2, LSB]
+NUMBER_OF_SAMPLES = 1000
+
+@pytest.fixture
+def numpy_backend(monkeypatch):
+    """selects the numpy backend for the reference values"""
+    monkeypatch.setattr(kernels, 'backend', 'numpy')
+
+@pytest.mark.parametrize('iterations, sfixed_fract', [(6, 7), (8, 7), (15, 15)])
+def test_cordic_kernel(numpy_backend, iterations, sfixed_fract):
+    config = vp_cordic_iterative.get_cordic_config(sfixed_fract, iterations)
+    z = np.arange(-(1 << (sfixed_fract - 1)), 1 << (sfixed_fract - 1), dtype=np.int64)
+    x = np.full(len(z), config.amplitude_int, dtype=np.int64)
+    y = np.zeros(len(z), dtype=np.int64)
+
+    reference = vp_cordic_iterative.cordic_fixed(x, y, z, config.angles_int, config.shift_vector, iterations, sfixed_fract)
+    result = kernels.cordic_kernel(x, y, z, config.angles_int, config.shift_vector.astype(np.int64), iterations, sfixed_fract)
+
+    for expected, actual in zip(reference, result):
+        assert np.array_equal(expected, actual)
+
+@pytest.mark.parametrize('phase', PHASES)
+@pytest.mark.parametrize('amplitude', [1 - 40 * LSB, 0.2, 1 - LSB, 0.0])
+def test_sawtooth_and_triangle_kernel(numpy_backend, phase, amplitude):
+    phase_int = int(fixed_point.to_fixed(phase, Q))
+    amplitude_scaled = amplitude * 2**Q
+
+    sawtooth = kernels.sawtooth_kernel(phase_int, amplitude_scaled, NUMBER_OF_SAMPLES, Q)
+    triangle = kernels.triangle_kernel(phase_int, amplitude_scaled, NUMBER_OF_SAMPLES, Q)
+
+    assert np.array_equal(vp_triangle.sawtooth(Q, phase, amplitude, NUMBER_OF_SAMPLES), fixed_point.to_float(sawtooth, Q))
+    assert np.array_equal(vp_triangle.triangle(Q, phase, amplitude, NUMBER_OF_SAMPLES), fixed_point.to_float(triangle, Q))
+
+@pytest.mark.parametrize('phase', PHASES)
+@pytest.mark.parametrize('threshold', [0.1, 0.2, -0.5, 0.0])
+def test_square_puls_kernel(numpy_backend, phase, threshold):
+    phase_int = int(fixed_point.to_fixed(phase, Q))
+    out = np.empty(NUMBER_OF_SAMPLES)
+    square_puls = kernels.square_puls_kernel(phase_int, threshold * 2**Q, Q, out)
+
+    assert square_puls is out
+    assert np.array_equal(vp_square_puls.square_puls(Q, phase, threshold, NUMBER_OF_SAMPLES), square_puls)
+
+@pytest.mark.parametrize('backend', kernels.BACKENDS)
+def test_square_puls_out_shape(monkeypatch, backend):
+    if backend == 'numba' and kernels.numba is None:
+        pytest.skip('numba is not installed')
+    monkeypatch.setattr(kernels, 'backend', backend)
+
+    out = np.zeros(4)
+    assert vp_square_puls.square_puls(Q, 0.1, 0.5, 4, out=out) is out
+    with pytest.raises(ValueError, match='shape'):
+        vp_square_puls.square_puls(Q, 0.1, 0.5, 4, out=np.zeros(10))
+    with pytest.raises(ValueError, match='shape'):
+        vp_square_puls.square_puls(Q, 0.1, 0.5, 4, out=np.zeros((1, 4)))
+
+    # a sweep over the thresholds needs one row per threshold
+    out = np.zeros((3, 4))
+    assert vp_square_puls.square_puls(Q, 0.1, np.array([0.1, 0.2, 0.3]), 4, out=out) is out
+    with pytest.raises(ValueError, match='shape'):
+        vp_square_puls.square_puls(Q, 0.1, np.array([0.1, 0.2, 0.3]), 4, out=np.zeros(4))
+
+@pytest.mark.parametrize('backend', kernels.BACKENDS)
+def test_backends_same_output(monkeypatch, backend):
+    if backend == 'numba' and kernels.numba is None:
+        pytest.skip('numba is not installed')
+    monkeypatch.setattr(kernels, 'backend', 'numpy')
+    reference = vp_sin_generator.sin_gen(Q, PHASES[2], 6, NUMBER_OF_SAMPLES)
+
+    monkeypatch.setattr(kernels, 'backend', backend)
+    assert np.array_equal(vp_sin_generator.sin_gen(Q, PHASES[2], 6, NUMBER_OF_SAMPLES), reference)
+
+@pytest.mark.parametrize('name', ['numab', 'numba'])
+def test_backend_environment_variable(monkeypatch, name):
+    if name == 'numba' and kernels.numba is not None:
+        pytest.skip('numba is installed')
+    monkeypatch.setenv('VP_BACKEND', name)
+    try:
+        with pytest.raises(ValueError if name == 'numab' else ImportError):
+            importlib.reload(kernels)
+    finally:
+        monkeypatch.delenv('VP_BACKEND')
+        importlib.reload(kernels)
@@ -0,0 +1,101 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the period detection: the orbits of the generators have to create the same samples as the
+# direct generation for any number of samples.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+import orbit
+import vp_sin_generator
+import vp_triangle
+import vp_square_puls
+
+Q = 7
+LSB = 2**(-Q)
+
+# numbers of samples: empty, shorter than the transient, inside the first cycle and not a multiple of the cycle
+NUMBER_OF_SAMPLES = [0, 1, 2, 5, 100, 1001]
+
+def test_find_orbit():
+    # 0 -> 1 -> 2 -> 3 -> 4 -> 5 -> 2, the cycle 2..5 starts after a transient of two states
+    assert orbit.find_orbit(lambda state: state + 1 if state < 5 else 2, 0) == (6, 2)
+
+    # a fixed point is a cycle of one state without a transient
+    assert orbit.find_orbit(lambda state: state, 7) == (1, 0)
+
+def test_samples_and_sample():
+    trajectory = orbit.Orbit(np.array([1, 2, 3]), np.array([7, 8]))
+    expected = [1, 2, 3, 7, 8, 7, 8, 7]
+
+    for n_samples in range(len(expected) + 1):
+        assert trajectory.samples(n_samples).tolist() == expected[:n_samples]
+    assert [trajectory.sample(index) for index in range(len(expected))] == expected
+
+def test_generate_orbit():
+    # generator with the transient 1, 2 and the cycle 3, 4, 5 (the state is the sample)
+    def next_state(state):
+        return state + 1 if state < 5 else 3
+
+    def generate(n_samples):
+        values = [1]
+        while len(values) < n_samples:
+            values.append(next_state(values[-1]))
+        return np.array(values[:n_samples])
+
+    trajectory = orbit.generate_orbit(generate, next_state, 1)
+    assert trajectory.transient.tolist() == [1, 2]
+    assert trajectory.cycle.tolist() == [3, 4, 5]
+    assert np.array_equal(trajectory.samples(100), generate(100))
+
+@pytest.mark.parametrize('phase', [0, LSB, 0.1, 0.37, -0.2])
+@pytest.mark.parametrize('amplitude', [0.2, 0.9, 1 - LSB])
+def test_sawtooth_and_triangle_orbit(phase, amplitude):
+    sawtooth = vp_triangle.sawtooth_orbit(Q, phase, amplitude)
+    triangle = vp_triangle.triangle_orbit(Q, phase, amplitude)
+
+    for n_samples in NUMBER_OF_SAMPLES:
+        assert np.array_equal(sawtooth.samples(n_samples), vp_triangle.sawtooth(Q, phase, amplitude, n_samples))
+        assert np.array_equal(triangle.samples(n_samples), vp_triangle.triangle(Q, phase, amplitude, n_samples))
+
+def test_orbit_with_transient():
+    # a negative phase with a small amplitude passes three samples before the counter is periodic
+    trajectory = vp_triangle.sawtooth_orbit(Q, -0.2, 0.2)
+    assert len(trajectory.transient) == 3
+    assert len(trajectory.cycle) == 4
+
+    for n_samples in range(20):
+        assert np.array_equal(trajectory.samples(n_samples), vp_triangle.sawtooth(Q, -0.2, 0.2, n_samples))
+
+@pytest.mark.parametrize('phase', [0, LSB, 0.1, 0.37, -0.2])
+def test_square_puls_orbit(phase):
+    trajectory = vp_square_puls.square_puls_orbit(Q, phase, 0.2)
+    for n_samples in NUMBER_OF_SAMPLES:
+        assert np.array_equal(trajectory.samples(n_samples), vp_square_puls.square_puls(Q, phase, 0.2, n_samples))
+
+@pytest.mark.parametrize('phase', [0, LSB, 0.1, 0.37, -0.2])
+def test_sin_gen_orbit(phase):
+    trajectory = vp_sin_generator.sin_gen_orbit(Q, phase, 6)
+    for n_samples in NUMBER_OF_SAMPLES:
+        assert np.array_equal(trajectory.samples(n_samples), vp_sin_generator.sin_gen(Q, phase, 6, n_samples))
+
+def test_phase_code_zero():
+    # without a phase the generators stay in their first state
+    for trajectory in (vp_sin_generator.sin_gen_orbit(Q, 0, 6), vp_triangle.sawtooth_orbit(Q, 0, 0.5),
+                       vp_triangle.triangle_orbit(Q, 0, 0.5), vp_square_puls.square_puls_orbit(Q, 0, 0.2)):
+        assert len(trajectory.transient) == 0
+        assert len(trajectory.cycle) == 1
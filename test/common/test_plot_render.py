@@ -0,0 +1,48 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the min/max envelope of the plot scripts.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+
+import plot_render
+
+def test_short_signal_is_not_decimated():
+    x = np.arange(100)
+    y = np.sin(x)
+    x_env, y_env = plot_render.envelope(x, y, 50)
+    assert x_env is x or np.array_equal(x_env, x)
+    assert np.array_equal(y_env, y)
+
+def test_envelope_keeps_the_peaks():
+    n = 10**6
+    x = np.arange(n)
+    y = np.zeros(n, dtype=np.int8)
+    # single sample peaks must stay visible
+    y[123457] = 100
+    y[777777] = -128
+    x_env, y_env = plot_render.envelope(x, y, 640)
+
+    assert len(x_env) == len(y_env) == 2 * 640
+    assert y_env.dtype == np.int8
+    assert y_env.max() == 100 and y_env.min() == -128
+    assert np.all(np.diff(x_env) >= 0)
+
+def test_envelope_columns():
+    y = np.arange(12) % 4
+    x_env, y_env = plot_render.envelope(np.arange(12), y, 3)
+    assert np.array_equal(x_env, [0, 0, 4, 4, 8, 8])
+    assert np.array_equal(y_env, [0, 3, 0, 3, 0, 3])
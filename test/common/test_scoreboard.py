@@ -0,0 +1,53 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the scoreboard with the values a cocotb handle returns.
+# Run with: pytest test/common
+
+# imports
+import pytest
+from cocotb.binary import BinaryValue, BinaryRepresentation
+
+from harness import Scoreboard
+
+Q = 7
+
+def test_check_all_samples():
+    binstrs = ['01100101', '10000001', '00000000', '11111111']
+    scoreboard = Scoreboard.from_binstrs('data_o', binstrs)
+
+    assert scoreboard.sfixed_fract == Q
+    for binstr in binstrs:
+        assert scoreboard.check(BinaryValue(binstr, n_bits=Q + 1)) == int(binstr, 2)
+    assert scoreboard.done
+
+def test_twos_complement_value():
+    scoreboard = Scoreboard('data_o', [0b10000001], Q)
+    value = BinaryValue('10000001', n_bits=Q + 1, binaryRepresentation=BinaryRepresentation.TWOS_COMPLEMENT)
+
+    assert scoreboard.check(value) == 0b10000001
+
+def test_first_mismatch_report():
+    scoreboard = Scoreboard('data_o', [1, 2, 0b11000000], Q)
+    scoreboard.check(1)
+    scoreboard.check(2)
+
+    with pytest.raises(AssertionError, match=r'data_o mismatch at sample #2: expected 11000000 \(-0.5\), got 01000000 \(0.5\)'):
+        scoreboard.check(BinaryValue('01000000', n_bits=Q + 1))
+
+def test_not_resolvable_value():
+    scoreboard = Scoreboard('data_o', [0], Q)
+
+    with pytest.raises(AssertionError, match='got 0000000x \\(not resolvable\\)'):
+        scoreboard.check(BinaryValue('0000000x', n_bits=Q + 1))
@@ -0,0 +1,64 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the spectral metrics with signals of known spectra and of the batch over all phase codes.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+import spectral_analysis
+import vp_sin_generator
+
+N = 256
+
+def test_known_spectrum():
+    n = np.arange(N)
+    k = 5
+    # fundamental, 3rd harmonic at -40 dBc, a spur at -60 dBc and dc
+    samples = 0.5 + np.sin(2 * np.pi * k * n / N) + 0.01 * np.sin(2 * np.pi * 3 * k * n / N) + 0.001 * np.cos(2 * np.pi * 50 * n / N)
+    metrics = spectral_analysis.spectral_metrics(samples, [k])
+
+    assert metrics.sfdr[0] == pytest.approx(40)
+    assert metrics.thd[0] == pytest.approx(-40)
+    assert metrics.snr[0] == pytest.approx(60)
+    assert metrics.sinad[0] == pytest.approx(-10 * np.log10(1e-4 + 1e-6))
+
+def test_ideal_quantized_sinus():
+    # a full scale sinus quantized to the 8 bit codes of Q7 has about 8 effective bits
+    n = np.arange(N)
+    samples = np.round(127 * np.sin(2 * np.pi * 7 * n / N)) / 128
+    metrics = spectral_analysis.spectral_metrics(samples, [7])
+    assert 7.5 < metrics.enob[0] < 8.5
+
+def test_folded_harmonics():
+    assert np.array_equal(spectral_analysis.fold_bins(np.array([3, 128, 129, 255, 256, 300]), N), [3, 128, 127, 1, 0, 44])
+    assert np.array_equal(spectral_analysis.fundamental_bins([1, 127, 128, 129, 255], 7), [1, 127, 128, 127, 1])
+
+def test_batch_equals_single_analysis():
+    phase_codes, metrics = spectral_analysis.analyze(7, 6, batch_size=100)
+    assert len(phase_codes) == N - 1
+
+    for code in (1, 39, 100, 200):
+        phase = spectral_analysis.fixed_point.to_float(spectral_analysis.fixed_point.wrap(code, 7), 7)
+        samples = vp_sin_generator.sin_gen(7, phase, 6, N)
+        single = spectral_analysis.spectral_metrics(samples, spectral_analysis.fundamental_bins([code], 7))
+        i = code - 1
+        assert single.sfdr[0] == metrics.sfdr[i]
+        assert single.enob[0] == metrics.enob[i]
+
+def test_phase_code_zero():
+    with pytest.raises(ValueError):
+        spectral_analysis.analyze(7, 6, phase_codes=[0, 1])
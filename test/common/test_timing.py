@@ -0,0 +1,66 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the cycle accurate timing model of the wave_generator and its spi output.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+from harness import timing
+from harness.timing import WaveGeneratorTiming
+
+def test_output_latency():
+    assert timing.output_latency(timing.SAWTOOTH_MODE) == 2
+    assert timing.output_latency(timing.SQUARE_PULS_MODE) == 3
+    assert timing.output_latency(timing.TRIANGLE_MODE) == 4
+    assert timing.output_latency(timing.SINUS_MODE) == 10
+    assert timing.output_latency(timing.SINUS_MODE, iterations=15) == 19
+    with pytest.raises(ValueError):
+        timing.output_latency(4)
+
+def test_periodic_strobes():
+    assert np.array_equal(timing.strobe_edges(4), [40, 80, 120, 160])
+    assert np.array_equal(WaveGeneratorTiming(timing.SAWTOOTH_MODE).data_valid_edges(3), [42, 82, 122])
+
+def test_enable_control_shifts_the_strobes():
+    toggles = timing.enable_control_toggles(100, disabled_clks=70)
+    assert toggles == ((101, 0), (171, 1))
+
+    # the counter stops for 70 edges after the 2nd strobe
+    edges = timing.strobe_edges(5, toggles)
+    assert np.array_equal(edges, [40, 80, 190, 230, 270])
+    assert np.array_equal(WaveGeneratorTiming(timing.SINUS_MODE).data_valid_edges(5, toggles), edges + 10)
+
+def test_enable_low_forever():
+    with pytest.raises(ValueError):
+        timing.strobe_edges(3, ((50, 0),))
+
+def test_spi_edges():
+    model = WaveGeneratorTiming(timing.SINUS_MODE)
+    assert model.spi_frame_clks == 34
+    assert np.array_equal(model.cs_fall_edges(2), [51, 91])
+
+    bits = model.spi_bit_edges(2)
+    assert bits.shape == (2, 8)
+    assert np.array_equal(bits[0], np.arange(54, 83, 4))
+    assert np.array_equal(model.cs_rise_edges(2), [85, 125])
+
+    # with cpha the bits are sampled half a spi clock later
+    assert model.spi_bit_edges(1)[0, 0] + 2 == WaveGeneratorTiming(timing.SINUS_MODE, spi_mode=1).spi_bit_edges(1)[0, 0]
+
+def test_spi_frame_does_not_fit():
+    with pytest.raises(ValueError):
+        WaveGeneratorTiming(timing.SINUS_MODE, clks_per_half_bit=3)
@@ -0,0 +1,99 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the offline check of the vcd dump. The dumps are written from the traces of the virtual prototype
+# of the spi master in the format of icarus.
+# Run with: pytest test/common
+
+# imports
+import io
+import numpy as np
+
+import vp_spi_master
+import vcd_checker
+
+PERIOD_PS = 16000
+IDS = {'clk': '!', 'rst_n': '"', 'data_o': '#', 'spi_clk': '$', 'spi_mosi': '%', 'spi_cs': '&'}
+
+def run_traces(codes, distance=40):
+    """cycle indexed traces of one run: reset, then one sample every distance cycles"""
+    reset_clks = 3
+    load_cycles = reset_clks + distance * np.arange(1, len(codes) + 1)
+    n_cycles = int(load_cycles[-1]) + distance
+    spi_clk, spi_mosi, spi_cs = vp_spi_master.spi_master_only_tx_single_cs(codes, load_cycles, n_cycles)
+
+    # the output register is written one edge before the master loads the sample
+    data_o = np.zeros(n_cycles, dtype=np.int64)
+    index = np.searchsorted(load_cycles - 1, np.arange(n_cycles), side='right') - 1
+    data_o[index >= 0] = np.asarray(codes)[index[index >= 0]]
+    rst_n = (np.arange(n_cycles) >= reset_clks).astype(np.uint8)
+    return {'rst_n': rst_n, 'data_o': data_o, 'spi_clk': spi_clk, 'spi_mosi': spi_mosi, 'spi_cs': spi_cs}
+
+def write_vcd(runs):
+    """writes the traces of all runs one after another as vcd dump of the tb"""
+    out = io.StringIO()
+    out.write('$timescale\n\t1ps\n$end\n$scope module tb $end\n')
+    for name, identifier in IDS.items():
+        width = 8 if name == 'data_o' else 1
+        bit_range = '[7:0] ' if width == 8 else ''
+        out.write(f'$var wire {width} {identifier} {name} {bit_range}$end\n')
+    out.write('$upscope $end\n$enddefinitions $end\n#0\n$dumpvars\nx"\nbx #\nx$\nx%\nx&\n0!\n$end\n')
+
+    # every cycle is a rising and a falling clock edge, the registers change at the rising edge
+    previous = {}
+    cycle = 1
+    for traces in runs:
+        for t in range(len(traces['rst_n'])):
+            out.write(f'#{cycle * PERIOD_PS}\n1!\n')
+            for name, trace in traces.items():
+                value = int(trace[t])
+                if previous.get(name) != value:
+                    out.write(f'b{value:b} {IDS[name]}\n' if name == 'data_o' else f'{value}{IDS[name]}\n')
+                    previous[name] = value
+            out.write(f'#{cycle * PERIOD_PS + PERIOD_PS // 2}\n0!\n')
+            cycle += 1
+    out.seek(0)
+    return out
+
+def test_check_runs():
+    first = [0x7f, 0x00, 0x81, 0x55, 0xaa]
+    second = [0x01, 0x80, 0xff]
+    dump = write_vcd([run_traces(first), run_traces(second)])
+
+    reports = vcd_checker.check_vcd(dump, [('first', first), ('second', second)])
+    assert [report.passed for report in reports] == [True, True]
+    assert (reports[0].n_data, reports[0].n_frames) == (5, 5)
+    assert (reports[1].n_data, reports[1].n_frames) == (3, 3)
+
+def test_mismatch():
+    codes = [0x10, 0x20, 0x30]
+    traces = run_traces(codes)
+
+    # flip the mosi line in the 2nd frame
+    frame = np.flatnonzero(traces['spi_cs'] == 0)
+    traces['spi_mosi'][frame[len(frame) // 2 + 10]] ^= 1
+    reports = vcd_checker.check_vcd(write_vcd([traces]), [('run', codes)])
+    assert not reports[0].passed
+    assert reports[0].n_mismatches == 1
+    assert 'spi frame #1' in reports[0].mismatches[0]
+
+def test_missing_samples():
+    codes = [0x10, 0x20, 0x30]
+    reports = vcd_checker.check_vcd(write_vcd([run_traces(codes[:2])]), [('run', codes)])
+    assert not reports[0].passed
+    assert reports[0].n_mismatches == 0
+
+def test_timescale():
+    assert vcd_checker.parse_timescale('1ps') == 1e-3
+    assert vcd_checker.parse_timescale('10 ns') == 10.0
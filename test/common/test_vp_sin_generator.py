@@ -0,0 +1,65 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the chunked sinus generation: the chunks of sin_gen_stream and sin_gen_chunk joined together have to be
+# the samples of one sin_gen call.
+# Run with: pytest test/common
+
+# imports
+import itertools
+import numpy as np
+import pytest
+
+import vp_sin_generator
+
+Q = 7
+ITERATIONS = 6
+PHASE = 0.308807373046875
+NUMBER_OF_SAMPLES = 1000
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 333, 1000, 1024])
+def test_stream_equals_sin_gen(chunk_size):
+    reference = vp_sin_generator.sin_gen(Q, PHASE, ITERATIONS, NUMBER_OF_SAMPLES)
+    n_chunks = -(-NUMBER_OF_SAMPLES // chunk_size)
+    chunks = list(itertools.islice(vp_sin_generator.sin_gen_stream(Q, PHASE, ITERATIONS, chunk_size), n_chunks))
+
+    assert all(len(chunk) == chunk_size for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks)[:NUMBER_OF_SAMPLES], reference)
+
+def test_stream_needs_samples():
+    with pytest.raises(ValueError):
+        next(vp_sin_generator.sin_gen_stream(Q, PHASE, ITERATIONS, 0))
+
+@pytest.mark.parametrize('chunk_sizes', [[0, 10, 0, 5], [3, 0, 997], [250, 250, 250, 250], [999, 1]])
+def test_chunks_equal_sin_gen(chunk_sizes):
+    reference = vp_sin_generator.sin_gen(Q, PHASE, ITERATIONS, sum(chunk_sizes))
+    zi = 0
+    chunks = []
+    for chunk_size in chunk_sizes:
+        calc_values, zi = vp_sin_generator.sin_gen_chunk(Q, PHASE, ITERATIONS, chunk_size, zi)
+        assert len(calc_values) == chunk_size
+        chunks.append(calc_values)
+
+    assert np.array_equal(np.concatenate(chunks), reference)
+
+def test_empty_chunk():
+    assert len(vp_sin_generator.sin_gen(Q, PHASE, ITERATIONS, 0)) == 0
+
+    # the phase accumulator stays at the start value, a sweep keeps its shape
+    calc_values, zi = vp_sin_generator.sin_gen_chunk(Q, PHASE, ITERATIONS, 0, 0.25)
+    assert calc_values.shape == (0,)
+    assert zi == 0.25
+    calc_values, zi = vp_sin_generator.sin_gen_chunk(Q, np.array([0.1, 0.2, 0.3]), ITERATIONS, 0, 0.25)
+    assert calc_values.shape == (3, 0)
+    assert np.array_equal(zi, [0.25, 0.25, 0.25])
@@ -0,0 +1,119 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Test of the vectorized virtual prototype of the spi masters against a register transfer model that
+# evaluates the verilog code of spi_master_only_tx_single_cs cycle by cycle.
+# Run with: pytest test/common
+
+# imports
+import numpy as np
+import pytest
+
+import vp_spi_master
+
+def register_model(data, load_cycles, n_cycles, spi_mode, clks_per_half_bit, cs_inactive_clks=1):
+    """Evaluates the registers of spi_master_only_tx_single_cs cycle by cycle, edge 0 is an idle edge"""
+    cpol, cpha = vp_spi_master.spi_mode_bits(spi_mode)
+    c = clks_per_half_bit
+    loads = dict(zip(load_cycles, data))
+
+    # idle state of the registers
+    r = dict(tx_ready=1, edges=0, leading=0, trailing=0, spi_clk=cpol, counter=0, mosi=0, bit=7, clk_out=cpol,
+             strobe=0, state=0, cs=1, cs_counter=cs_inactive_clks)
+    data_i = 0
+    trace = {name: np.zeros(n_cycles, dtype=np.uint8) for name in ('spi_clk', 'spi_mosi', 'tx_ready', 'spi_cs')}
+    for t in range(n_cycles):
+        if t > 0:
+            strobe_i = int(t in loads)
+            data_i = loads.get(t, data_i)
+            n = dict(r, leading=0, trailing=0, clk_out=r['spi_clk'], strobe=strobe_i)
+
+            # spi clock
+            if strobe_i:
+                n.update(tx_ready=0, edges=16)
+            elif r['edges'] > 0:
+                n['tx_ready'] = 0
+                if r['counter'] == 2 * c - 1:
+                    n.update(edges=r['edges'] - 1, trailing=1, counter=0, spi_clk=1 - r['spi_clk'])
+                elif r['counter'] == c - 1:
+                    n.update(edges=r['edges'] - 1, leading=1, counter=r['counter'] + 1, spi_clk=1 - r['spi_clk'])
+                else:
+                    n['counter'] = r['counter'] + 1
+            else:
+                n['tx_ready'] = 1
+
+            # transmitting
+            if r['tx_ready']:
+                n.update(bit=7, mosi=0)
+            elif r['strobe'] and not cpha:
+                n.update(mosi=(data_i >> 7) & 1, bit=6)
+            elif (r['leading'] and cpha) or (r['trailing'] and not cpha):
+                n.update(bit=max(r['bit'] - 1, 0), mosi=(data_i >> r['bit']) & 1)
+
+            # cs state machine
+            if r['state'] == 0 and strobe_i and r['cs']:
+                n.update(state=1, cs=0)
+            elif r['state'] == 1 and r['tx_ready']:
+                n.update(state=2, cs=1, cs_counter=cs_inactive_clks)
+            elif r['state'] == 2:
+                if r['cs_counter'] > 0:
+                    n['cs_counter'] = r['cs_counter'] - 1
+                else:
+                    n['state'] = 0
+            r = n
+
+        trace['spi_clk'][t] = r['clk_out']
+        trace['spi_mosi'][t] = r['mosi']
+        trace['tx_ready'][t] = r['tx_ready']
+        trace['spi_cs'][t] = r['cs']
+    return trace
+
+@pytest.mark.parametrize('spi_mode', [0, 1, 2, 3])
+@pytest.mark.parametrize('clks_per_half_bit', [2, 3, 5])
+def test_vp_equals_register_model(spi_mode, clks_per_half_bit):
+    rng = np.random.default_rng(spi_mode * 10 + clks_per_half_bit)
+    data = [0x00, 0xff, 0x80, 0x01] + list(rng.integers(0, 256, 8))
+    distance = vp_spi_master.min_load_distance(clks_per_half_bit, single_cs=True)
+    load_cycles = 3 + np.cumsum(np.concatenate([[0], distance + rng.integers(0, 6, len(data) - 1)]))
+    n_cycles = int(load_cycles[-1]) + distance + 10
+
+    expected = register_model(data, load_cycles, n_cycles, spi_mode, clks_per_half_bit)
+    spi_clk, spi_mosi, tx_ready = vp_spi_master.spi_master_only_tx(data, load_cycles, n_cycles, spi_mode, clks_per_half_bit)
+    _, _, spi_cs = vp_spi_master.spi_master_only_tx_single_cs(data, load_cycles, n_cycles, spi_mode, clks_per_half_bit)
+
+    assert np.array_equal(spi_clk, expected['spi_clk'])
+    assert np.array_equal(spi_mosi, expected['spi_mosi'])
+    assert np.array_equal(tx_ready, expected['tx_ready'])
+    assert np.array_equal(spi_cs, expected['spi_cs'])
+
+def test_back_to_back_loads():
+    # the master accepts the next byte one cycle after tx_ready, the cs state machine later
+    distance = vp_spi_master.min_load_distance(2)
+    data = [0xa5, 0x3c, 0xff]
+    load_cycles = [1, 1 + distance, 1 + 2 * distance]
+    spi_clk, spi_mosi, tx_ready = vp_spi_master.spi_master_only_tx(data, load_cycles, 1 + 3 * distance)
+    expected = register_model(data, load_cycles, 1 + 3 * distance, 0, 2)
+    assert np.array_equal(spi_mosi, expected['spi_mosi'])
+    assert np.array_equal(tx_ready, expected['tx_ready'])
+
+    with pytest.raises(ValueError):
+        vp_spi_master.spi_master_only_tx_single_cs(data, load_cycles, 1 + 3 * distance)
+    with pytest.raises(ValueError):
+        vp_spi_master.spi_master_only_tx(data, [1, distance, 2 * distance], 100)
+    with pytest.raises(ValueError):
+        vp_spi_master.spi_mode_bits(4)
+
+def test_idle_outputs():
+    spi_clk, spi_mosi, spi_cs = vp_spi_master.spi_master_only_tx_single_cs([], [], 20, spi_mode=2)
+    assert np.all(spi_clk == 1) and np.all(spi_mosi == 0) and np.all(spi_cs == 1)
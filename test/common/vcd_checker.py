@@ -0,0 +1,281 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module checks the outputs of the wave generator offline in the vcd dump of a simulation. The dump is read
+# line by line, only the value changes of the observed signals are kept. After every time step the decoder looks
+# for the events of the monitors: the parallel output is sampled at the falling cs and the mosi line is shifted
+# in at the sample edge of the spi mode (see harness/spi_monitor.py). Every reset starts a new run, the runs are
+# compared in order against the golden vectors of the tests.
+# Run with: python common/vcd_checker.py tb.vcd [--configs sinus sawtooth triangle square_pulse]
+
+# imports
+import argparse
+import sys
+from dataclasses import dataclass, field
+
+# units of the vcd timescale in ns
+TIME_UNITS = {'s': 1e9, 'ms': 1e6, 'us': 1e3, 'ns': 1.0, 'ps': 1e-3, 'fs': 1e-6}
+
+# maximum number of reported mismatches per run
+MAX_REPORTED = 10
+
+@dataclass(frozen=True)
+class VcdFrame:
+    """Frame of the spi output that was decoded from the dump
+
+    Attributes:
+        value (int): received bits (MSB first)
+        n_bits (int): number of received bits
+        start_time (float): time in ns of the falling cs
+        end_time (float): time in ns of the rising cs
+    """
+    value: int
+    n_bits: int
+    start_time: float
+    end_time: float
+
+@dataclass
+class RunReport:
+    """Result of the check of one run (the outputs between two resets)
+
+    Attributes:
+        name (str): name of the expected vector
+        n_expected (int): number of expected samples
+        n_data (int): number of checked samples of the parallel output
+        n_frames (int): number of checked frames of the spi output
+        mismatches (list[str]): description of the first mismatches
+        n_mismatches (int): number of all mismatches
+    """
+    name: str
+    n_expected: int
+    n_data: int = 0
+    n_frames: int = 0
+    mismatches: list = field(default_factory=list)
+    n_mismatches: int = 0
+
+    @property
+    def passed(self):
+        """bool: true if all expected samples were received on both outputs without a mismatch"""
+        return self.n_mismatches == 0 and self.n_data >= self.n_expected and self.n_frames >= self.n_expected
+
+    def mismatch(self, text):
+        self.n_mismatches += 1
+        if len(self.mismatches) < MAX_REPORTED:
+            self.mismatches.append(text)
+
+def parse_timescale(text):
+    """Converts the text of a $timescale section into ns
+
+    Args:
+        text (str): text of the section, e.g. '1ps' or '10 ns'
+
+    Returns:
+        float: one time step of the dump in ns
+    """
+    text = text.replace(' ', '')
+    number = text.rstrip('munpfs')
+    return int(number) * TIME_UNITS[text[len(number):]]
+
+def read_changes(lines, signals):
+    """Reads a vcd dump as a stream and returns the value changes of the observed signals per time step
+
+    Args:
+        lines (iterable): lines of the dump (e.g. an open file)
+        signals (list[str]): hierarchical names of the observed signals (e.g. tb.spi_cs)
+
+    Raises:
+        ValueError: an observed signal is not in the dump
+
+    Yields:
+        (float, dict): time in ns, name and new value (binary string) of every changed signal
+    """
+    ids = {}
+    scopes = []
+    timescale = 1.0
+    lines = iter(lines)
+
+    # header with the definitions of the variables
+    for line in lines:
+        tokens = line.split()
+        if not tokens:
+            continue
+        if tokens[0] == '$scope':
+            scopes.append(tokens[2])
+        elif tokens[0] == '$upscope':
+            scopes.pop()
+        elif tokens[0] == '$var':
+            name = '.'.join(scopes + [tokens[4]])
+            if name in signals:
+                ids.setdefault(tokens[3], []).append(name)
+        elif tokens[0] == '$timescale':
+            text = ' '.join(tokens[1:])
+            while '$end' not in text:
+                text += ' ' + next(lines).strip()
+            timescale = parse_timescale(text.replace('$end', '').strip())
+        elif tokens[0] == '$enddefinitions':
+            break
+
+    missing = set(signals) - {name for names in ids.values() for name in names}
+    if missing:
+        raise ValueError(f'signals not found in the dump: {", ".join(sorted(missing))}')
+
+    # value changes, the changes of a time step are collected until the next time stamp
+    time = 0.0
+    changes = {}
+    for line in lines:
+        tokens = iter(line.split())
+        for token in tokens:
+            first = token[0]
+            if first == '#':
+                if changes:
+                    yield time, changes
+                    changes = {}
+                time = int(token[1:]) * timescale
+            elif first in '01xzXZ':
+                for name in ids.get(token[1:], ()):
+                    changes[name] = first.lower()
+            elif first in 'bB':
+                identifier = next(tokens)
+                for name in ids.get(identifier, ()):
+                    changes[name] = token[1:].lower()
+            elif first in 'rR':
+                next(tokens)
+    if changes:
+        yield time, changes
+
+def to_int(value):
+    """Converts a binary string of the dump into an integer
+
+    Args:
+        value (str): binary string
+
+    Returns:
+        int: value or None if the string holds x or z bits
+    """
+    if value is None or 'x' in value or 'z' in value:
+        return None
+    return int(value, 2)
+
+def decode_events(changes, scope='tb', spi_mode=0):
+    """Decodes the resets, the samples of the parallel output and the spi frames of the tb
+
+    Args:
+        changes (iterable): value changes per time step (see read_changes)
+        scope (str, optional): hierarchical name of the tb. Defaults to 'tb'.
+        spi_mode (int, optional): spi mode of the master (0 to 3). Defaults to 0.
+
+    Yields:
+        tuple: ('reset', time), ('data', time, value) or ('spi', time, VcdFrame), value is None if not resolvable
+    """
+    names = {name: f'{scope}.{name}' for name in ('rst_n', 'data_o', 'spi_clk', 'spi_mosi', 'spi_cs')}
+    sample_level = '1' if spi_mode in (0, 3) else '0'
+    state = dict.fromkeys(names.values())
+    value, n_bits, start_time = 0, 0, 0.0
+
+    for time, changed in changes:
+        previous = {name: state[name] for name in changed}
+        state.update(changed)
+
+        def edge(name, level):
+            name = names[name]
+            return name in changed and previous[name] != level and state[name] == level
+
+        if edge('rst_n', '1'):
+            yield ('reset', time)
+
+        # the cs frames the spi transmission, the parallel output is sampled at the falling cs
+        if edge('spi_cs', '0'):
+            value, n_bits, start_time = 0, 0, time
+            yield ('data', time, to_int(state[names['data_o']]))
+        elif edge('spi_clk', sample_level) and state[names['spi_cs']] == '0':
+            bit = to_int(state[names['spi_mosi']])
+            value = (value << 1) | (bit if bit is not None else 0)
+            n_bits += 1 if bit is not None else 0
+        if edge('spi_cs', '1'):
+            yield ('spi', time, VcdFrame(value, n_bits, start_time, time))
+
+def check_vcd(lines, expected, scope='tb', spi_mode=0, n_bits=8):
+    """Checks the outputs of all runs in a vcd dump against their expected samples in one pass
+
+    Args:
+        lines (iterable): lines of the dump (e.g. an open file)
+        expected (list): (name, unsigned codes) of every run in the order of the resets
+        scope (str, optional): hierarchical name of the tb. Defaults to 'tb'.
+        spi_mode (int, optional): spi mode of the master (0 to 3). Defaults to 0.
+        n_bits (int, optional): number of bits of the outputs. Defaults to 8.
+
+    Returns:
+        list[RunReport]: report of every expected run
+    """
+    signals = [f'{scope}.{name}' for name in ('rst_n', 'data_o', 'spi_clk', 'spi_mosi', 'spi_cs')]
+    reports = [RunReport(name, len(codes)) for name, codes in expected]
+    run = -1
+
+    for event in decode_events(read_changes(lines, signals), scope, spi_mode):
+        if event[0] == 'reset':
+            run += 1
+            continue
+        # outputs before the first reset or of runs without an expected vector are not checked
+        if run < 0 or run >= len(reports):
+            continue
+
+        report = reports[run]
+        codes = expected[run][1]
+        if event[0] == 'data':
+            _, time, value = event
+            i = report.n_data
+            if i < len(codes):
+                if value != int(codes[i]):
+                    report.mismatch(f'data_o sample #{i} at {time} ns is {value}, expected {int(codes[i])}')
+                report.n_data += 1
+        else:
+            _, time, frame = event
+            i = report.n_frames
+            if i < len(codes):
+                if frame.n_bits != n_bits:
+                    report.mismatch(f'spi frame #{i} at {frame.start_time} ns has {frame.n_bits} bits, expected {n_bits}')
+                elif frame.value != int(codes[i]):
+                    report.mismatch(f'spi frame #{i} at {frame.start_time} ns is {frame.value}, expected {int(codes[i])}')
+                report.n_frames += 1
+    return reports
+
+def main():
+    import golden_vectors
+
+    parser = argparse.ArgumentParser(description='checks the outputs of the tiny tapeout test in a vcd dump against the golden vectors')
+    parser.add_argument('vcd', help='vcd dump of the simulation (e.g. tb.vcd)')
+    parser.add_argument('--configs', nargs='+', default=list(golden_vectors.TT_CONFIGS),
+                        help='golden vectors of the runs in the order of the tests (default: all tests of test.py)')
+    parser.add_argument('--scope', default='tb', help='hierarchical name of the tb')
+    parser.add_argument('--spi-mode', type=int, default=0, help='spi mode of the master')
+    args = parser.parse_args()
+
+    expected = []
+    for name in args.configs:
+        config = golden_vectors.TT_CONFIGS[name]
+        expected.append((name, golden_vectors.load(config).expected_codes()))
+
+    with open(args.vcd) as file:
+        reports = check_vcd(file, expected, args.scope, args.spi_mode)
+
+    for report in reports:
+        status = 'PASS' if report.passed else 'FAIL'
+        print(f'{status} {report.name}: {report.n_data}/{report.n_expected} samples, {report.n_frames}/{report.n_expected} spi frames, '
+              f'{report.n_mismatches} mismatches')
+        for text in report.mismatches:
+            print(f'    {text}')
+    return 0 if all(report.passed for report in reports) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
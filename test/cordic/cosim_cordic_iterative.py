@@ -13,15 +13,20 @@
 # limitations under the License.
 
 # imports
+import os
 import cocotb
 import numpy as np
 import vp_cordic_iterative
-from test_helper import reset_dut, frac2bin
-from cocotb.triggers import FallingEdge, RisingEdge
+import fixed_point
+from harness import reset_dut, frac2bin, Scoreboard
+from cocotb.triggers import FallingEdge, RisingEdge, ReadOnly
 from cocotb.clock import Clock
 
 DEBUG = False
 
+# with EXHAUSTIVE_X=1 the exhaustive test rotates every x code with every z code, otherwise only the amplitude of the sinus
+EXHAUSTIVE_X = os.environ.get('EXHAUSTIVE_X', '0') == '1'
+
 @cocotb.test()
 async def cosim_cordic_iterative(dut):
     """ cosim to test the bitwise truth of the verilog implementation of the cordic_iterative against the python virtual prototype of the cordic_iterative implementation
@@ -35,11 +40,12 @@ async def cosim_cordic_iterative(dut):
     PHASE = 0.308807373046875
     NUMBER_OF_TESTS = 30
     
-    # generate the needed values for the cordic iterations
-    lsb = 2**(-Q7)
-    shift_vector = vp_cordic_iterative.gen_shift_vector(CORDIC_ITERATIONS)
-    k = vp_cordic_iterative.gen_k(shift_vector, lsb) # length compensation for the iterations
-    angles_vector = vp_cordic_iterative.gen_angles_vector(shift_vector, lsb)
+    # get the needed tables for the cordic iterations
+    config = vp_cordic_iterative.get_cordic_config(Q7, CORDIC_ITERATIONS)
+    lsb = config.lsb
+    shift_vector = config.shift_vector
+    k = config.k # length compensation for the iterations
+    angles_vector = config.angles_vector
 
     # setup the inputs of the cordic iterative algorithm
     # to get a sin output we set yi = 0 and xi to 1 multiplied with the length compensation that is needed because of the algorithm
@@ -47,30 +53,21 @@ async def cosim_cordic_iterative(dut):
     xi = vp_cordic_iterative.quantize_value(xi * k, lsb)
     xi = vp_cordic_iterative.quantize_value(xi - lsb, lsb)
     yi = vp_cordic_iterative.quantize_value(0, lsb)
-    zi = vp_cordic_iterative.quantize_value(PHASE, lsb)
 
-    # storage for the comparision between vp and verilog module
-    x_input = np.zeros(NUMBER_OF_TESTS)
-    y_input = np.zeros(NUMBER_OF_TESTS)
-    z_input = np.zeros(NUMBER_OF_TESTS)
-    x_calc_vp = np.zeros(NUMBER_OF_TESTS)
-    y_calc_vp = np.zeros(NUMBER_OF_TESTS)
-    z_calc_vp = np.zeros(NUMBER_OF_TESTS)
-
-    # run the virtual prototype
-    for i in range(NUMBER_OF_TESTS):
-        xo, yo, zo = vp_cordic_iterative.cordic(xi,yi,zi, angles_vector, shift_vector, CORDIC_ITERATIONS, Q7)
+    # the zi of every test round is the accumulated phase 
+    phase_int = fixed_point.to_fixed(PHASE, Q7)
+    z_int = fixed_point.wrap(np.arange(1, NUMBER_OF_TESTS + 1) * phase_int, Q7)
 
-        # store for comparison
-        x_input[i] = xi
-        y_input[i] = yi
-        z_input[i] = zi
-        x_calc_vp[i] = xo[CORDIC_ITERATIONS]
-        y_calc_vp[i] = yo[CORDIC_ITERATIONS]
-        z_calc_vp[i] = zo[CORDIC_ITERATIONS]
+    # storage for the comparision between vp and verilog module
+    x_input = np.full(NUMBER_OF_TESTS, xi)
+    y_input = np.full(NUMBER_OF_TESTS, yi)
+    z_input = fixed_point.to_float(z_int, Q7)
 
-        # generate next zi for another test round
-        zi = vp_cordic_iterative.quantize_value(zi + PHASE, lsb)
+    # run the virtual prototype for all test rounds at once
+    xo, yo, zo = vp_cordic_iterative.cordic(x_input, y_input, z_input, angles_vector, shift_vector, CORDIC_ITERATIONS, Q7)
+    x_calc_vp = xo[CORDIC_ITERATIONS]
+    y_calc_vp = yo[CORDIC_ITERATIONS]
+    z_calc_vp = zo[CORDIC_ITERATIONS]
 
     # setting up the cordic_iterative module 
     dut.x_i.value = frac2bin(x_input[0], Q7)
@@ -113,4 +110,73 @@ async def cosim_cordic_iterative(dut):
             dut.z_i.value = frac2bin(z_input[i + 1], Q7)
     
     dut._log.info('Test finished')
-    
+
+@cocotb.test()
+async def cosim_cordic_iterative_exhaustive(dut):
+    """ cosim to test the bitwise truth of the cordic_iterative for every z code (and every x code with EXHAUSTIVE_X=1)
+        against the python virtual prototype. The expected values are calculated in one batch, the rotations are
+        started back-to-back and the outputs are checked by integer scoreboards
+
+    Args:
+        dut : cordic_iterative dut
+    """
+    # general values for the cosim
+    CORDIC_ITERATIONS = 6
+    Q7 = 7
+    mask = (2 << Q7) - 1
+
+    # all z codes with the amplitude of the sinus or with all x codes
+    config = vp_cordic_iterative.get_cordic_config(Q7, CORDIC_ITERATIONS)
+    codes = np.arange(-(1 << Q7), 1 << Q7)
+    if EXHAUSTIVE_X:
+        x_codes, z_codes = (grid.ravel() for grid in np.meshgrid(codes, codes, indexing='ij'))
+    else:
+        x_codes = np.full(len(codes), config.amplitude_int - 1)
+        z_codes = codes
+    y_codes = np.zeros(len(z_codes), dtype=np.int64)
+    n_rotations = len(z_codes)
+
+    # run the virtual prototype for all rotations at once
+    xo, yo, zo = vp_cordic_iterative.cordic_fixed(x_codes, y_codes, z_codes, config.angles_int, config.shift_vector, CORDIC_ITERATIONS, Q7)
+    scoreboards = [Scoreboard(name, values[CORDIC_ITERATIONS] & mask, Q7) for name, values in (('x_o', xo), ('y_o', yo), ('z_o', zo))]
+    outputs = [dut.x_o, dut.y_o, dut.z_o]
+
+    # unsigned input codes as python ints, they are written faster than numpy scalars
+    x_inputs = (x_codes & mask).tolist()
+    y_inputs = (y_codes & mask).tolist()
+    z_inputs = (z_codes & mask).tolist()
+
+    # setting up the cordic_iterative module with the first rotation
+    dut.x_i.value = x_inputs[0]
+    dut.y_i.value = y_inputs[0]
+    dut.z_i.value = z_inputs[0]
+    dut.data_in_valid_strobe_i.value = 0
+
+    # start the clock
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+
+    # reset the dut
+    await reset_dut(dut.rst_i, 20)
+
+    # the strobe stays high, the state machine starts the next rotation as soon as it is back in the idle state.
+    # The inputs of a rotation are read one edge after the start, the inputs of the next rotation are therefore
+    # written when the result of the current rotation is valid
+    dut.data_in_valid_strobe_i.value = 1
+    for i in range(n_rotations):
+        await RisingEdge(dut.data_out_valid_strobe_o)
+        if i + 1 < n_rotations:
+            dut.x_i.value = x_inputs[i + 1]
+            dut.y_i.value = y_inputs[i + 1]
+            dut.z_i.value = z_inputs[i + 1]
+        else:
+            dut.data_in_valid_strobe_i.value = 0
+
+        # check the results against the vp results
+        await ReadOnly()
+        for scoreboard, output in zip(scoreboards, outputs):
+            scoreboard.check(output.value)
+
+        if DEBUG:
+            dut._log.info(f'Rotation {i + 1}/{n_rotations}: x = {x_codes[i]}, z = {z_codes[i]} passed')
+
+    dut._log.info(f'Exhaustive test of {n_rotations} rotations finished')
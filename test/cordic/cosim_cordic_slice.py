@@ -13,14 +13,19 @@
 # limitations under the License.
 
 # imports
+import os
 import cocotb
+import numpy as np
 import vp_cordic_iterative
-from test_helper import reset_dut, frac2bin, unsigned2bin
-from cocotb.triggers import RisingEdge, ClockCycles
+from harness import reset_dut, frac2bin, unsigned2bin, Scoreboard
+from cocotb.triggers import RisingEdge, ClockCycles, ReadOnly
 from cocotb.clock import Clock
 
 DEBUG = False
 
+# with EXHAUSTIVE_ITERATIONS=1 the exhaustive test checks every iteration of every z code, otherwise one iteration per z code
+EXHAUSTIVE_ITERATIONS = os.environ.get('EXHAUSTIVE_ITERATIONS', '0') == '1'
+
 @cocotb.test()
 async def cosim_cordic_slice(dut):
     """ cosim to test the bitwise truth of the verilog implementation of the cordic_slice against the python virtual prototype of the cordic_iterative implementation
@@ -34,11 +39,12 @@ async def cosim_cordic_slice(dut):
     BW_SHIFT_VALUE = 4
     PHASE = 0.308807373046875
 
-    # generate the needed values for the cordic algorithm
-    lsb = 2**(-Q)
-    shift_vector = vp_cordic_iterative.gen_shift_vector(CORDIC_ITERATIONS)
-    k = vp_cordic_iterative.gen_k(shift_vector, lsb)
-    angles_vector = vp_cordic_iterative.gen_angles_vector(shift_vector, lsb)
+    # get the needed tables for the cordic algorithm
+    config = vp_cordic_iterative.get_cordic_config(Q, CORDIC_ITERATIONS)
+    lsb = config.lsb
+    shift_vector = config.shift_vector
+    k = config.k
+    angles_vector = config.angles_vector
 
     # generate the input values
     xi = vp_cordic_iterative.quantize_value(1.0 - lsb, lsb)
@@ -87,5 +93,59 @@ async def cosim_cordic_slice(dut):
         await ClockCycles(dut.clk_i, 2)
     
     dut._log.info('Test finished')
-    
 
+@cocotb.test()
+async def cosim_cordic_slice_exhaustive(dut):
+    """ cosim to test the bitwise truth of the cordic_slice at Q15 for all 65536 z codes against the python virtual
+        prototype. The trajectories of all z codes are calculated in one batch, the slice gets a new iteration in
+        every clock cycle (z code k in the iteration k mod 15, with EXHAUSTIVE_ITERATIONS=1 all iterations of all
+        z codes) and the outputs are checked by integer scoreboards
+
+    Args:
+        dut : cordic_slice dut
+    """
+    # general values for the cosim
+    CORDIC_ITERATIONS = 15
+    Q = 15
+    mask = (2 << Q) - 1
+
+    # trajectories of the sinus amplitude for all z codes
+    config = vp_cordic_iterative.get_cordic_config(Q, CORDIC_ITERATIONS)
+    z_codes = np.arange(-(1 << Q), 1 << Q)
+    xo, yo, zo = vp_cordic_iterative.cordic_fixed(config.amplitude_int - 1, 0, z_codes, config.angles_int, config.shift_vector, CORDIC_ITERATIONS, Q)
+
+    # iteration and z code of every clock cycle
+    if EXHAUSTIVE_ITERATIONS:
+        iterations, codes = (grid.ravel() for grid in np.meshgrid(np.arange(CORDIC_ITERATIONS), np.arange(len(z_codes)), indexing='ij'))
+    else:
+        codes = np.arange(len(z_codes))
+        iterations = codes % CORDIC_ITERATIONS
+    n_cycles = len(codes)
+
+    # inputs and expected outputs of every cycle, the input codes are written as unsigned python ints
+    inputs = [(xo[iterations, codes] & mask).tolist(), (yo[iterations, codes] & mask).tolist(), (zo[iterations, codes] & mask).tolist(),
+              (config.angles_int[iterations] & mask).tolist(), config.shift_vector[iterations].tolist()]
+    scoreboards = [Scoreboard(name, values[iterations + 1, codes] & mask, Q) for name, values in (('x_o', xo), ('y_o', yo), ('z_o', zo))]
+    ports = [dut.x_i, dut.y_i, dut.z_i, dut.current_rotation_angle_i, dut.shift_value_i]
+    outputs = [dut.x_o, dut.y_o, dut.z_o]
+
+    # start the clock
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+
+    # reset the dut
+    await reset_dut(dut.rst_i, 20)
+
+    # the inputs written after an edge are registered at the next edge, therefore the outputs after an edge
+    # are the results of the inputs of the previous cycle
+    for i in range(n_cycles + 1):
+        await RisingEdge(dut.clk_i)
+        if i < n_cycles:
+            for port, values in zip(ports, inputs):
+                port.value = values[i]
+
+        if i > 0:
+            await ReadOnly()
+            for scoreboard, output in zip(scoreboards, outputs):
+                scoreboard.check(output.value)
+
+    dut._log.info(f'Exhaustive test of {n_cycles} iterations finished')
@@ -17,7 +17,7 @@ import cocotb
 import numpy as np
 import vp_cordic_iterative
 import vp_sin_generator
-from test_helper import reset_dut, frac2bin
+from harness import reset_dut, frac2bin, frac2bin_array, Scoreboard
 from cocotb.triggers import Timer, FallingEdge, RisingEdge
 from cocotb.clock import Clock
 
@@ -39,6 +39,14 @@ async def cosim_sin_generator(dut):
     # run the virtual prototype
     calc_values, xc_values, yc_values, zc_values, xi_values, yi_values, zi_values = vp_sin_generator.sin_gen_debug(Q7, PHASE, CORDIC_ITERATIONS, NUMBER_OF_SAMPLES)
 
+    # convert the virtual prototype values once into the register codes of the checked signals
+    scoreboards = {
+        name : Scoreboard(name, frac2bin_array(values, Q7, binstr=False), Q7)
+        for name, values in [('amplitude_i', xi_values), ('y_const', yi_values), ('z_phase', zi_values),
+                             ('x_con_out', xc_values), ('y_con_out', yc_values), ('z_con_out', zc_values), 
+                             ('data_o', calc_values)]
+    }
+
     # setup the inputs of the sin_generator
     dut.get_next_data_strobe_i.value = 0
     dut.phase_i.value = frac2bin(PHASE, Q7)
@@ -65,12 +73,11 @@ async def cosim_sin_generator(dut):
         if DEBUG:
             dut._log.info('----------------------- input convergence ----------------------------------')
             dut._log.info(f'{dut.amplitude.value.binstr} | {dut.y_const.value.binstr} | {dut.z_phase.value.binstr} | dut')
-            dut._log.info(f'{frac2bin(xi_values[i], Q7).binstr} | {frac2bin(yi_values[i], Q7).binstr} | {frac2bin(zi_values[i], Q7).binstr} | python')
+            dut._log.info(f'{scoreboards["amplitude_i"].expected_binstr(i)} | {scoreboards["y_const"].expected_binstr(i)} | {scoreboards["z_phase"].expected_binstr(i)} | python')
         
         # test the inputs of the module
-        assert dut.amplitude_i.value.binstr == frac2bin(xi_values[i], Q7).binstr
-        assert dut.y_const.value.binstr == frac2bin(yi_values[i], Q7).binstr
-        assert dut.z_phase.value.binstr == frac2bin(zi_values[i], Q7).binstr
+        for name in ['amplitude_i', 'y_const', 'z_phase']:
+            scoreboards[name].check(getattr(dut, name).value)
 
         if DEBUG:
             dut._log.info('-------------------------------------------------------------------------------')
@@ -80,12 +87,11 @@ async def cosim_sin_generator(dut):
         if DEBUG:
             dut._log.info('----------------------- output convergence ----------------------------------')
             dut._log.info(f'{dut.x_con_out.value.binstr} | {dut.y_con_out.value.binstr} | {dut.z_con_out.value.binstr} | dut')
-            dut._log.info(f'{frac2bin(xc_values[i], Q7, FRAC_BITS).binstr} | {frac2bin(yc_values[i], Q7, FRAC_BITS).binstr} | {frac2bin(zc_values[i], Q7, FRAC_BITS).binstr} | python')
+            dut._log.info(f'{scoreboards["x_con_out"].expected_binstr(i)} | {scoreboards["y_con_out"].expected_binstr(i)} | {scoreboards["z_con_out"].expected_binstr(i)} | python')
         
         # test the values after the convergence unit in the sin_generator
-        assert dut.x_con_out.value.binstr == frac2bin(xc_values[i], Q7).binstr
-        assert dut.y_con_out.value.binstr == frac2bin(yc_values[i], Q7).binstr
-        assert dut.z_con_out.value.binstr == frac2bin(zc_values[i], Q7).binstr
+        for name in ['x_con_out', 'y_con_out', 'z_con_out']:
+            scoreboards[name].check(getattr(dut, name).value)
         
         if DEBUG:
             dut._log.info('-------------------------------------------------------------------------------')
@@ -94,10 +100,10 @@ async def cosim_sin_generator(dut):
         await Timer(10, units='ps')
         
         if DEBUG:
-            dut._log.info(f'#{i:>03} -> {dut.data_o.value.binstr} | {frac2bin(calc_values[i], Q7).binstr}')
+            dut._log.info(f'#{i:>03} -> {dut.data_o.value.binstr} | {scoreboards["data_o"].expected_binstr(i)}')
 
         # test the output value of the sin_generator
-        assert dut.data_o.value.binstr == frac2bin(calc_values[i], Q7).binstr
+        scoreboards['data_o'].check(dut.data_o.value)
    
     dut._log.info('Test finished')
     
@@ -0,0 +1,269 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module explores the design space of the cordic (N_FRAC and ITERATIONS of cordic_iterative). For every
+# grid point of Q notation and iterations the quantized virtual prototypes are compared with np.sin and np.cos:
+#   rotation: get_rotated_vector for all phase codes of the convergence range (-90° to 90°)
+#   sinus:    sin_gen for all states of the phase accumulator, these are all samples of every phase code
+# The reference is an exact rotation of the same start vector, the error includes the quantization of the
+# registers, the micro angles and k. With many iterations the rotated vector can exceed full scale and wraps
+# around to the other side of the register. These samples are counted as overflows and left out of the errors,
+# grid points with overflows are not on the Pareto frontier. The grid points run on a process pool, the results
+# are cached on disk with a hash of the grid point and of the sources of the virtual prototypes.
+# Run with: python cordic/design_space.py [--sfixed-fract 5 6 7 8] [--iterations 2 3 4 5 6 7 8] [-j 4]
+
+# imports
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+import numpy as np
+import fixed_point
+import vp_cordic_iterative
+import vp_sin_generator
+
+# folders of the sources and of the cache
+CORDIC_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_DIR = os.path.normpath(os.path.join(CORDIC_DIR, '..'))
+CACHE_DIR = os.path.join(CORDIC_DIR, 'dse_cache')
+
+# a sample that wrapped around lies on the other side of the register (the range is 2), its error is larger than
+# half of the range, the accuracy errors of the cordic stay far below
+WRAP_ERROR = 1.0
+
+# sources of the virtual prototypes, a change of these files invalidates the cache
+SOURCES = ('common/fixed_point.py', 'common/kernels.py', 'cordic/vp_cordic_iterative.py', 'cordic/vp_sin_generator.py', 'cordic/design_space.py')
+
+@dataclass(frozen=True)
+class DesignPoint:
+    """Accuracy of the cordic for one Q notation and number of iterations
+
+    Attributes:
+        sfixed_fract (int): number of fractional bits
+        iterations (int): number of cordic iterations
+        cycles (int): clock cycles of cordic_iterative for one rotation
+        rotation_max_error (float): max error of the sine and cosine of get_rotated_vector without the overflows
+        rotation_rms_error (float): rms error of the sine and cosine of get_rotated_vector without the overflows
+        sinus_max_error (float): max error of the samples of sin_gen without the overflows
+        sinus_rms_error (float): rms error of the samples of sin_gen without the overflows
+        rotation_overflows (int): number of sine and cosine values of get_rotated_vector that wrapped around
+        sinus_overflows (int): number of samples of sin_gen that wrapped around
+    """
+    sfixed_fract: int
+    iterations: int
+    cycles: int
+    rotation_max_error: float
+    rotation_rms_error: float
+    sinus_max_error: float
+    sinus_rms_error: float
+    rotation_overflows: int = 0
+    sinus_overflows: int = 0
+
+    @property
+    def overflow(self):
+        """bool: true if a value of the rotation or of the sinus wrapped around"""
+        return self.rotation_overflows > 0 or self.sinus_overflows > 0
+
+    @property
+    def sinus_bits(self):
+        """float: number of correct bits of the sinus (-log2 of the max error without the overflows)"""
+        return -np.log2(self.sinus_max_error) if self.sinus_max_error != 0 else np.inf
+
+def cordic_cycles(iterations):
+    """Number of clock cycles of cordic_iterative for one rotation: start, one cycle per iteration and output
+
+    Args:
+        iterations (int): number of cordic iterations
+
+    Returns:
+        int: clock cycles
+    """
+    return iterations + 2
+
+def exact_gain(iterations):
+    """Gain of the cordic rotation without quantization
+
+    Args:
+        iterations (int): number of cordic iterations
+
+    Returns:
+        float: length of the rotated vector divided by the length of the start vector
+    """
+    shift_vector = vp_cordic_iterative.gen_shift_vector(iterations)
+    return float(np.prod(np.sqrt(1 + 2.0 ** (-2 * shift_vector))))
+
+def error_statistics(error):
+    """Splits the error of a grid point into the wrapped values and the accuracy of the other values
+
+    Args:
+        error (np.array): difference to the exact values
+
+    Returns:
+        (float, float, int): max error and rms error without the wrapped values, number of wrapped values
+    """
+    error = np.abs(error)
+    wrapped = error > WRAP_ERROR
+    valid = error[~wrapped]
+    if valid.size == 0:
+        return np.nan, np.nan, int(np.count_nonzero(wrapped))
+    return float(np.max(valid)), float(np.sqrt(np.mean(valid ** 2))), int(np.count_nonzero(wrapped))
+
+def evaluate(sfixed_fract, iterations):
+    """Compares the quantized cordic of one grid point with np.sin and np.cos
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        iterations (int): number of iterations for the cordic algorithm
+
+    Returns:
+        DesignPoint: errors of the grid point
+    """
+    config = vp_cordic_iterative.get_cordic_config(sfixed_fract, iterations)
+    gain = exact_gain(iterations)
+
+    # rotation of the max amplitude for all phase codes of the convergence range
+    half = 1 << (sfixed_fract - 1)
+    phases = fixed_point.to_float(np.arange(-half, half + 1), sfixed_fract)
+    cos_values, sin_values = vp_cordic_iterative.get_rotated_vector(phases, sfixed_fract, iterations)
+    amplitude = fixed_point.to_float(config.amplitude_int, sfixed_fract) * gain
+    rotation_error = np.concatenate([cos_values - amplitude * np.cos(np.pi * phases), sin_values - amplitude * np.sin(np.pi * phases)])
+
+    # one period of the phase code 1 passes all states of the phase accumulator
+    n_states = 2 ** (sfixed_fract + 1)
+    calc_values, xc_values, yc_values, zc_values, xi_values, yi_values, zi_values = vp_sin_generator.sin_gen_debug(sfixed_fract, 2.0 ** -sfixed_fract, iterations, n_states)
+    sinus_error = calc_values - xi_values * gain * np.sin(np.pi * zi_values)
+
+    rotation_max, rotation_rms, rotation_overflows = error_statistics(rotation_error)
+    sinus_max, sinus_rms, sinus_overflows = error_statistics(sinus_error)
+    return DesignPoint(sfixed_fract, iterations, cordic_cycles(iterations), rotation_max, rotation_rms,
+                       sinus_max, sinus_rms, rotation_overflows, sinus_overflows)
+
+def cache_key(sfixed_fract, iterations):
+    """Calculates the key of a grid point in the cache
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        iterations (int): number of iterations for the cordic algorithm
+
+    Returns:
+        str: first 16 hex digits of the hash of the grid point and of the sources
+    """
+    digest = hashlib.sha256(f'{sfixed_fract},{iterations}'.encode())
+    for source in SOURCES:
+        digest.update(source.encode())
+        with open(os.path.join(TEST_DIR, source), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+def cached_evaluate(sfixed_fract, iterations, cache_dir=CACHE_DIR):
+    """Evaluates a grid point or reads its result from the cache
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        iterations (int): number of iterations for the cordic algorithm
+        cache_dir (str, optional): folder of the cache, None disables the cache. Defaults to CACHE_DIR.
+
+    Returns:
+        (DesignPoint, bool): errors of the grid point, true if the result was read from the cache
+    """
+    if cache_dir is None:
+        return evaluate(sfixed_fract, iterations), False
+
+    path = os.path.join(cache_dir, f'q{sfixed_fract}_it{iterations}_{cache_key(sfixed_fract, iterations)}.json')
+    if os.path.exists(path):
+        with open(path) as file:
+            return DesignPoint(**json.load(file)), True
+
+    point = evaluate(sfixed_fract, iterations)
+
+    # write to a temporary file first, parallel runs never see a partial result
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(asdict(point), file)
+    os.replace(tmp_path, path)
+    return point, False
+
+def explore(sfixed_fracts, iterations, jobs=None, cache_dir=CACHE_DIR):
+    """Evaluates all grid points on a process pool
+
+    Args:
+        sfixed_fracts (list[int]): Q notations of the grid
+        iterations (list[int]): numbers of iterations of the grid
+        jobs (int, optional): number of processes. Defaults to the number of cores.
+        cache_dir (str, optional): folder of the cache, None disables the cache. Defaults to CACHE_DIR.
+
+    Returns:
+        (list[DesignPoint], int): results sorted by Q notation and iterations, number of results from the cache
+    """
+    points = []
+    n_cached = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(cached_evaluate, q, n, cache_dir) for q in sfixed_fracts for n in iterations]
+        for future in as_completed(futures):
+            point, cached = future.result()
+            points.append(point)
+            n_cached += cached
+    points.sort(key=lambda point: (point.sfixed_fract, point.iterations))
+    return points, n_cached
+
+def pareto_frontier(points, error='sinus_max_error'):
+    """Finds the grid points where no other point has fewer cycles and a smaller error, points with overflows are left out
+
+    Args:
+        points (list[DesignPoint]): results of the grid
+        error (str, optional): name of the error attribute. Defaults to 'sinus_max_error'.
+
+    Returns:
+        list[DesignPoint]: points of the frontier sorted by the cycles
+    """
+    frontier = []
+    points = [point for point in points if not point.overflow]
+    for point in sorted(points, key=lambda point: (point.cycles, getattr(point, error), point.sfixed_fract)):
+        if not frontier or getattr(point, error) < getattr(frontier[-1], error):
+            frontier.append(point)
+    return frontier
+
+def print_table(points):
+    """Prints the errors of all grid points
+
+    Args:
+        points (list[DesignPoint]): results of the grid
+    """
+    print(f'{"Q":>3} {"iter":>4} {"cycles":>6} {"rot max":>10} {"rot rms":>10} {"sin max":>10} {"sin rms":>10} {"sin bits":>8} {"rot wraps":>9} {"sin wraps":>9}')
+    for point in points:
+        print(f'{point.sfixed_fract:>3} {point.iterations:>4} {point.cycles:>6} {point.rotation_max_error:>10.2e} {point.rotation_rms_error:>10.2e} '
+              f'{point.sinus_max_error:>10.2e} {point.sinus_rms_error:>10.2e} {point.sinus_bits:>8.2f} {point.rotation_overflows:>9} {point.sinus_overflows:>9}')
+
+def main():
+    parser = argparse.ArgumentParser(description='accuracy of the quantized cordic over a grid of Q notations and iterations')
+    parser.add_argument('--sfixed-fract', type=int, nargs='+', default=list(range(5, 16)), help='Q notations of the grid')
+    parser.add_argument('--iterations', type=int, nargs='+', default=list(range(2, 17)), help='numbers of iterations of the grid')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of processes (default: number of cores)')
+    parser.add_argument('--no-cache', action='store_true', help='evaluate all grid points again and do not write the cache')
+    args = parser.parse_args()
+
+    points, n_cached = explore(args.sfixed_fract, args.iterations, args.jobs, None if args.no_cache else CACHE_DIR)
+    print_table(points)
+    print(f'{len(points)} grid points, {n_cached} from the cache, {sum(point.overflow for point in points)} with overflows')
+
+    print('\nPareto frontier of the max error of the sinus against the cycles of cordic_iterative (without overflows)')
+    print_table(pareto_frontier(points))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
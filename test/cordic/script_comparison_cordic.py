@@ -32,10 +32,10 @@ result_xy_np =  (np.cos(PHASE * np.pi), np.sin(PHASE * np.pi))
 
 # the parallel output has 8 bits therefore we look at Q7 quantized values for comparison
 lsb = 2**(-7)
-result_quantized_xy_15_15 = vp_cordic_iterative.quantize_value_vec(result_xy_15_15, lsb)
-result_quantized_xy_7_8 = vp_cordic_iterative.quantize_value_vec(result_xy_7_8, lsb)
-result_quantized_xy_7_6 = vp_cordic_iterative.quantize_value_vec(result_xy_7_6, lsb)
-result_quantized_xy_np = vp_cordic_iterative.quantize_value_vec(result_xy_np, lsb)
+result_quantized_xy_15_15 = vp_cordic_iterative.quantize_value(result_xy_15_15, lsb)
+result_quantized_xy_7_8 = vp_cordic_iterative.quantize_value(result_xy_7_8, lsb)
+result_quantized_xy_7_6 = vp_cordic_iterative.quantize_value(result_xy_7_6, lsb)
+result_quantized_xy_np = vp_cordic_iterative.quantize_value(result_xy_np, lsb)
 
 # create plot
 plt.figure()
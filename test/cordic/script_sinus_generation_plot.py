@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# This script to generates a test plot of a generated sinus with a quantized python sinus generator
+# This script to generates a test plot of a generated sinus with a quantized python sinus generator.
+# Without a display or with --output the figure is written as png or svg file (see common/plot_render.py)
 
 # import 
 import numpy as np
 import vp_sin_generator
-import matplotlib.pyplot as plt
+import plot_render
 
 # configuration values for the sinus
 Q7 = 7
@@ -26,14 +27,17 @@ PHASE = 0.308807373046875
 CORDIC_ITERATIONS = 6
 NUMBER_OF_SAMPLES = 300
 
-# create data of the sin
-data = vp_sin_generator.sin_gen(Q7, PHASE, CORDIC_ITERATIONS, NUMBER_OF_SAMPLES)
-x = np.arange(NUMBER_OF_SAMPLES)
+args = plot_render.parse_args('plots the sinus of the sin_generator', NUMBER_OF_SAMPLES)
+plt = plot_render.pyplot(args.output)
 
-# create figure of sin
+# create data of the sin, the period of the sinus is generated once and repeated for long signals
+data = vp_sin_generator.sin_gen_orbit(Q7, PHASE, CORDIC_ITERATIONS).samples(args.samples)
+x = np.arange(args.samples)
+
+# create figure of sin, long signals are decimated to the envelope per pixel
 plt.figure()
 plt.title('Quantized Sinus generated with a cordic algorithm')
 plt.xlabel('N')
 plt.ylabel('y')
-plt.plot(x, data)
-plt.show()
\ No newline at end of file
+plot_render.plot(plt.gca(), x, data)
+plot_render.finish(plt, ['sinus'], args.output, args.format)
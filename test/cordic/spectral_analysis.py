@@ -0,0 +1,207 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module measures the spectral purity of the sinus of the sin_generator (SFDR, SNR, THD, SINAD and ENOB).
+# The phase accumulator has 2**(sfixed_fract+1) states, therefore 2**(sfixed_fract+1) samples hold an integer
+# number of periods for every phase code. The spectrum is calculated with a FFT without a window, the signal,
+# the harmonics and the noise lie exactly on the bins. All phase codes are generated and analyzed as one batch.
+# Run with: python cordic/spectral_analysis.py [--iterations 4 5 6 7 8] [--sfixed-fract 7] [--per-code]
+
+# imports
+import argparse
+import sys
+from dataclasses import dataclass
+import numpy as np
+import fixed_point
+import vp_sin_generator
+
+# number of harmonics (including the fundamental) that belong to the distortion
+N_HARMONICS = 5
+
+# number of phase codes per batch of the sinus generation
+BATCH_SIZE = 256
+
+@dataclass(frozen=True)
+class SpectralMetrics:
+    """Spectral metrics of a batch of sinus signals, every attribute has one value per signal
+
+    Attributes:
+        fundamental_bin (np.array): bin of the fundamental
+        sfdr (np.array): spurious free dynamic range in dBc (largest spur except dc)
+        snr (np.array): signal to noise ratio in dB (without dc and harmonics)
+        thd (np.array): total harmonic distortion in dBc
+        sinad (np.array): signal to noise and distortion ratio in dB
+        enob (np.array): effective number of bits calculated from the sinad
+    """
+    fundamental_bin: np.ndarray
+    sfdr: np.ndarray
+    snr: np.ndarray
+    thd: np.ndarray
+    sinad: np.ndarray
+    enob: np.ndarray
+
+def coherent_length(sfixed_fract):
+    """Number of samples that hold an integer number of periods for every phase code
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        int: number of states of the phase accumulator
+    """
+    return 2 ** (sfixed_fract + 1)
+
+def fundamental_bins(phase_codes, sfixed_fract):
+    """Bin of the fundamental in the spectrum of coherent_length samples
+
+    Args:
+        phase_codes (np.array): unsigned register codes of the phase
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        np.array: bins of the fundamentals (number of periods in the samples)
+    """
+    # the phase is the fraction of half a period per sample
+    return np.abs(fixed_point.wrap(np.asarray(phase_codes, dtype=np.int64), sfixed_fract))
+
+def fold_bins(bins, n_samples):
+    """Folds the bins of a frequency into the first nyquist zone
+
+    Args:
+        bins (np.array): bins of the frequencies (any integer)
+        n_samples (int): number of samples of the spectrum
+
+    Returns:
+        np.array: bins between 0 and n_samples // 2
+    """
+    bins = np.mod(bins, n_samples)
+    return np.where(bins > n_samples // 2, n_samples - bins, bins)
+
+def power_spectrum(samples):
+    """One sided power spectrum of real signals without a window
+
+    Args:
+        samples (np.array): signals along the last axis
+
+    Returns:
+        np.array: power of the bins 0 to n_samples // 2 along the last axis
+    """
+    n_samples = samples.shape[-1]
+    power = np.abs(np.fft.rfft(samples, axis=-1)) ** 2 / n_samples ** 2
+
+    # the negative frequencies are added to the bins between dc and nyquist
+    power[..., 1:(n_samples + 1) // 2] *= 2
+    return power
+
+def spectral_metrics(samples, fundamental_bin, n_harmonics=N_HARMONICS):
+    """Calculates the spectral metrics of a batch of coherently sampled sinus signals
+
+    Args:
+        samples (np.array): signals along the last axis, shape (batch, n_samples)
+        fundamental_bin (np.array): bin of the fundamental of every signal (not dc)
+        n_harmonics (int, optional): number of harmonics including the fundamental. Defaults to N_HARMONICS.
+
+    Returns:
+        SpectralMetrics: metrics of every signal, a signal without noise or spurs has infinite ratios
+    """
+    samples = np.atleast_2d(samples)
+    n_samples = samples.shape[-1]
+    fundamental_bin = np.asarray(fundamental_bin, dtype=np.int64).reshape(-1)
+    power = power_spectrum(samples)
+    rows = np.arange(len(samples))[:, np.newaxis]
+
+    # the harmonics are folded into the first nyquist zone, harmonics on dc or on the fundamental are ignored
+    harmonic_bins = fold_bins(fundamental_bin[:, np.newaxis] * np.arange(2, n_harmonics + 1), n_samples)
+    harmonics = np.zeros(power.shape, dtype=bool)
+    harmonics[rows, harmonic_bins] = True
+    harmonics[:, 0] = False
+    harmonics[rows[:, 0], fundamental_bin] = False
+
+    # the noise is everything except dc, the fundamental and the harmonics
+    signal_power = power[rows[:, 0], fundamental_bin]
+    spurs = power.copy()
+    spurs[:, 0] = 0
+    spurs[rows[:, 0], fundamental_bin] = 0
+    distortion_power = np.sum(np.where(harmonics, spurs, 0), axis=-1)
+    noise_power = np.sum(np.where(harmonics, 0, spurs), axis=-1)
+
+    with np.errstate(divide='ignore'):
+        sfdr = 10 * np.log10(signal_power / np.max(spurs, axis=-1))
+        snr = 10 * np.log10(signal_power / noise_power)
+        thd = 10 * np.log10(distortion_power / signal_power)
+        sinad = 10 * np.log10(signal_power / (noise_power + distortion_power))
+    enob = (sinad - 1.76) / 6.02
+
+    return SpectralMetrics(fundamental_bin, sfdr, snr, thd, sinad, enob)
+
+def analyze(sfixed_fract, iterations, phase_codes=None, n_harmonics=N_HARMONICS, batch_size=BATCH_SIZE):
+    """Generates the sinus of the sin_generator for all phase codes and calculates the spectral metrics
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        iterations (int): number of iterations for the cordic algorithm
+        phase_codes (np.array, optional): unsigned phase codes, dc (0) is not allowed. Defaults to all codes except 0.
+        n_harmonics (int, optional): number of harmonics including the fundamental. Defaults to N_HARMONICS.
+        batch_size (int, optional): number of phase codes per generated batch. Defaults to BATCH_SIZE.
+
+    Returns:
+        (np.array, SpectralMetrics): phase codes, metrics of every phase code
+    """
+    n_samples = coherent_length(sfixed_fract)
+    if phase_codes is None:
+        phase_codes = np.arange(1, n_samples)
+    phase_codes = np.asarray(phase_codes, dtype=np.int64)
+    bins = fundamental_bins(phase_codes, sfixed_fract)
+    if np.any(bins == 0):
+        raise ValueError('the phase code 0 generates no sinus')
+
+    results = []
+    for start in range(0, len(phase_codes), batch_size):
+        codes = phase_codes[start:start + batch_size]
+        phases = fixed_point.to_float(fixed_point.wrap(codes, sfixed_fract), sfixed_fract)
+        samples = vp_sin_generator.sin_gen(sfixed_fract, phases, iterations, n_samples)
+        results.append(spectral_metrics(samples, bins[start:start + batch_size], n_harmonics))
+
+    metrics = SpectralMetrics(*(np.concatenate([getattr(result, name) for result in results]) for name in SpectralMetrics.__dataclass_fields__))
+    return phase_codes, metrics
+
+def main():
+    parser = argparse.ArgumentParser(description='spectral metrics of the sinus of the sin_generator over all phase codes')
+    parser.add_argument('--sfixed-fract', type=int, default=7, help='number of fractional bits')
+    parser.add_argument('--iterations', type=int, nargs='+', default=[4, 5, 6, 7, 8], help='iterations of the cordic')
+    parser.add_argument('--harmonics', type=int, default=N_HARMONICS, help='number of harmonics including the fundamental')
+    parser.add_argument('--per-code', action='store_true', help='print the metrics of every phase code')
+    args = parser.parse_args()
+
+    # worst case and median over all phase codes, infinite ratios (no noise or no spurs) are left out of the median
+    print(f'Q{args.sfixed_fract}, {coherent_length(args.sfixed_fract)} samples per phase code')
+    print(f'{"iterations":>10} {"SFDR min":>9} {"SFDR med":>9} {"SNR min":>8} {"SNR med":>8} {"THD max":>8} {"THD med":>8} {"ENOB min":>9} {"ENOB med":>9}')
+    for iterations in args.iterations:
+        phase_codes, metrics = analyze(args.sfixed_fract, iterations, n_harmonics=args.harmonics)
+
+        def median(values):
+            values = values[np.isfinite(values)]
+            return np.median(values) if values.size else np.inf
+
+        print(f'{iterations:>10} {np.min(metrics.sfdr):>9.2f} {median(metrics.sfdr):>9.2f} {np.min(metrics.snr):>8.2f} {median(metrics.snr):>8.2f} '
+              f'{np.max(metrics.thd):>8.2f} {median(metrics.thd):>8.2f} {np.min(metrics.enob):>9.2f} {median(metrics.enob):>9.2f}')
+
+        if args.per_code:
+            for code, i in zip(phase_codes, range(len(phase_codes))):
+                print(f'    phase code {code:>5} (bin {metrics.fundamental_bin[i]:>5}): SFDR {metrics.sfdr[i]:7.2f} dBc, SNR {metrics.snr[i]:7.2f} dB, '
+                      f'THD {metrics.thd[i]:7.2f} dBc, SINAD {metrics.sinad[i]:7.2f} dB, ENOB {metrics.enob[i]:5.2f}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,40 +13,12 @@
 # limitations under the License.
 
 # imports
+import functools
+from dataclasses import dataclass
 import numpy as np
-
-def quantize_value(x, lsb):
-    """This function quantize the given number so that it lies between -1 and 1-LSB. 
-    Where LSB is the least significant bit of the bit vector   
-
-    Args:
-        x (float): number to quantize 
-        lsb (float): value of the lsb
-
-    Returns:
-        float: quantize value
-    """
-    # no negative lsb values are allowed
-    lsb = np.abs(lsb)
-
-    # calculate the upper and lower bound for the quantize value 
-    upper_bound = 1 - lsb
-    lower_bound = -1
-
-    # we use truncation to quantize the value
-    x_q = np.floor(x / lsb) * lsb
-
-    # If the number does not lie within the limits, it is reshaped so that it lies within the limits. 
-    # The wrap mode is used for this
-    if x_q < lower_bound:
-        x_q = x_q - 2 * lower_bound
-    elif x_q > upper_bound:
-        x_q = x_q + 2 * lower_bound
-
-    return x_q
-
-# converts the function into a function, that can work with numpy arrays
-quantize_value_vec = np.vectorize(quantize_value)
+import fixed_point
+import kernels
+from fixed_point import quantize_value
 
 def sra(x, s, sfixed_fract):
     """Function that performs a shift right arithmetic on a quantize value
@@ -59,28 +31,21 @@ def sra(x, s, sfixed_fract):
     Returns:
         float: shifted value
     """
-
-    if s == 0:
-        return x # if shift is equal to zero we keep the value
-    else:
-        # we perform the shift operation in the integer range.
-        # Therefore we assume the value is quantized with the given fractional bits
-        x_int = int(x * 2**sfixed_fract)
-        # perform the shift
-        x_int = x_int >> s
-        # convert the integer back to a float number that lies in the borders of the 
-        # given fractional bits
-        return x_int / 2**sfixed_fract
+    # we perform the shift operation in the integer range of the fixed-point core
+    x_int = fixed_point.to_fixed(x, sfixed_fract)
+    return fixed_point.to_float(fixed_point.sra(x_int, s), sfixed_fract)
 
         
 def cordic(xi, yi, zi, angles_vector, shift_vector, iterations, sfixed_fract):
     """This function performs the cordic algorithm. However, with the restriction that 
     the algorithm only supports the rotation mode and as coordinate system only the circular system. 
+    The inputs can be single values or arrays with a batch of input vectors, every iteration is then performed 
+    for the whole batch at once.
 
     Args:
-        xi (float): x input value (should be scaled with the k value)
-        yi (float): y input value (should be scaled with the k value)
-        zi (float): z input value (must lie between -100° and 100°)
+        xi (float or np.array): x input value (should be scaled with the k value)
+        yi (float or np.array): y input value (should be scaled with the k value)
+        zi (float or np.array): z input value (must lie between -100° and 100°)
         angles_vector (np.array): micro angeles for the iterations
         shift_vector (np.array): shift values per iteration
         iterations (int): amount of iterations
@@ -88,37 +53,78 @@ def cordic(xi, yi, zi, angles_vector, shift_vector, iterations, sfixed_fract):
 
     Returns:
         (np.array, np.array, np.array): returns a tuple (x,y,z) with all intermediate results and 
-                                        the final result of the algorithm
+                                        the final result of the algorithm. The first axis is the iteration 
+                                        and the remaining axes are the shape of the batch
     """
-    # calculate the lsb value for the given fraction bits
-    lsb = 2**(-sfixed_fract)
+    # the algorithm runs on the integer codes of the fixed-point core
+    xo, yo, zo = cordic_fixed(fixed_point.to_fixed(xi, sfixed_fract), 
+                              fixed_point.to_fixed(yi, sfixed_fract), 
+                              fixed_point.to_fixed(zi, sfixed_fract), 
+                              fixed_point.to_fixed(angles_vector, sfixed_fract), 
+                              shift_vector, iterations, sfixed_fract)
+
+    # convert the integer codes back to float values
+    return (fixed_point.to_float(xo, sfixed_fract),
+            fixed_point.to_float(yo, sfixed_fract),
+            fixed_point.to_float(zo, sfixed_fract))
+
+def cordic_fixed(xi, yi, zi, angles_vector, shift_vector, iterations, sfixed_fract):
+    """This function performs the cordic algorithm on the integer codes of the fixed-point core. 
+    It is the same algorithm as cordic and is bit true to the cordic_iterative verilog module.
+    The inputs can be single codes or arrays with a batch of input vectors.
+
+    Args:
+        xi (int or np.array): x input code (should be scaled with the k value)
+        yi (int or np.array): y input code (should be scaled with the k value)
+        zi (int or np.array): z input code (must lie between -100° and 100°)
+        angles_vector (np.array): integer codes of the micro angeles for the iterations
+        shift_vector (np.array): shift values per iteration
+        iterations (int): amount of iterations
+        sfixed_fract (int): sets the number of fractional bits
+
+    Returns:
+        (np.array, np.array, np.array): returns a tuple (x,y,z) with the integer codes of all intermediate results and 
+                                        the final result of the algorithm. The first axis is the iteration 
+                                        and the remaining axes are the shape of the batch
+    """
+    # bring the inputs to a common batch shape
+    x, y, z = np.broadcast_arrays(np.asarray(xi, dtype=np.int64), 
+                                  np.asarray(yi, dtype=np.int64), 
+                                  np.asarray(zi, dtype=np.int64))
+    angles_int = np.asarray(angles_vector, dtype=np.int64)
+
+    if kernels.use_jit():
+        # the compiled kernel works on a flat batch
+        shape = (iterations+1,) + x.shape
+        xo, yo, zo = kernels.cordic_kernel(x.ravel(), y.ravel(), z.ravel(), angles_int, 
+                                           np.asarray(shift_vector, dtype=np.int64), iterations, sfixed_fract)
+        return xo.reshape(shape), yo.reshape(shape), zo.reshape(shape)
 
     # create the storage for the values
-    xo = np.zeros(iterations+1)
-    yo = np.zeros(iterations+1)
-    zo = np.zeros(iterations+1)
+    xo = np.zeros((iterations+1,) + x.shape, dtype=np.int64)
+    yo = np.zeros((iterations+1,) + x.shape, dtype=np.int64)
+    zo = np.zeros((iterations+1,) + x.shape, dtype=np.int64)
 
     # initialize the cordic algorithm
-    xo[0] = xi
-    yo[0] = yi
-    zo[0] = zi
+    xo[0] = x
+    yo[0] = y
+    zo[0] = z
 
+    # the loop runs only over the iterations, each iteration is calculated for the whole batch
     for i in range(iterations):
         # define to rotation direction of the iteration
         # if sigma is 1 we add the micro angle else we subtract it 
         # sigma is depending on the last zo
-        sigma = -1
-        if zo[i] >= 0:
-            sigma = 1
+        sigma = np.where(zo[i] >= 0, 1, -1)
 
         # perform the shifts
-        y_shift = quantize_value(sra(yo[i], shift_vector[i], sfixed_fract), lsb)
-        x_shift = quantize_value(sra(xo[i], shift_vector[i], sfixed_fract), lsb)
+        y_shift = fixed_point.sra(yo[i], int(shift_vector[i]))
+        x_shift = fixed_point.sra(xo[i], int(shift_vector[i]))
 
         # calculate the next values for the cordic iterations
-        xo[i+1] = quantize_value(xo[i] - sigma * y_shift, lsb)
-        yo[i+1] = quantize_value(yo[i] + sigma * x_shift, lsb)
-        zo[i+1] = quantize_value(zo[i] - sigma * angles_vector[i], lsb)
+        xo[i+1] = fixed_point.wrap(xo[i] - sigma * y_shift, sfixed_fract)
+        yo[i+1] = fixed_point.wrap(yo[i] + sigma * x_shift, sfixed_fract)
+        zo[i+1] = fixed_point.wrap(zo[i] - sigma * angles_int[i], sfixed_fract)
 
     return xo, yo, zo
 
@@ -156,48 +162,79 @@ def gen_angles_vector(shift_vector, lsb):
         np.array: array with all micro angeles
     """
     angles_vector = np.arctan(np.power(2 * np.ones(len(shift_vector)),(-shift_vector))) / np.pi
-    return quantize_value_vec(angles_vector, lsb)
+    return quantize_value(angles_vector, lsb)
 
-def get_rotated_vector(phase, sfixed_fract, iterations):
-    """This function performs a rotation according to a phase value with a maximum amplitude that doesn't overflow. 
-       The starting point is defined as: x is set to the max amplitude and y is set to zero.
+@dataclass(frozen=True)
+class CordicConfig:
+    """Precomputed constant tables of the cordic algorithm for one Q notation and number of iterations.
+       The tables are read-only, instances should be created with get_cordic_config.
+
+    Attributes:
+        sfixed_fract (int): number of fractional bits
+        iterations (int): number of cordic iterations
+        lsb (float): value of the lsb
+        shift_vector (np.array): shift values per iteration
+        angles_vector (np.array): quantized micro angeles per iteration
+        angles_int (np.array): integer codes of the micro angeles
+        k (float): quantized k value for scaling
+        k_int (int): integer code of the k value
+        amplitude_int (int): integer code of the max amplitude (1-LSB scaled with k) that doesn't overflow
+    """
+    sfixed_fract: int
+    iterations: int
+    lsb: float
+    shift_vector: np.ndarray
+    angles_vector: np.ndarray
+    angles_int: np.ndarray
+    k: float
+    k_int: int
+    amplitude_int: int
+
+@functools.lru_cache(maxsize=256)
+def get_cordic_config(sfixed_fract, iterations):
+    """creates the constant tables of the cordic algorithm once per (sfixed_fract, iterations) pair. 
+       The configs are kept in a bounded lru cache, so repeated calls don't generate the tables again.
 
     Args:
-        phase (float): phase value to rotate
         sfixed_fract (int): sets the number of fractional bits
         iterations (int): number of iterations for the cordic algorithm
 
     Returns:
-        np.array, np.array: sine value, cosine value for the given phase
+        CordicConfig: config with the tables of the cordic algorithm
     """
-    # generate the values for the cordic according to the iteration value and the number of fractional bits
     lsb = 2**(-sfixed_fract)
     shift_vector = gen_shift_vector(iterations)
     angles_vector = gen_angles_vector(shift_vector, lsb)
+    angles_int = fixed_point.to_fixed(angles_vector, sfixed_fract)
     k = gen_k(shift_vector, lsb)
+    k_int = int(fixed_point.to_fixed(k, sfixed_fract))
+    amplitude_int = int(fixed_point.mul((1 << sfixed_fract) - 1, k_int, sfixed_fract))
 
-    # calculate the max amplitude that doesn't overflow
-    xi = quantize_value(1.0 - lsb, lsb)
-    xi = quantize_value(xi * k, lsb)
-    yi = quantize_value(0, lsb)
-    zi = quantize_value(phase, lsb)
-
-    # perform the cordic algorithm
-    xo, yo, zo = cordic(xi,yi,zi, angles_vector, shift_vector, iterations, sfixed_fract)
-
-    return xo[iterations], yo[iterations]
-
-
-
-
-
-
-
-
+    # the tables are shared between all users of the config, therefore they are read-only
+    for table in (shift_vector, angles_vector, angles_int):
+        table.flags.writeable = False
 
+    return CordicConfig(sfixed_fract, iterations, lsb, shift_vector, angles_vector, angles_int, float(k), k_int, amplitude_int)
 
+def get_rotated_vector(phase, sfixed_fract, iterations):
+    """This function performs a rotation according to a phase value with a maximum amplitude that doesn't overflow. 
+       The starting point is defined as: x is set to the max amplitude and y is set to zero.
 
+    Args:
+        phase (float): phase value to rotate
+        sfixed_fract (int): sets the number of fractional bits
+        iterations (int): number of iterations for the cordic algorithm
 
+    Returns:
+        np.array, np.array: sine value, cosine value for the given phase
+    """
+    # get the tables for the cordic according to the iteration value and the number of fractional bits
+    config = get_cordic_config(sfixed_fract, iterations)
 
+    # start with the max amplitude that doesn't overflow
+    zi = fixed_point.to_fixed(phase, sfixed_fract)
 
+    # perform the cordic algorithm
+    xo, yo, zo = cordic_fixed(config.amplitude_int, 0, zi, config.angles_int, config.shift_vector, iterations, sfixed_fract)
 
+    return fixed_point.to_float(xo[iterations], sfixed_fract), fixed_point.to_float(yo[iterations], sfixed_fract)
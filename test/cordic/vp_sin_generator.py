@@ -15,6 +15,8 @@
 # imports
 import numpy as np
 import vp_cordic_iterative
+import fixed_point
+import orbit
 
 def sin_gen(sfixed_fract, phase, iterations, n_samples):
     """The function generates a sinus according to a given phase. 
@@ -22,107 +24,179 @@ def sin_gen(sfixed_fract, phase, iterations, n_samples):
 
     Args:
         sfixed_fract (int): sets the number of fractional bits
-        phase (float): phase difference between two samples of the sinus
+        phase (float or np.array): phase difference between two samples of the sinus (an array gives a sweep, see sin_gen_debug)
         iterations (int): number of iterations for the cordic algorithm
         n_samples (int): number of samples to generate
 
     Returns:
         np.array: array with all calculated sinus values
     """
-    calc_values, xc_values, yc_values, zc_values, xi_values, yi_values, zi_values = sin_gen_debug(sfixed_fract, phase, iterations, n_samples)
+    calc_values, zi_end = sin_gen_chunk(sfixed_fract, phase, iterations, n_samples)
     return calc_values
 
 
-def sin_gen_debug(sfixed_fract, phase, iterations, n_samples):
-    """The function generates a sinus according to a given phase and returns additional values for debugging. 
-       The amplitude of the sinus is set as max value without an overflow
-       
+def sin_gen_stream(sfixed_fract, phase, iterations, chunk_size):
+    """The function is a generator that yields the sinus of sin_gen in chunks of a fixed size without an end.
+       The phase accumulator is carried from one chunk to the next, therefore the chunks joined together 
+       are the same samples as one long sin_gen call, but the memory stays constant.
 
     Args:
         sfixed_fract (int): sets the number of fractional bits
         phase (float): phase difference between two samples of the sinus
         iterations (int): number of iterations for the cordic algorithm
+        chunk_size (int): number of samples per chunk
+
+    Yields:
+        np.array: array with the next chunk_size sinus values
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+
+    # phase accumulator value before the first sample
+    zi = 0
+    while True:
+        # carry the phase accumulator to the next chunk
+        calc_values, zi = sin_gen_chunk(sfixed_fract, phase, iterations, chunk_size, zi)
+        yield calc_values
+
+
+def sin_gen_chunk(sfixed_fract, phase, iterations, n_samples, zi_start=0):
+    """The function generates the samples of sin_gen from a given value of the phase accumulator. 
+       Only the samples and the last value of the phase accumulator are kept, the values of the stages are 
+       not converted and returned as in sin_gen_debug.
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float or np.array): phase difference between two samples of the sinus (an array gives a sweep, see sin_gen_debug)
+        iterations (int): number of iterations for the cordic algorithm
         n_samples (int): number of samples to generate
+        zi_start (float): value of the phase accumulator before the first sample
 
     Returns:
-        (np.array, np.array, np.array, np.array, np.array, np.array, np.array): sinus values, x value after convergence, y value after convergence, 
-                                                                                z value after convergence, x value before convergence, 
-                                                                                y value before convergence, z value before convergence
+        (np.array, float or np.array): sinus values, value of the phase accumulator after the last sample
     """
-    # storage for the different values
-    calc_values = np.zeros(n_samples)
-    xc_values = np.zeros(n_samples)
-    yc_values = np.zeros(n_samples)
-    zc_values = np.zeros(n_samples)
-    xi_values = np.zeros(n_samples)
-    yi_values = np.zeros(n_samples)
-    zi_values = np.zeros(n_samples)
-
-    # calculate the needed values for the cordic algorithm
-    lsb = 2**(-sfixed_fract)
-    shift_vector = vp_cordic_iterative.gen_shift_vector(iterations)
-    angles_vector = vp_cordic_iterative.gen_angles_vector(shift_vector, lsb)
-    k = vp_cordic_iterative.gen_k(shift_vector, lsb)
-
-    # calculate the maximum amplitude without overflow
-    xi = vp_cordic_iterative.quantize_value(1.0 - lsb, lsb)
-    xi = vp_cordic_iterative.quantize_value(xi * k, lsb)
-    xi = vp_cordic_iterative.quantize_value(xi - lsb, lsb)
-
-    # set the init values for y and z to get a sinus output
-    yi = vp_cordic_iterative.quantize_value(0, lsb)
-    zi = vp_cordic_iterative.quantize_value(0, lsb)
-
-    # create the sinus samples
-    for i in range(n_samples):
-        # phase accumulator
-        zi = vp_cordic_iterative.quantize_value(zi + phase, lsb)
-
-        xc = xi
-        yc = yi
-        zc = zi
-
-        # store the values before the convergence unit
-        xi_values[i] = xc
-        yi_values[i] = yc
-        zi_values[i] = zc
-
-        # convergence unit
-        # this unit is responsible to keep the phase (zi) between -90° and 90°. 
-        # If it is not between a rotation of +90° or -90° is performed. 
-        if zi < -0.5:
-            zc = zi + 0.5 
-            xc = yi
-            yc = -xi
-        elif zi > 0.5:
-            zc = zi - 0.5
-            xc = -yi
-            yc = xi
-
-        # keep the values quantized
-        xc = vp_cordic_iterative.quantize_value(xc, lsb)
-        yc = vp_cordic_iterative.quantize_value(yc, lsb)
-        zc = vp_cordic_iterative.quantize_value(zc, lsb)
-
-        # store the values after the convergence unit
-        xc_values[i] = xc
-        yc_values[i] = yc
-        zc_values[i] = zc
-
-        # perform the cordic rotation
-        xo, yo, zo = vp_cordic_iterative.cordic(xc,yc,zc, angles_vector, shift_vector, iterations, sfixed_fract)
-        
-        # store the sin values
-        calc_values[i] = yo[iterations]
+    config = vp_cordic_iterative.get_cordic_config(sfixed_fract, iterations)
+    xi = fixed_point.wrap(config.amplitude_int - 1, sfixed_fract)
+    zi_values = _phase_accumulator(sfixed_fract, phase, n_samples, zi_start)
 
-    return calc_values, xc_values, yc_values, zc_values, xi_values, yi_values, zi_values
+    # convergence unit with the constant x input and y set to zero (see sin_gen_debug)
+    half = 1 << (sfixed_fract - 1)
+    below = zi_values < -half
+    above = zi_values > half
+    xc_values = np.where(below | above, 0, xi)
+    yc_values = fixed_point.wrap(np.select([below, above], [-xi, xi], 0), sfixed_fract)
+    zc_values = fixed_point.wrap(zi_values + half * below - half * above, sfixed_fract)
+
+    xo, yo, zo = vp_cordic_iterative.cordic_fixed(xc_values, yc_values, zc_values, config.angles_int, config.shift_vector, iterations, sfixed_fract)
+
+    # an empty chunk leaves the phase accumulator at its start value
+    if n_samples > 0:
+        zi_end = zi_values[..., -1]
+    else:
+        zi_end = np.broadcast_to(fixed_point.to_fixed(np.asarray(zi_start), sfixed_fract), zi_values.shape[:-1])
+    return fixed_point.to_float(yo[iterations], sfixed_fract), fixed_point.to_float(zi_end, sfixed_fract)
+
+
+def _phase_accumulator(sfixed_fract, phase, n_samples, zi_start):
+    """Calculates the integer codes of the phase accumulator for all samples
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float or np.array): phase difference between two samples of the sinus
+        n_samples (int): number of samples to generate
+        zi_start (float): value of the phase accumulator before the first sample
 
+    Returns:
+        np.array: codes of the phase accumulator after every sample, shape phase.shape + (n_samples,)
+    """
+    # phase accumulator as wrapped multiple of the phase
+    # the truncated phase is added, this is the same as truncating after each addition
+    # an additional axis lets a phase array broadcast over the samples
+    phase_int = fixed_point.to_fixed(np.asarray(phase), sfixed_fract)[..., np.newaxis]
+    zi_start_int = fixed_point.to_fixed(np.asarray(zi_start), sfixed_fract)[..., np.newaxis]
+    return fixed_point.wrap(zi_start_int + phase_int * np.arange(1, n_samples + 1, dtype=np.int64), sfixed_fract)
 
 
+def sin_gen_debug(sfixed_fract, phase, iterations, n_samples, zi_start=0):
+    """The function generates a sinus according to a given phase and returns additional values for debugging. 
+       The amplitude of the sinus is set as max value without an overflow.
+       All stages (phase accumulator, convergence unit and cordic) are calculated as arrays over all samples.
+       For a sweep the phase can be an array, the outputs have then the shape phase.shape + (n_samples,).
 
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float or np.array): phase difference between two samples of the sinus
+        iterations (int): number of iterations for the cordic algorithm
+        n_samples (int): number of samples to generate
+        zi_start (float): value of the phase accumulator before the first sample
+
+    Returns:
+        (np.array, np.array, np.array, np.array, np.array, np.array, np.array): sinus values, x value after convergence, y value after convergence, 
+                                                                                z value after convergence, x value before convergence, 
+                                                                                y value before convergence, z value before convergence
+    """
+    # get the needed tables for the cordic algorithm
+    config = vp_cordic_iterative.get_cordic_config(sfixed_fract, iterations)
+
+    # the maximum amplitude without overflow reduced by one lsb
+    xi = fixed_point.wrap(config.amplitude_int - 1, sfixed_fract)
+
+    # phase accumulator
+    zi_values = _phase_accumulator(sfixed_fract, phase, n_samples, zi_start)
+
+    # the values before the convergence unit
+    # x is the constant amplitude and y is set to zero to get a sinus output
+    xi_values = np.full(zi_values.shape, xi, dtype=np.int64)
+    yi_values = np.zeros(zi_values.shape, dtype=np.int64)
+
+    # convergence unit
+    # this unit is responsible to keep the phase (zi) between -90° and 90°. 
+    # If it is not between a rotation of +90° or -90° is performed. 
+    half = 1 << (sfixed_fract - 1)
+    below = zi_values < -half
+    above = zi_values > half
+    xc_values = np.select([below, above], [yi_values, -yi_values], xi_values)
+    yc_values = np.select([below, above], [-xi_values, xi_values], yi_values)
+    zc_values = np.select([below, above], [zi_values + half, zi_values - half], zi_values)
+
+    # keep the values quantized
+    xc_values = fixed_point.wrap(xc_values, sfixed_fract)
+    yc_values = fixed_point.wrap(yc_values, sfixed_fract)
+    zc_values = fixed_point.wrap(zc_values, sfixed_fract)
+
+    # perform the cordic rotation for all samples at once
+    xo, yo, zo = vp_cordic_iterative.cordic_fixed(xc_values, yc_values, zc_values, config.angles_int, config.shift_vector, iterations, sfixed_fract)
+    
+    # the sin values are the y outputs of the last iteration
+    calc_values = yo[iterations]
+
+    # convert the integer codes back to float values
+    calc_values = fixed_point.to_float(calc_values, sfixed_fract)
+    xc_values = fixed_point.to_float(xc_values, sfixed_fract)
+    yc_values = fixed_point.to_float(yc_values, sfixed_fract)
+    zc_values = fixed_point.to_float(zc_values, sfixed_fract)
+    xi_values = fixed_point.to_float(xi_values, sfixed_fract)
+    yi_values = fixed_point.to_float(yi_values, sfixed_fract)
+    zi_values = fixed_point.to_float(zi_values, sfixed_fract)
 
+    return calc_values, xc_values, yc_values, zc_values, xi_values, yi_values, zi_values
 
+def sin_gen_orbit(sfixed_fract, phase, iterations):
+    """The function creates the orbit of the sinus of sin_gen. The phase accumulator is the only state of the 
+       sin_generator, therefore one period of samples is enough to create any number of samples with orbit.samples.
 
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float): phase difference between two samples of the sinus
+        iterations (int): number of iterations for the cordic algorithm
 
+    Returns:
+        orbit.Orbit: transient and cycle of the sinus values
+    """
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
 
+    # the state is the value of the phase accumulator
+    def next_state(zi):
+        return fixed_point.wrap(zi + phase_int, sfixed_fract)
 
+    return orbit.generate_orbit(lambda n: sin_gen(sfixed_fract, phase, iterations, n), next_state, next_state(0))
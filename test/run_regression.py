@@ -0,0 +1,276 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This script runs the whole regression of the testbenches in parallel. Every makefile.* of the test folders
+# (and the Makefile of the tiny tapeout test) is a bench. Every bench gets its own build folder and results file,
+# therefore all benches can run at the same time on a process pool. At the end the results files are merged
+# into one report with the wall time of every bench. The verilog sources of a bench are only compiled if the
+# build cache (see sim_cache.py) has no build with the same inputs, so changes of the python testbenches
+# do not compile the design again.
+# Run with: python run_regression.py [-j JOBS] [-k FILTER] [--list] [--rebuild] [-o OUTPUT]
+
+# imports
+import argparse
+import itertools
+import os
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from sim_cache import cached_build, make_env, simulate_command
+
+# folder of the testbenches
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# values of the makefile variables (VARIABLE ?= default) that are swept by the regression
+SWEEP_VALUES = {
+    'SPI_MODE' : ['0', '1', '2', '3'],
+    'CLKS_PER_HALF_BIT' : ['2', '3'],
+}
+
+@dataclass(frozen=True)
+class Bench:
+    """Bench of the regression
+
+    Attributes:
+        name (str): unique name of the bench (folder/target and the swept variables)
+        directory (str): folder of the makefile
+        makefile (str): name of the makefile
+        variables (tuple): (name, value) pairs of the make variables of the bench
+    """
+    name: str
+    directory: str
+    makefile: str
+    variables: tuple = ()
+
+    @property
+    def build_dir(self):
+        """str: folder of the results, the log and the cached builds of the bench"""
+        return os.path.join(self.directory, 'sim_build', self.name.replace('/', '_'))
+
+    @property
+    def results_file(self):
+        """str: results file of the bench"""
+        return os.path.join(self.build_dir, 'results.xml')
+
+    @property
+    def log_file(self):
+        """str: log file with the output of make"""
+        return os.path.join(self.build_dir, 'make.log')
+
+@dataclass
+class BenchResult:
+    """Result of a bench
+
+    Attributes:
+        bench (Bench): bench that was run
+        returncode (int): return code of make
+        wall_time (float): wall time of the bench in seconds
+        testcases (list): testcase elements of the results file
+        cached (bool): true if the build was reused from the build cache
+    """
+    bench: Bench
+    returncode: int
+    wall_time: float
+    testcases: list = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def failures(self):
+        """int: number of failed testcases"""
+        return sum(1 for testcase in self.testcases if testcase.find('failure') is not None or testcase.find('error') is not None)
+
+    @property
+    def passed(self):
+        """bool: true if make succeeded, the results file was written and no testcase failed"""
+        return self.returncode == 0 and len(self.testcases) > 0 and self.failures == 0
+
+def swept_variables(makefile_path):
+    """Finds the variables of a makefile that are swept by the regression
+
+    Args:
+        makefile_path (str): path of the makefile
+
+    Returns:
+        list: names of the swept variables
+    """
+    with open(makefile_path) as file:
+        text = file.read()
+    return [name for name in SWEEP_VALUES if re.search(rf'^{name}\s*\?=', text, re.MULTILINE)]
+
+def discover(test_dir=TEST_DIR):
+    """Discovers all benches of the regression
+
+    Args:
+        test_dir (str, optional): folder of the testbenches. Defaults to TEST_DIR.
+
+    Returns:
+        list: all benches (Bench)
+    """
+    benches = []
+    makefiles = [(test_dir, 'Makefile', 'tt')]
+    for directory in sorted(os.listdir(test_dir)):
+        path = os.path.join(test_dir, directory)
+        if not os.path.isdir(path):
+            continue
+        for makefile in sorted(os.listdir(path)):
+            if makefile.startswith('makefile.'):
+                makefiles.append((path, makefile, f'{directory}/{makefile[len("makefile."):]}'))
+
+    for directory, makefile, name in makefiles:
+        names = swept_variables(os.path.join(directory, makefile))
+        for values in itertools.product(*[SWEEP_VALUES[n] for n in names]):
+            variables = tuple(zip(names, values))
+            suffix = ''.join(f'_{n}{v}' for n, v in variables)
+            benches.append(Bench(name + suffix, directory, makefile, variables))
+
+    return benches
+
+def run_bench(bench, rebuild=False):
+    """Runs a bench with its cached build (this function runs in a worker process of the pool)
+
+    Args:
+        bench (Bench): bench to run
+        rebuild (bool, optional): compile the verilog sources even if the build cache has a matching build. Defaults to False.
+
+    Returns:
+        (Bench, int, float, bool): bench, return code of make, wall time in seconds and true if the build was reused
+    """
+    # old results must not be read if the bench fails
+    os.makedirs(bench.build_dir, exist_ok=True)
+    if os.path.exists(bench.results_file):
+        os.remove(bench.results_file)
+
+    start = time.perf_counter()
+    with open(bench.log_file, 'w') as log:
+        try:
+            build_dir, cached = cached_build(bench.directory, bench.makefile, bench.variables, bench.build_dir, log, rebuild)
+        except subprocess.CalledProcessError as error:
+            log.write(f'reading the build inputs failed:\n{error.stderr}')
+            return bench, error.returncode, time.perf_counter() - start, False
+        if build_dir is None:
+            return bench, 1, time.perf_counter() - start, False
+
+        log.flush()
+        command = simulate_command(bench.makefile, bench.variables, build_dir, bench.results_file)
+        returncode = subprocess.run(command, cwd=bench.directory, env=make_env(bench.directory), stdout=log, stderr=subprocess.STDOUT).returncode
+    return bench, returncode, time.perf_counter() - start, cached
+
+def read_testcases(bench):
+    """Reads the testcases of the results file of a bench
+
+    Args:
+        bench (Bench): finished bench
+
+    Returns:
+        list: testcase elements, empty if the results file is missing or broken
+    """
+    try:
+        return ET.parse(bench.results_file).getroot().findall('.//testcase')
+    except (OSError, ET.ParseError):
+        return []
+
+def merge_results(results, output, wall_time):
+    """Merges the results files of all benches into one report, every bench is a testsuite
+
+    Args:
+        results (list): results of all benches (BenchResult)
+        output (str): path of the merged report
+        wall_time (float): wall time of the whole regression in seconds
+    """
+    root = ET.Element('testsuites', name='regression', time=f'{wall_time:.3f}')
+    for result in sorted(results, key=lambda r: r.bench.name):
+        suite = ET.SubElement(root, 'testsuite', name=result.bench.name, tests=str(max(len(result.testcases), 1)),
+                              failures=str(result.failures), errors=str(int(not result.testcases)), time=f'{result.wall_time:.3f}')
+        for testcase in result.testcases:
+            testcase.set('classname', f'{result.bench.name}.{testcase.get("classname", "")}')
+            suite.append(testcase)
+
+        # a bench without a results file is reported as error
+        if not result.testcases:
+            testcase = ET.SubElement(suite, 'testcase', name=result.bench.name, classname=result.bench.name, time=f'{result.wall_time:.3f}')
+            ET.SubElement(testcase, 'error', message=f'make exited with {result.returncode} without results, see {result.bench.log_file}')
+
+    ET.indent(root)
+    ET.ElementTree(root).write(output, encoding='utf-8', xml_declaration=True)
+
+def print_summary(results, wall_time):
+    """Prints the table with the results of all benches
+
+    Args:
+        results (list): results of all benches (BenchResult)
+        wall_time (float): wall time of the whole regression in seconds
+    """
+    width = max(len(result.bench.name) for result in results)
+    print(f'{"bench".ljust(width)} | status | tests | failures | build  | time [s]')
+    for result in sorted(results, key=lambda r: r.bench.name):
+        status = 'PASS' if result.passed else 'FAIL'
+        build = 'cached' if result.cached else 'new'
+        print(f'{result.bench.name.ljust(width)} | {status:^6} | {len(result.testcases):>5} | {result.failures:>8} | {build:<6} | {result.wall_time:>8.2f}')
+    print(f'regression wall time {wall_time:.2f} s, sum of the bench times {sum(r.wall_time for r in results):.2f} s')
+
+def run_regression(benches, jobs, output, rebuild=False):
+    """Runs all benches on a process pool and writes the merged report
+
+    Args:
+        benches (list): benches to run
+        jobs (int): number of parallel benches
+        output (str): path of the merged report
+        rebuild (bool, optional): compile all benches even if the build cache has matching builds. Defaults to False.
+
+    Returns:
+        list: results of all benches (BenchResult)
+    """
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_bench, bench, rebuild) for bench in benches]
+        for future in as_completed(futures):
+            bench, returncode, bench_time, cached = future.result()
+            result = BenchResult(bench, returncode, bench_time, read_testcases(bench), cached)
+            results.append(result)
+            print(f'{"PASS" if result.passed else "FAIL"} {bench.name} ({bench_time:.2f} s)', flush=True)
+    wall_time = time.perf_counter() - start
+
+    merge_results(results, output, wall_time)
+    print_summary(results, wall_time)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='runs all testbenches in parallel and merges the results')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of parallel benches (default: number of cores)')
+    parser.add_argument('-k', '--filter', default='', help='only run benches whose name contains this string')
+    parser.add_argument('-o', '--output', default=os.path.join(TEST_DIR, 'regression_results.xml'), help='path of the merged report')
+    parser.add_argument('--list', action='store_true', help='only list the benches')
+    parser.add_argument('--rebuild', action='store_true', help='compile all benches even if the build cache has matching builds')
+    args = parser.parse_args()
+
+    benches = [bench for bench in discover() if args.filter in bench.name]
+    if args.list:
+        for bench in benches:
+            print(bench.name)
+        return 0
+    if not benches:
+        print(f'no bench matches "{args.filter}"')
+        return 1
+
+    results = run_regression(benches, args.jobs, args.output, args.rebuild)
+    return 0 if all(result.passed for result in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This module is the build cache of the regression. The key of a build is a hash of the inputs of the verilog
+# compilation: the content of the VERILOG_SOURCES and of the verilog files in the include folders, the
+# COMPILE_ARGS (with the parameters), the toplevel and the timescale. A build with the same key is reused without
+# calling the compiler, a stale build is removed and a new one is built under a lock. A build is only used
+# after its stamp file is written, therefore a broken or half written build is never simulated.
+
+# imports
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from contextlib import contextmanager
+
+# makefile that prints the build inputs of a bench
+BUILD_VARS_MAKEFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build_vars.mk')
+
+# placeholder for SIM_BUILD when the build inputs are read, the key must not depend on the build folder
+SIM_BUILD_PLACEHOLDER = '@SIM_BUILD@'
+
+# name of the stamp file of a complete build
+STAMP_FILE = 'cache_key.json'
+
+# file extensions of verilog files in the include folders
+VERILOG_EXTENSIONS = ('.v', '.vh', '.sv', '.svh')
+
+def make_variables(variables):
+    """Creates the make arguments of the variables of a bench
+
+    Args:
+        variables (tuple): (name, value) pairs of make variables
+
+    Returns:
+        list: make arguments
+    """
+    return [f'{name}={value}' for name, value in variables]
+
+def make_env(directory):
+    """Creates the environment of a make call, the makefiles find the sources relative to $(PWD)
+
+    Args:
+        directory (str): folder of the makefile
+
+    Returns:
+        dict: environment with PWD set to the folder of the makefile
+    """
+    return dict(os.environ, PWD=os.path.abspath(directory))
+
+def read_build_vars(directory, makefile, variables=()):
+    """Reads the inputs of the verilog compilation from the makefile of a bench
+
+    Args:
+        directory (str): folder of the makefile
+        makefile (str): name of the makefile
+        variables (tuple, optional): (name, value) pairs of make variables of the bench. Defaults to ().
+
+    Returns:
+        dict: build inputs (SIM, TOPLEVEL, VERILOG_SOURCES, COMPILE_ARGS, ...)
+    """
+    command = ['make', '-s', '-f', makefile, '-f', BUILD_VARS_MAKEFILE, f'SIM_BUILD={SIM_BUILD_PLACEHOLDER}']
+    command += make_variables(variables) + ['print_build_vars']
+    output = subprocess.run(command, cwd=directory, env=make_env(directory), capture_output=True, text=True, check=True).stdout
+
+    build_vars = {}
+    for line in output.splitlines():
+        name, sep, value = line.partition('=')
+        if sep:
+            build_vars[name] = ' '.join(value.split())
+    return build_vars
+
+def hash_file(digest, path):
+    """Adds the path and the content of a file to a hash
+
+    Args:
+        digest : hash object
+        path (str): path of the file
+    """
+    digest.update(path.encode())
+    with open(path, 'rb') as file:
+        digest.update(file.read())
+
+def cache_key(build_vars, directory):
+    """Calculates the key of a build
+
+    Args:
+        build_vars (dict): build inputs of the bench (see read_build_vars)
+        directory (str): folder of the makefile, relative paths of the build inputs are relative to it
+
+    Returns:
+        str: key of the build
+    """
+    digest = hashlib.sha256(json.dumps(build_vars, sort_keys=True).encode())
+
+    # content of the verilog sources, files in the build folder (e.g. the dump module of cocotb) are created by the build itself
+    for source in build_vars.get('VERILOG_SOURCES', '').split():
+        path = os.path.join(directory, source)
+        if SIM_BUILD_PLACEHOLDER not in source and os.path.isfile(path):
+            hash_file(digest, path)
+
+    # content of all verilog files in the include folders (files that are included with `include)
+    include_dirs = [arg[2:] for arg in build_vars.get('COMPILE_ARGS', '').split() if arg.startswith('-I')]
+    for include_dir in sorted(set(include_dirs)):
+        path = os.path.join(directory, include_dir)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(VERILOG_EXTENSIONS):
+                    hash_file(digest, os.path.join(path, name))
+
+    return digest.hexdigest()[:16]
+
+@contextmanager
+def locked(path):
+    """Holds a exclusive file lock, so only one process builds a image at a time
+
+    Args:
+        path (str): path of the lock file
+    """
+    with open(path, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def is_complete(build_dir, key):
+    """Checks if a build folder holds a complete build with the key
+
+    Args:
+        build_dir (str): build folder
+        key (str): key of the build
+
+    Returns:
+        bool: true if the build can be used
+    """
+    try:
+        with open(os.path.join(build_dir, STAMP_FILE)) as file:
+            return json.load(file)['key'] == key
+    except (OSError, ValueError, KeyError):
+        return False
+
+def image_path(build_dir):
+    """Returns the path of the elaborated image in a build folder (icarus)
+
+    Args:
+        build_dir (str): build folder
+
+    Returns:
+        str: path of the image
+    """
+    return os.path.join(build_dir, 'sim.vvp')
+
+def cached_build(directory, makefile, variables, cache_root, log, rebuild=False):
+    """Returns the build folder of a bench, the verilog sources are only compiled if no matching build exists
+
+    Args:
+        directory (str): folder of the makefile
+        makefile (str): name of the makefile
+        variables (tuple): (name, value) pairs of make variables of the bench
+        cache_root (str): folder of the cached builds of the bench
+        log : file that gets the output of make
+        rebuild (bool, optional): build a new image even if a matching build exists. Defaults to False.
+
+    Returns:
+        (str, bool): build folder (None if the build failed), true if the build was reused
+    """
+    build_vars = read_build_vars(directory, makefile, variables)
+    key = cache_key(build_vars, directory)
+    build_dir = os.path.join(cache_root, key)
+    os.makedirs(cache_root, exist_ok=True)
+
+    with locked(os.path.join(cache_root, '.lock')):
+        if not rebuild and is_complete(build_dir, key):
+            return build_dir, True
+
+        # remove the stale builds of the bench and a broken build with the same key
+        for name in os.listdir(cache_root):
+            path = os.path.join(cache_root, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+        os.makedirs(build_dir)
+
+        # only compile the image
+        command = ['make', '-f', makefile, f'SIM_BUILD={build_dir}'] + make_variables(variables) + [image_path(build_dir)]
+        if subprocess.run(command, cwd=directory, env=make_env(directory), stdout=log, stderr=subprocess.STDOUT).returncode != 0:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return None, False
+
+        # the stamp is written last and atomically, it marks the build as complete
+        stamp = os.path.join(build_dir, STAMP_FILE)
+        with open(stamp + '.tmp', 'w') as file:
+            json.dump({'key' : key, 'build_vars' : build_vars}, file, indent=2)
+        os.replace(stamp + '.tmp', stamp)
+
+    return build_dir, False
+
+def simulate_command(makefile, variables, build_dir, results_file):
+    """Creates the make call that runs the simulation of a cached build without compiling it again
+
+    Args:
+        makefile (str): name of the makefile
+        variables (tuple): (name, value) pairs of make variables of the bench
+        build_dir (str): build folder of the cached build
+        results_file (str): path of the results file
+
+    Returns:
+        list: command line of make
+    """
+    # -o marks the image as up to date, so make never calls the compiler. make does not pass -o to a sub make,
+    # therefore the results file is the goal instead of the sim target (sim calls make again for the results file)
+    return ['make', '-f', makefile, f'SIM_BUILD={build_dir}', f'COCOTB_RESULTS_FILE={results_file}',
+            '-o', image_path(build_dir)] + make_variables(variables) + [results_file]
@@ -0,0 +1,111 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# imports
+import os
+import numpy as np
+import cocotb
+from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.clock import Clock
+from harness import reset_dut, unsigned2bin, SpiMonitor, record_trace, drive_loads, compare_traces
+import vp_spi_master
+
+# spi mode and clock divider of the dut, set by the makefile
+SPI_MODE = int(os.environ.get('SPI_MODE', 0))
+CLKS_PER_HALF_BIT = int(os.environ.get('CLKS_PER_HALF_BIT', 2))
+
+@cocotb.test()
+async def test_spi_master_only_tx(dut):
+    """test the spi_master_only_tx module in the configured spi mode if it produces the right serial transmission
+
+    Args:
+        dut : spi_master_only_tx module
+    """
+    # generate values for testing
+    samples = list(range(16))
+    samples.extend([128, 255, 128, 255, 0, 85, 170])
+
+    # init values for the dut
+    dut.data_in_valid_strobe_i.value = 0
+    dut.data_i.value = unsigned2bin(0, 8)
+
+    # start the clock
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+
+    # reset the dut
+    await reset_dut(dut.rst_i, 20)
+
+    # the master has no cs line, therefore the monitor frames the transmission after 8 bits
+    monitor = SpiMonitor(dut.spi_clk_o, dut.spi_mosi_o, spi_mode=SPI_MODE).start()
+
+    await ClockCycles(dut.clk_i, 1)
+
+    # check the generated samples
+    for n in samples:
+        # load the sample, the master reads the data input during the whole transmission
+        dut.data_in_valid_strobe_i.value = 1
+        dut.data_i.value = unsigned2bin(n, 8)
+        await ClockCycles(dut.clk_i, 1)
+        dut.data_in_valid_strobe_i.value = 0
+
+        # check the serial data transmission
+        frame = await monitor.frames.get()
+        assert frame.value == n
+
+        # wait for the end of the transmission
+        if dut.tx_ready_o.value != 1:
+            await RisingEdge(dut.tx_ready_o)
+        await ClockCycles(dut.clk_i, 8)
+
+    monitor.stop()
+
+    dut._log.info(f'Test of spi mode {SPI_MODE} finished')
+
+@cocotb.test()
+async def test_spi_master_only_tx_trace(dut):
+    """test all outputs of the spi_master_only_tx module in every clock cycle against the virtual prototype,
+       the bytes are loaded with random distances down to the minimum distance of the master
+
+    Args:
+        dut : spi_master_only_tx module
+    """
+    # bytes and load cycles
+    rng = np.random.default_rng(SPI_MODE)
+    data = [0, 255, 128, 1, 85, 170] + list(rng.integers(0, 256, 26))
+    distance = vp_spi_master.min_load_distance(CLKS_PER_HALF_BIT)
+    load_cycles = 2 + np.cumsum(np.concatenate([[0], distance + rng.integers(0, 4, len(data) - 1)]))
+    n_cycles = int(load_cycles[-1]) + distance + 8
+
+    # init values for the dut
+    dut.data_in_valid_strobe_i.value = 0
+    dut.data_i.value = unsigned2bin(0, 8)
+
+    # start the clock
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+
+    # reset the dut, after one edge the master is idle (reference edge of the virtual prototype)
+    await reset_dut(dut.rst_i, 20)
+    await ClockCycles(dut.clk_i, 1)
+
+    # record the outputs while the bytes are loaded
+    cocotb.start_soon(drive_loads(dut.clk_i, dut.data_in_valid_strobe_i, dut.data_i, load_cycles, data))
+    signals = {'spi_clk': dut.spi_clk_o, 'spi_mosi': dut.spi_mosi_o, 'tx_ready': dut.tx_ready_o}
+    trace = await record_trace(dut.clk_i, signals, n_cycles)
+
+    # compare all cycles at once
+    spi_clk, spi_mosi, tx_ready = vp_spi_master.spi_master_only_tx(data, load_cycles, n_cycles, SPI_MODE, CLKS_PER_HALF_BIT)
+    mismatches = compare_traces(trace, {'spi_clk': spi_clk, 'spi_mosi': spi_mosi, 'tx_ready': tx_ready})
+    assert not mismatches, '\n'.join(mismatches)
+
+    dut._log.info(f'Trace of spi mode {SPI_MODE} with {CLKS_PER_HALF_BIT} clocks per half bit checked ({n_cycles} cycles)')
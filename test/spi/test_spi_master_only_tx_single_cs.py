@@ -13,10 +13,17 @@
 # limitations under the License.
 
 # imports
+import os
+import numpy as np
 import cocotb
-from cocotb.triggers import FallingEdge, ClockCycles, RisingEdge, Join, First
+from cocotb.triggers import ClockCycles
 from cocotb.clock import Clock
-from test_helper import reset_dut, unsigned2bin
+from harness import reset_dut, unsigned2bin, SpiMonitor, record_trace, drive_loads, compare_traces
+import vp_spi_master
+
+# spi mode and clock divider of the dut, set by the makefile
+SPI_MODE = int(os.environ.get('SPI_MODE', 0))
+CLKS_PER_HALF_BIT = int(os.environ.get('CLKS_PER_HALF_BIT', 2))
 
 @cocotb.test()
 async def test_spi_master_only_tx_single_cs(dut):
@@ -40,6 +47,9 @@ async def test_spi_master_only_tx_single_cs(dut):
     # reset the dut
     await reset_dut(dut.rst_i, 20)
 
+    # the spi monitor receives the serial transmissions in the background
+    monitor = SpiMonitor(dut.spi_clk_o, dut.spi_mosi_o, dut.spi_cs_o, SPI_MODE).start()
+
     await ClockCycles(dut.clk_i, 1)
 
     # check the generated samples
@@ -50,25 +60,53 @@ async def test_spi_master_only_tx_single_cs(dut):
         await ClockCycles(dut.clk_i, 1)
         dut.data_in_valid_strobe_i.value = 0
 
-        # wait for the falling cs line
-        await FallingEdge(dut.spi_cs_o)
+        # wait for the end of the transmission (rising cs line)
+        frame = await monitor.frames.get()
+
+        # check if the cs line does stay in the low state
+        assert frame.complete, f'spi_cs_o glitch in the transmission of {n} at {frame.end_time} ns'
         # check the serial data transmission
-        sample_str = unsigned2bin(n, 8)
-        for i in range(8):
-            # check if the cs line does stay in the low state
-            t1 = RisingEdge(dut.spi_clk_o)
-            t2 = RisingEdge(dut.spi_cs_o)
-            t_ret = await First(t1, t2)
-            if t_ret is t2:
-                assert False
-            # check the current serial output
-            assert dut.spi_mosi_o == sample_str[i]
-            assert dut.spi_cs_o == 0
-
-        # wait for the rising cs line to indicate the end of the transmission
-        await RisingEdge(dut.spi_cs_o)
+        assert frame.value == n
+
         await ClockCycles(dut.clk_i, 8)
 
+    monitor.stop()
     dut._log.info('Test finished')
 
+@cocotb.test()
+async def test_spi_master_only_tx_single_cs_trace(dut):
+    """test all outputs of the spi_master_only_tx_single_cs module in every clock cycle against the virtual
+       prototype, the bytes are loaded with random distances down to the minimum distance of the cs state machine
+
+    Args:
+        dut : spi_master_only_tx_single_cs module
+    """
+    # bytes and load cycles
+    rng = np.random.default_rng(SPI_MODE)
+    data = [0, 255, 128, 1, 85, 170] + list(rng.integers(0, 256, 26))
+    distance = vp_spi_master.min_load_distance(CLKS_PER_HALF_BIT, single_cs=True)
+    load_cycles = 2 + np.cumsum(np.concatenate([[0], distance + rng.integers(0, 4, len(data) - 1)]))
+    n_cycles = int(load_cycles[-1]) + distance + 8
+
+    # init values for the dut
+    dut.data_in_valid_strobe_i.value = 0
+    dut.data_i.value = unsigned2bin(0, 8)
+
+    # start the clock
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+
+    # reset the dut, after one edge the master is idle (reference edge of the virtual prototype)
+    await reset_dut(dut.rst_i, 20)
+    await ClockCycles(dut.clk_i, 1)
+
+    # record the outputs while the bytes are loaded
+    cocotb.start_soon(drive_loads(dut.clk_i, dut.data_in_valid_strobe_i, dut.data_i, load_cycles, data))
+    signals = {'spi_clk': dut.spi_clk_o, 'spi_mosi': dut.spi_mosi_o, 'spi_cs': dut.spi_cs_o}
+    trace = await record_trace(dut.clk_i, signals, n_cycles)
+
+    # compare all cycles at once
+    spi_clk, spi_mosi, spi_cs = vp_spi_master.spi_master_only_tx_single_cs(data, load_cycles, n_cycles, SPI_MODE, CLKS_PER_HALF_BIT)
+    mismatches = compare_traces(trace, {'spi_clk': spi_clk, 'spi_mosi': spi_mosi, 'spi_cs': spi_cs})
+    assert not mismatches, '\n'.join(mismatches)
 
+    dut._log.info(f'Trace of spi mode {SPI_MODE} with {CLKS_PER_HALF_BIT} clocks per half bit checked ({n_cycles} cycles)')
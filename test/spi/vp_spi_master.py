@@ -0,0 +1,175 @@
+# Copyright 2024 Michael Mayr
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE−2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Cycle accurate virtual prototype of spi_master_only_tx and spi_master_only_tx_single_cs for all spi modes and
+# clock dividers. The outputs are generated in bulk as arrays that are indexed by the clock cycle: index t is the
+# value of an output after the rising clock edge t. Edge 0 is a reference edge where the master is idle, a byte
+# is loaded at edge L if data_in_valid_strobe_i is high at this edge, data_i holds the byte until the next load.
+#
+# One transfer after a load at edge L (c = CLKS_PER_HALF_BIT):
+#   spi clock:  the spi clock register toggles at the edges L + m*c (m = 1..16), spi_clk_o is delayed by one edge
+#   mosi:       bit j (msb first) is set at the edge L + 1 + (2j + cpha)*c, the last bit is held until the
+#               edge L + 16c + 2 where the master is idle again and mosi is cleared
+#   tx_ready:   low from the edge L to the edge L + 16c + 1
+#   cs:         low from the edge L to the edge L + 16c + 2, afterwards the cs state machine waits
+#               CS_INACTIVE_CLKS + 2 edges until it accepts the next byte
+
+# imports
+import numpy as np
+
+# number of bits per transfer
+N_BITS = 8
+
+# number of spi clock edges per transfer
+SPI_CLK_EDGES = 2 * N_BITS
+
+def spi_mode_bits(spi_mode):
+    """Returns the clock polarity and the clock phase of a spi mode
+
+    Args:
+        spi_mode (int): spi mode (0 to 3)
+
+    Raises:
+        ValueError: unknown spi mode
+
+    Returns:
+        (int, int): clock polarity (cpol), clock phase (cpha)
+    """
+    if spi_mode not in (0, 1, 2, 3):
+        raise ValueError(f'unknown spi mode {spi_mode}')
+    return spi_mode >> 1, spi_mode & 1
+
+def transfer_clks(clks_per_half_bit):
+    """Number of clock cycles from the load of a byte until the master is idle again (tx_ready high)
+
+    Args:
+        clks_per_half_bit (int): clock cycles per half bit of the spi clock
+
+    Returns:
+        int: clock cycles of one transfer
+    """
+    return SPI_CLK_EDGES * clks_per_half_bit + 1
+
+def min_load_distance(clks_per_half_bit, single_cs=False, cs_inactive_clks=1):
+    """Minimum number of clock cycles between two loads, a byte that is loaded earlier interrupts the
+       transfer of the master or is ignored by the cs state machine
+
+    Args:
+        clks_per_half_bit (int): clock cycles per half bit of the spi clock
+        single_cs (bool, optional): if true the distance of spi_master_only_tx_single_cs. Defaults to False.
+        cs_inactive_clks (int, optional): CS_INACTIVE_CLKS of spi_master_only_tx_single_cs. Defaults to 1.
+
+    Returns:
+        int: minimum distance of two load edges
+    """
+    if single_cs:
+        # cs rises one edge after tx_ready, then CS_INACTIVE and IDLE are passed
+        return transfer_clks(clks_per_half_bit) + cs_inactive_clks + 3
+    return transfer_clks(clks_per_half_bit) + 1
+
+def transfer_offsets(load_cycles, n_cycles, min_distance):
+    """Assigns every clock cycle to the last load before it
+
+    Args:
+        load_cycles (np.array): edges where a byte is loaded (increasing, at least edge 1)
+        n_cycles (int): number of clock cycles
+        min_distance (int): minimum distance of two loads
+
+    Raises:
+        ValueError: the loads are not increasing or too close together
+
+    Returns:
+        (np.array, np.array): index of the last load of every cycle (-1 before the first load),
+                              clock cycles since the last load (-1 before the first load)
+    """
+    load_cycles = np.asarray(load_cycles, dtype=np.int64)
+    if load_cycles.size and load_cycles[0] < 1:
+        raise ValueError('the first byte must be loaded after the reference edge')
+    if np.any(np.diff(load_cycles) < min_distance):
+        raise ValueError(f'the loads must be at least {min_distance} clock cycles apart')
+
+    cycles = np.arange(n_cycles)
+    if load_cycles.size == 0:
+        return np.full(n_cycles, -1), np.full(n_cycles, -1)
+    index = np.searchsorted(load_cycles, cycles, side='right') - 1
+    offset = np.where(index >= 0, cycles - load_cycles[np.maximum(index, 0)], -1)
+    return index, offset
+
+def spi_outputs(data, index, offset, spi_mode, clks_per_half_bit):
+    """Calculates spi_clk_o and spi_mosi_o of the master from the offsets of the cycles to their load
+
+    Args:
+        data (np.array): loaded bytes
+        index (np.array): index of the last load of every cycle
+        offset (np.array): clock cycles since the last load
+        spi_mode (int): spi mode (0 to 3)
+        clks_per_half_bit (int): clock cycles per half bit of the spi clock
+
+    Returns:
+        (np.array, np.array): spi_clk_o, spi_mosi_o
+    """
+    cpol, cpha = spi_mode_bits(spi_mode)
+    c = clks_per_half_bit
+    busy = offset >= 0
+
+    # number of toggles of the delayed spi clock, after the last toggle the clock is back at the idle level
+    toggles = np.clip((offset - 1) // c, 0, SPI_CLK_EDGES)
+    spi_clk = np.where(busy, cpol ^ (toggles & 1), cpol)
+
+    # the bit counter decrements every spi clock period, the last bit is held until the master is idle
+    bit = np.clip((offset - 1 - cpha * c) // (2 * c), 0, N_BITS - 1)
+    # the value of the cycles before the first load is not used
+    value = np.append(np.asarray(data, dtype=np.int64), 0)[index]
+    sending = busy & (offset >= 1 + cpha * c) & (offset < transfer_clks(c) + 1)
+    spi_mosi = np.where(sending, (value >> (N_BITS - 1 - bit)) & 1, 0)
+
+    return spi_clk.astype(np.uint8), spi_mosi.astype(np.uint8)
+
+def spi_master_only_tx(data, load_cycles, n_cycles, spi_mode=0, clks_per_half_bit=2):
+    """Generates the outputs of spi_master_only_tx for a sequence of bytes
+
+    Args:
+        data (list[int] or np.array): bytes to transmit (unsigned)
+        load_cycles (list[int] or np.array): edges where the bytes are loaded (data_in_valid_strobe_i high)
+        n_cycles (int): number of clock cycles to generate
+        spi_mode (int, optional): spi mode (0 to 3). Defaults to 0.
+        clks_per_half_bit (int, optional): clock cycles per half bit of the spi clock. Defaults to 2.
+
+    Returns:
+        (np.array, np.array, np.array): spi_clk_o, spi_mosi_o, tx_ready_o indexed by the clock cycle
+    """
+    index, offset = transfer_offsets(load_cycles, n_cycles, min_load_distance(clks_per_half_bit))
+    spi_clk, spi_mosi = spi_outputs(data, index, offset, spi_mode, clks_per_half_bit)
+    tx_ready = ~((offset >= 0) & (offset < transfer_clks(clks_per_half_bit))) & 1
+    return spi_clk, spi_mosi, tx_ready.astype(np.uint8)
+
+def spi_master_only_tx_single_cs(data, load_cycles, n_cycles, spi_mode=0, clks_per_half_bit=2, cs_inactive_clks=1):
+    """Generates the outputs of spi_master_only_tx_single_cs for a sequence of bytes
+
+    Args:
+        data (list[int] or np.array): bytes to transmit (unsigned)
+        load_cycles (list[int] or np.array): edges where the bytes are loaded (data_in_valid_strobe_i high)
+        n_cycles (int): number of clock cycles to generate
+        spi_mode (int, optional): spi mode (0 to 3). Defaults to 0.
+        clks_per_half_bit (int, optional): clock cycles per half bit of the spi clock. Defaults to 2.
+        cs_inactive_clks (int, optional): CS_INACTIVE_CLKS of the module. Defaults to 1.
+
+    Returns:
+        (np.array, np.array, np.array): spi_clk_o, spi_mosi_o, spi_cs_o indexed by the clock cycle
+    """
+    distance = min_load_distance(clks_per_half_bit, True, cs_inactive_clks)
+    index, offset = transfer_offsets(load_cycles, n_cycles, distance)
+    spi_clk, spi_mosi = spi_outputs(data, index, offset, spi_mode, clks_per_half_bit)
+    spi_cs = ~((offset >= 0) & (offset < transfer_clks(clks_per_half_bit) + 1)) & 1
+    return spi_clk, spi_mosi, spi_cs.astype(np.uint8)
@@ -14,7 +14,7 @@
 
 # imports
 import cocotb
-from test_helper import reset_dut
+from harness import reset_dut
 from cocotb.triggers import ClockCycles, RisingEdge
 from cocotb.clock import Clock
 
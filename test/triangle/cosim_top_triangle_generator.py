@@ -15,9 +15,10 @@
 # imports
 import cocotb
 import numpy as np
+import fixed_point
 import vp_triangle
 import vp_square_puls
-from test_helper import reset_dut, frac2bin
+from harness import reset_dut, frac2bin, frac2bin_array, Scoreboard
 from cocotb.triggers import FallingEdge, RisingEdge
 from cocotb.clock import Clock
 
@@ -40,8 +41,8 @@ async def cosim_top_triangle_generator_sawtooth_part(dut):
     amplitude = 1 - 40 * lsb
 
     # quantize the values
-    phase_quantized = vp_triangle.quantize_value(PHASE, lsb)
-    amplitude_quantized = vp_triangle.quantize_value(amplitude, lsb)
+    phase_quantized = fixed_point.quantize_value(PHASE, lsb)
+    amplitude_quantized = fixed_point.quantize_value(amplitude, lsb)
 
     # run the virtual prototype
     calc_values = vp_triangle.sawtooth(Q, phase_quantized, amplitude_quantized, NUMBER_OF_SAMPLES)
@@ -61,6 +62,9 @@ async def cosim_top_triangle_generator_sawtooth_part(dut):
     if DEBUG:
         dut._log.info(f'#{0:>03} -> {"dut".center(8)} | {"python".center(8)}')
     
+    # convert the virtual prototype values once into the register codes of the output
+    scoreboard = Scoreboard('data_sawtooth_o', frac2bin_array(calc_values, Q, binstr=False), Q)
+
     # check the verilog implementation against the virtual prototype
     for i in range(NUMBER_OF_SAMPLES):
         # request the next sample
@@ -72,11 +76,10 @@ async def cosim_top_triangle_generator_sawtooth_part(dut):
         dut.get_next_data_strobe_i.value = 0
 
         if DEBUG:
-            if dut.data_sawtooth_o.value.binstr != frac2bin(calc_values[i], Q).binstr:
-                dut._log.info(f'#{i:>03} -> {dut.data_sawtooth_o.value.binstr} | {frac2bin(calc_values[i], Q).binstr}')
+            dut._log.info(f'#{i:>03} -> {dut.data_sawtooth_o.value.binstr} | {scoreboard.expected_binstr(i)}')
 
         # check the output sample against the virtual prototype
-        assert dut.data_sawtooth_o.value.binstr == frac2bin(calc_values[i], Q).binstr
+        scoreboard.check(dut.data_sawtooth_o.value)
 
         await FallingEdge(dut.clk_i)
     
@@ -100,8 +103,8 @@ async def cosim_top_triangle_generator_triangle_part(dut):
     amplitude = 1 - 40 * lsb
 
     # quantize the values
-    phase_quantized = vp_triangle.quantize_value(PHASE, lsb)
-    amplitude_quantized = vp_triangle.quantize_value(amplitude, lsb)
+    phase_quantized = fixed_point.quantize_value(PHASE, lsb)
+    amplitude_quantized = fixed_point.quantize_value(amplitude, lsb)
 
     # run the virtual prototype
     calc_values = vp_triangle.triangle(Q, phase_quantized, amplitude_quantized, NUMBER_OF_SAMPLES)
@@ -121,6 +124,9 @@ async def cosim_top_triangle_generator_triangle_part(dut):
     if DEBUG:
         dut._log.info(f'#{0:>03} -> {"dut".center(8)} | {"python".center(8)}')
     
+    # convert the virtual prototype values once into the register codes of the output
+    scoreboard = Scoreboard('data_triangle_o', frac2bin_array(calc_values, Q, binstr=False), Q)
+
     # check the verilog implementation against the virtual prototype
     for i in range(NUMBER_OF_SAMPLES):
         # request the next sample
@@ -133,11 +139,10 @@ async def cosim_top_triangle_generator_triangle_part(dut):
         await RisingEdge(dut.data_triangle_out_valid_strobe_o)
 
         if DEBUG:
-            if dut.data_triangle_o.value.binstr != frac2bin(calc_values[i], Q).binstr:
-                dut._log.info(f'#{i:>03} -> {dut.data_triangle_o.value.binstr} | {frac2bin(calc_values[i], Q).binstr}')
+            dut._log.info(f'#{i:>03} -> {dut.data_triangle_o.value.binstr} | {scoreboard.expected_binstr(i)}')
 
         # check the output sample against the virtual prototype
-        assert dut.data_triangle_o.value.binstr == frac2bin(calc_values[i], Q).binstr
+        scoreboard.check(dut.data_triangle_o.value)
    
     
     dut._log.info('Test finished')
@@ -158,8 +163,8 @@ async def cosim_top_triangle_generator_square_puls_part(dut):
 
     # quantize the values
     lsb = 2**(-Q)
-    phase_quantized = vp_square_puls.quantize_value(PHASE, lsb)
-    threshold_quantized = vp_square_puls.quantize_value(THRESHOLD, lsb)
+    phase_quantized = fixed_point.quantize_value(PHASE, lsb)
+    threshold_quantized = fixed_point.quantize_value(THRESHOLD, lsb)
 
     # run the virtual prototype
     calc_values = vp_square_puls.square_puls(Q, phase_quantized, threshold_quantized, NUMBER_OF_SAMPLES)
@@ -179,6 +184,9 @@ async def cosim_top_triangle_generator_square_puls_part(dut):
     if DEBUG:
         dut._log.info(f'#{0:>03} -> {"dut".center(8)} | {"python".center(8)}')
     
+    # convert the virtual prototype values once into the register codes of the output
+    scoreboard = Scoreboard('data_square_puls_o', frac2bin_array(calc_values, Q, binstr=False), Q)
+
     # check the verilog implementation against the virtual prototype
     for i in range(NUMBER_OF_SAMPLES):
         # request the next sample
@@ -191,11 +199,10 @@ async def cosim_top_triangle_generator_square_puls_part(dut):
         await RisingEdge(dut.data_square_puls_out_valid_strobe_o)
 
         if DEBUG:
-            if dut.data_square_puls_o.value.binstr != frac2bin(calc_values[i], Q).binstr:
-                dut._log.info(f'#{i:>03} -> {dut.data_square_puls_o.value.binstr} | {frac2bin(calc_values[i], Q).binstr}')
+            dut._log.info(f'#{i:>03} -> {dut.data_square_puls_o.value.binstr} | {scoreboard.expected_binstr(i)}')
 
         # check the output sample against the virtual prototype
-        assert dut.data_square_puls_o.value.binstr == frac2bin(calc_values[i], Q).binstr
+        scoreboard.check(dut.data_square_puls_o.value)
    
     
     dut._log.info('Test finished')
\ No newline at end of file
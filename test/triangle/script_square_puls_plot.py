@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# This script to generates a test plot of a generated square puls sequence with a quantized python square puls generator
+# This script to generates a test plot of a generated square puls sequence with a quantized python square puls generator.
+# Without a display or with --output the figure is written as png or svg file (see common/plot_render.py)
 
 # import 
 import numpy as np
 import vp_square_puls
-import matplotlib.pyplot as plt
+import plot_render
 
 # configuration values
 Q = 7
@@ -25,15 +26,18 @@ NUMBER_OF_SAMPLES = 300
 PHASE = 0.01
 THRESHOLD = 0.2
 
+args = plot_render.parse_args('plots the square puls signal', NUMBER_OF_SAMPLES)
+plt = plot_render.pyplot(args.output)
+
 # create the data of the square puls sequence
-data_sq = vp_square_puls.square_puls(Q, PHASE, THRESHOLD, NUMBER_OF_SAMPLES)
+data_sq = vp_square_puls.square_puls(Q, PHASE, THRESHOLD, args.samples)
 
-x = np.arange(NUMBER_OF_SAMPLES)
+x = np.arange(args.samples)
 
-# create the figure of the square puls
+# create the figure of the square puls, long signals are decimated to the envelope per pixel
 plt.figure()
 plt.title('Quantized square puls signal')
 plt.xlabel('N')
 plt.ylabel('y')
-plt.plot(x, data_sq)
-plt.show()
\ No newline at end of file
+plot_render.plot(plt.gca(), x, data_sq)
+plot_render.finish(plt, ['square_puls'], args.output, args.format)
@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# This script to generates a test plot of a generated triangle and sawtooth signal with a quantized python triangle generator
+# This script to generates a test plot of a generated triangle and sawtooth signal with a quantized python triangle generator.
+# Without a display or with --output the figures are written as png or svg files (see common/plot_render.py)
 
 # import 
 import numpy as np
 import vp_triangle
-import matplotlib.pyplot as plt
+import plot_render
 
 # configuration values
 Q = 7
@@ -25,30 +26,33 @@ NUMBER_OF_SAMPLES = 300
 PHASE = 0.01
 AMP_LSB_MULTI = 40
 
+args = plot_render.parse_args('plots the triangle and the sawtooth signal', NUMBER_OF_SAMPLES)
+plt = plot_render.pyplot(args.output)
+
 # define amplitude with the lsb value
 lsb = 2**(-Q)
 amplitude = 1 - AMP_LSB_MULTI * lsb
 
 # generate the sawtooth signal 
-data_saw = vp_triangle.sawtooth(Q, PHASE, amplitude, NUMBER_OF_SAMPLES)
+data_saw = vp_triangle.sawtooth(Q, PHASE, amplitude, args.samples)
 # generate the triangle signal
-data_tri = vp_triangle.triangle(Q, PHASE, amplitude, NUMBER_OF_SAMPLES)
+data_tri = vp_triangle.triangle(Q, PHASE, amplitude, args.samples)
 
-x = np.arange(NUMBER_OF_SAMPLES)
+x = np.arange(args.samples)
 
-# create the figure of the square puls
+# create the figure of the triangle, long signals are decimated to the envelope per pixel
 plt.figure()
 plt.title('Quantized triangle signal')
 plt.xlabel('N')
 plt.ylabel('y')
-plt.plot(x, data_tri, label='triangle data')
+plot_render.plot(plt.gca(), x, data_tri, label='triangle data')
 
 
 plt.figure()
 plt.title('Quantized sawtooth signal')
 plt.xlabel('N')
 plt.ylabel('y')
-plt.plot(x, data_saw, label='sawtooth data')
+plot_render.plot(plt.gca(), x, data_saw, label='sawtooth data')
 
 
-plt.show()
+plot_render.finish(plt, ['triangle', 'sawtooth'], args.output, args.format)
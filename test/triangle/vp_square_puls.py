@@ -14,65 +14,77 @@
 
 # import 
 import numpy as np
+import fixed_point
+import kernels
+import orbit
 
-def quantize_value(x, lsb):
-    """This function quantize the given number so that it lies between -1 and 1-LSB. 
-    Where LSB is the least significant bit of the bit vector   
+def square_puls(sfixed_fract, phase, threshold, n_samples, out=None):
+    """The function generates a square puls according to a given phase and threshold.
+       The counter is calculated as wrapped cumulative sum and the output with one comparison over the whole array.
+       For a sweep the threshold can be an array, the output has then the shape threshold.shape + (n_samples,).
 
     Args:
-        x (float): number to quantize 
-        lsb (float): value of the lsb
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float): value that is accumulated per iteration
+        threshold (float or np.array): threshold for the decision if the output is -1+LSB or 1-LSB
+        n_samples (int): number of samples to generate
+        out (np.array, optional): buffer for the output values with the shape threshold.shape + (n_samples,). Defaults to None.
+
+    Raises:
+        ValueError: the buffer has not the shape of the output
 
     Returns:
-        float: quantize value
+        np.array: array with all calculated square puls values
     """
-    # no negative lsb values are allowed
-    lsb = np.abs(lsb)
+    shape = np.shape(threshold) + (n_samples,)
+    if out is not None and out.shape != shape:
+        raise ValueError(f'out has the shape {out.shape}, the square puls has the shape {shape}')
 
-    # calculate the upper and lower bound for the quantize value
-    upper_bound = 1 - lsb
-    lower_bound = -1
+    # the counter runs on the integer codes of the fixed-point core
+    # the truncated phase is added, this is the same as truncating after each addition
+    phase_int = fixed_point.to_fixed(phase, sfixed_fract)
 
-    # we use truncation to quantize the value
-    x_q = np.floor(x / lsb) * lsb
+    if kernels.use_jit() and np.ndim(threshold) == 0:
+        # the compiled kernel supports a single threshold and writes directly into the output
+        if out is None:
+            out = np.empty(n_samples)
+        return kernels.square_puls_kernel(int(phase_int), threshold * 2**sfixed_fract, sfixed_fract, out)
 
-    # If the number does not lie within the limits, it is reshaped so that it lies within the limits. 
-    # The wrap mode is used for this
-    if x_q < lower_bound:
-        x_q = x_q - 2 * lower_bound
-    elif x_q > upper_bound:
-        x_q = x_q + 2 * lower_bound
+    counter = fixed_point.wrap(np.arange(1, n_samples + 1, dtype=np.int64) * phase_int, sfixed_fract)
 
-    return x_q
+    # the scaled threshold is compared directly, so a threshold between two codes behaves like before
+    # an additional axis lets a threshold array broadcast over the samples
+    threshold_scaled = np.asarray(threshold)[..., np.newaxis] * 2**sfixed_fract
 
+    # values of 1-LSB and -1+LSB
+    one = fixed_point.to_float((1 << sfixed_fract) - 1, sfixed_fract)
 
-def square_puls(sfixed_fract, phase, threshold, n_samples):
-    """The function generates a square puls according to a given phase and threshold.
+    # storage for the output values
+    if out is None:
+        out = np.empty(shape)
+
+    # decision if the output is -1+LSB or 1-LSB, the values are written into the output without a temporary array
+    out.fill(-one)
+    np.copyto(out, one, where=counter >= threshold_scaled)
+
+    return out
+
+def square_puls_orbit(sfixed_fract, phase, threshold):
+    """The function creates the orbit of the square puls of square_puls. The counter is the only state, 
+       therefore one period of samples is enough to create any number of samples with orbit.samples.
 
     Args:
         sfixed_fract (int): sets the number of fractional bits
         phase (float): value that is accumulated per iteration
         threshold (float): threshold for the decision if the output is -1+LSB or 1-LSB
-        n_samples (int): number of samples to generate
 
     Returns:
-        np.array: array with all calculated square puls values
+        orbit.Orbit: transient and cycle of the square puls values
     """
-    # storage for the output values
-    calc_values = np.zeros(n_samples)
-    # calc the lsb value for the quantization
-    lsb = 2**(-sfixed_fract)
-    # init the counter
-    counter = 0
-
-    # create the samples
-    for i in range(0, n_samples):
-        # perform the addition with overflow
-        counter = quantize_value(counter + phase , lsb)
-        # decision if the output is -1+LSB or 1-LSB
-        if counter >= threshold:
-            calc_values[i] = quantize_value(1-lsb, lsb)
-        else:
-            calc_values[i] = quantize_value(-1 + lsb, lsb)
-
-    return calc_values
\ No newline at end of file
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
+
+    # the state is the value of the counter after the addition
+    def next_state(counter):
+        return fixed_point.wrap(counter + phase_int, sfixed_fract)
+
+    return orbit.generate_orbit(lambda n: square_puls(sfixed_fract, phase, threshold, n), next_state, next_state(0))
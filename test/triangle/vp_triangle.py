@@ -14,53 +14,81 @@
 
 # import 
 import numpy as np
+import fixed_point
+import kernels
+import orbit
 
-def quantize_value(x, lsb):
-    """This function quantize the given number so that it lies between -1 and 1-LSB. 
-    Where LSB is the least significant bit of the bit vector   
+def counter(sfixed_fract, phase, amplitude, n_samples):
+    """The function generates the values of the counter of the triangle generator.
 
     Args:
-        x (float): number to quantize 
-        lsb (float): value of the lsb
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float): value that is accumulated per iteration
+        amplitude (float): amplitude value, the counter is negated if it exceeds the amplitude
+        n_samples (int): number of samples to generate
 
     Returns:
-        float: quantize value
+        np.array: array with all counter values
     """
-    # no negative lsb values are allowed
-    lsb = np.abs(lsb)
-
-    # calculate the upper and lower bound for the quantize value
-    upper_bound = 1 - lsb
-    lower_bound = -1
-
-    # we use truncation to quantize the value
-    x_q = np.floor(x / lsb) * lsb
+    # the counter is the same as the sawtooth signal
+    return sawtooth(sfixed_fract, phase, amplitude, n_samples)
 
-    # If the number does not lie within the limits, it is reshaped so that it lies within the limits. 
-    # The wrap mode is used for this
-    if x_q < lower_bound:
-        x_q = x_q - 2 * lower_bound
-    elif x_q > upper_bound:
-        x_q = x_q + 2 * lower_bound
+def sawtooth_fixed(sfixed_fract, phase_int, amplitude_scaled, n_samples):
+    """The function generates the integer codes of the sawtooth signal in bulk. The counter is split into segments 
+       between two reset points. Every segment is an arithmetic sequence that is calculated as array, and the 
+       reset point is the first value of the segment that exceeds the amplitude. The next segment starts with the 
+       negated reset value. There are only a few different start values, if a start value repeats the segments 
+       are repeated by tiling.
 
-    return x_q
-
-
-def counter(sfixed_fract, phase, amplitude, n_samples):
-    lsb = 2**(-sfixed_fract)
-
-    calc_values = np.zeros(n_samples)
-    counter = quantize_value(phase, lsb)
-    calc_values[0] = counter
-
-    for i in range(1, n_samples):
-        if counter <= amplitude:
-            counter = quantize_value(counter + phase , lsb)
-        else:
-            counter = quantize_value(counter * (-1), lsb)
-        calc_values[i] = counter
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase_int (int): integer code of the value that is accumulated per iteration
+        amplitude_scaled (float): amplitude value scaled with 2**sfixed_fract
+        n_samples (int): number of samples to generate
 
-    return calc_values
+    Returns:
+        np.array: array with the integer codes of all sawtooth values
+    """
+    if kernels.use_jit():
+        return kernels.sawtooth_kernel(phase_int, amplitude_scaled, n_samples, sfixed_fract)
+
+    # the wrapped values of a segment repeat after this number of steps
+    period = 1 << (sfixed_fract + 1)
+    steps = np.arange(period + 1, dtype=np.int64) * phase_int
+
+    segments = []
+    segment_index = {}
+    n_segment_samples = 0
+    start = fixed_point.wrap(phase_int, sfixed_fract)
+    cycle_start = None
+
+    while n_segment_samples < n_samples:
+        if start in segment_index:
+            # the segments repeat from here on
+            cycle_start = segment_index[start]
+            break
+        segment_index[start] = len(segments)
+
+        # the values of the segment until the counter exceeds the amplitude
+        values = fixed_point.wrap(start + steps, sfixed_fract)
+        reset_points = np.flatnonzero(values > amplitude_scaled)
+        if len(reset_points) == 0:
+            # the counter never exceeds the amplitude, the values repeat with the period of the wrap
+            segments.append(values[:period])
+            cycle_start = len(segments) - 1
+            break
+
+        segment = values[:reset_points[0] + 1]
+        segments.append(segment)
+        n_segment_samples += len(segment)
+        start = int(fixed_point.wrap(-segment[-1], sfixed_fract))
+
+    if cycle_start is None:
+        return np.concatenate(segments)[:n_samples]
+
+    # tile the repeating segments
+    transient = np.concatenate(segments[:cycle_start]) if cycle_start > 0 else np.zeros(0, dtype=np.int64)
+    return orbit.Orbit(transient, np.concatenate(segments[cycle_start:])).samples(n_samples)
 
 def sawtooth(sfixed_fract, phase, amplitude, n_samples):
     """The function generates a sawtooth signal according to a given phase and amplitude.
@@ -74,24 +102,15 @@ def sawtooth(sfixed_fract, phase, amplitude, n_samples):
     Returns:
         np.array: array with all calculated sawtooth values
     """
-    # storage for the output values
-    calc_values = np.zeros(n_samples)
-    # init value for the counter
-    lsb = 2**(-sfixed_fract)
-    counter = quantize_value(phase, lsb)
-    calc_values[0] = counter
-    
-    # create the samples
-    for i in range(1, n_samples):
-        # check the current counter value if it lies in +/- amplitude. If not negate.
-        if counter <= amplitude:
-            counter = quantize_value(counter + phase , lsb)
-        else:
-            counter = quantize_value(counter * (-1), lsb)
-        
-        calc_values[i] = counter
+    # the counter runs on the integer codes of the fixed-point core
+    # the truncated phase is added, this is the same as truncating after each addition
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
+    # the scaled amplitude is compared directly, so an amplitude between two codes behaves like before
+    amplitude_scaled = amplitude * 2**sfixed_fract
 
-    return calc_values
+    calc_values = sawtooth_fixed(sfixed_fract, phase_int, amplitude_scaled, n_samples)
+
+    return fixed_point.to_float(calc_values, sfixed_fract)
 
 def triangle(sfixed_fract, phase, amplitude, n_samples):
     """The function generates a triangle signal according to a given phase and amplitude.
@@ -105,46 +124,83 @@ def triangle(sfixed_fract, phase, amplitude, n_samples):
     Returns:
         np.array: array with all calculated triangle values
     """
-    # storage for the output values
-    calc_values = np.zeros(n_samples)
-    
-    # init value for the counter
-    lsb = 2**(-sfixed_fract)
-    counter = quantize_value(phase, lsb)
-    calc_values[0] = counter
-    old_counter = counter
-
-    # define additional status bits for detecting and executing the reverse operation of the counter values 
-    reverse = False
-    rev_counter = 0
-
-    # create the samples
-    for i in range(1, n_samples):
-        # check the current counter value if it lies in +/- amplitude. If not negate.
-        if counter <= amplitude:
-            counter = quantize_value(counter + phase , lsb)
-        else:
-            counter = quantize_value(counter * (-1), lsb)
+    # the triangle is created from the sawtooth of the counter
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
+    amplitude_scaled = amplitude * 2**sfixed_fract
+
+    if kernels.use_jit():
+        return fixed_point.to_float(kernels.triangle_kernel(phase_int, amplitude_scaled, n_samples, sfixed_fract), sfixed_fract)
+
+    counter = sawtooth_fixed(sfixed_fract, phase_int, amplitude_scaled, n_samples)
+
+    # detect every overflow of the counter (change of the sign bit)
+    signbit = counter < 0
+    overflows = np.zeros(n_samples, dtype=np.int64)
+    overflows[1:] = signbit[1:] != signbit[:-1]
+
+    # always one overflow is ignored, therefore the reverse bit changes on the 1st, 3rd, 5th, ... overflow
+    n_overflows = np.cumsum(overflows)
+    reverse = ((n_overflows + 1) // 2) % 2 == 1
 
-        inter_counter = counter
+    # to generate the falling ramp negate the rising ramp in the right state
+    calc_values = np.where(reverse, fixed_point.wrap(-counter, sfixed_fract), counter)
 
-        # check whether an overflow has occurred or not
-        if np.signbit(counter) != np.signbit(old_counter):
-            # ignore always one overflow
+    return fixed_point.to_float(calc_values, sfixed_fract)
+
+def sawtooth_orbit(sfixed_fract, phase, amplitude):
+    """The function creates the orbit of the sawtooth signal of sawtooth. The counter is the only state, 
+       therefore the transient and one period are enough to create any number of samples with orbit.samples.
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float): value that is accumulated per iteration
+        amplitude (float): amplitude value of the signal. The signal lies in [-amplitude, amplitude]
+
+    Returns:
+        orbit.Orbit: transient and cycle of the sawtooth values
+    """
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
+    amplitude_scaled = amplitude * 2**sfixed_fract
+
+    # the state is the value of the counter
+    def next_state(counter):
+        if counter <= amplitude_scaled:
+            return fixed_point.wrap(counter + phase_int, sfixed_fract)
+        return fixed_point.wrap(-counter, sfixed_fract)
+
+    return orbit.generate_orbit(lambda n: sawtooth(sfixed_fract, phase, amplitude, n), next_state, phase_int)
+
+def triangle_orbit(sfixed_fract, phase, amplitude):
+    """The function creates the orbit of the triangle signal of triangle. The state consists of the counter and 
+       the reverse status bits, the transient and one period are enough to create any number of samples with orbit.samples.
+
+    Args:
+        sfixed_fract (int): sets the number of fractional bits
+        phase (float): value that is accumulated per iteration
+        amplitude (float): amplitude value of the signal. The signal lies in [-amplitude, amplitude]
+
+    Returns:
+        orbit.Orbit: transient and cycle of the triangle values
+    """
+    phase_int = int(fixed_point.to_fixed(phase, sfixed_fract))
+    amplitude_scaled = amplitude * 2**sfixed_fract
+
+    # the state is the tuple (counter, reverse, rev_counter)
+    def next_state(state):
+        counter, reverse, rev_counter = state
+        if counter <= amplitude_scaled:
+            next_counter = fixed_point.wrap(counter + phase_int, sfixed_fract)
+        else:
+            next_counter = fixed_point.wrap(-counter, sfixed_fract)
+
+        # the overflow detection is the same as in triangle
+        if (next_counter < 0) != (counter < 0):
             if rev_counter == 0:
-                # change the reverse bit
                 reverse = not reverse
                 rev_counter = 1
             else:
                 rev_counter = 0
 
-        # to generate the falling ramp negate the rising ramp in the right state
-        if reverse:
-            calc_values[i] = quantize_value(inter_counter * (-1), lsb)
-        else:
-            calc_values[i] = quantize_value(inter_counter, lsb)
-
-        # save the old value for the overflow detection
-        old_counter = counter
+        return next_counter, reverse, rev_counter
 
-    return calc_values
+    return orbit.generate_orbit(lambda n: triangle(sfixed_fract, phase, amplitude, n), next_state, (phase_int, False, 0))